@@ -0,0 +1,271 @@
+"""
+Synthetic production-scale dataset.
+
+Writes years of weekday holdings snapshots with a consistent NAV history,
+thousands of investors with bcrypt password hashes, login tokens and a cash
+ledger into the configured database using bulk inserts, then rebuilds the
+derived analytics and investor value tables::
+
+    python -m backend.cli generate-dataset --days 1095 --holdings 40 --investors 5000 --reset
+
+All investors share one password (``--password``) and one salted hash, so
+seeding thousands of accounts does not pay thousands of bcrypt rounds; logins
+still verify through bcrypt at full cost.
+"""
+from __future__ import annotations
+
+import secrets
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+import bcrypt
+import numpy as np
+from loguru import logger
+from sqlalchemy import func, insert, select
+
+from .. import crud, models
+from ..database import Base, SessionLocal, engine, init_db
+
+CHUNK_SIZE = 5_000
+INITIAL_NAV = 1.0
+CASH_RATIO = 0.05
+
+
+def _chunks(rows: Iterable[dict], size: int = CHUNK_SIZE) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_insert(connection, model, rows: Iterable[dict]) -> int:
+    count = 0
+    for chunk in _chunks(rows):
+        connection.execute(insert(model), chunk)
+        count += len(chunk)
+    return count
+
+
+def _trading_days(end: date, days: int) -> list[date]:
+    start = end - timedelta(days=days - 1)
+    return [start + timedelta(days=offset) for offset in range(days) if (start + timedelta(days=offset)).weekday() < 5]
+
+
+def generate(
+    days: int = 1095,
+    holdings: int = 40,
+    investors: int = 2_000,
+    tokens_per_investor: int = 1,
+    password: str = "password123",
+    admin_password: str = "admin123",
+    seed: int = 0,
+    reset: bool = False,
+    end: Optional[date] = None,
+    bcrypt_rounds: int = 12,
+    derived: bool = True,
+) -> dict:
+    """
+    Generate the dataset into the configured database and return row counts
+    and timings.
+
+    Refuses to write into a database that already has NAV history unless
+    ``reset`` is set, in which case every table is dropped and recreated.
+    ``derived=False`` skips rebuilding ``fund_analytics`` and
+    ``investor_value_history``; the latter holds one row per investor and
+    trading day and dominates generation time for large investor counts.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    end = end or date.today() - timedelta(days=1)
+    calendar = _trading_days(end, days)
+    if not calendar:
+        raise ValueError("The date range contains no trading days.")
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    init_db()
+    with SessionLocal() as db:
+        if db.execute(select(func.count(models.FundHistory.id))).scalar_one():
+            raise RuntimeError("The database already has NAV history; pass reset=True to replace it.")
+        if db.execute(select(func.count(models.Investor.id))).scalar_one():
+            raise RuntimeError("The database already has investors; pass reset=True to replace it.")
+
+    now = datetime.utcnow()
+    stamps = {"created_at": now, "updated_at": now}
+    first_day = calendar[0]
+
+    # Investors: lognormal share counts bought at the initial NAV.
+    shares = np.round(rng.lognormal(mean=10.0, sigma=1.0, size=investors), 2)
+    total_shares = float(shares.sum())
+    investor_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(bcrypt_rounds)).decode("utf-8")
+    admin_hash = bcrypt.hashpw(admin_password.encode("utf-8"), bcrypt.gensalt(bcrypt_rounds)).decode("utf-8")
+
+    # Holdings: fixed quantities revalued along a correlated random walk.
+    total_capital = total_shares * INITIAL_NAV
+    weights = rng.dirichlet(np.ones(holdings))
+    start_prices = rng.uniform(5.0, 200.0, size=holdings)
+    quantities = np.maximum(
+        np.round(total_capital * (1 - CASH_RATIO) * weights / start_prices, -2), 100.0
+    )
+    market_returns = rng.normal(0.0003, 0.012, size=len(calendar))
+    idiosyncratic = rng.normal(0.0, 0.015, size=(len(calendar), holdings))
+    log_paths = np.cumsum(market_returns[:, None] + idiosyncratic, axis=0)
+    log_paths -= log_paths[0]
+    prices = start_prices * np.exp(log_paths)
+    values = prices * quantities
+    holdings_value = values.sum(axis=1)
+
+    # Cash: opening balance plus a flow on the first trading day of each month.
+    cash_rows = [{"date": first_day, "amount": round(total_capital * CASH_RATIO, 2), "note": "opening balance", **stamps}]
+    for index, day in enumerate(calendar[1:], start=1):
+        if day.month != calendar[index - 1].month:
+            cash_rows.append(
+                {"date": day, "amount": round(float(rng.normal(0.0, total_capital * 0.002)), 2), "note": "monthly flow", **stamps}
+            )
+    cash_dates = np.array([row["date"] for row in cash_rows])
+    cash_amounts = np.array([row["amount"] for row in cash_rows])
+    cash_by_day = np.array([cash_amounts[cash_dates <= day].sum() for day in calendar])
+
+    totals = holdings_value + cash_by_day
+    navs = totals / total_shares
+    symbols = [f"{600000 + index:06d}.SH" if index % 2 else f"{index:06d}.SZ" for index in range(holdings)]
+    names = [f"Stock {index:04d}" for index in range(holdings)]
+
+    counts: dict[str, int] = {}
+    with engine.begin() as connection:
+        admin_id = connection.execute(
+            insert(models.Investor).values(
+                name="Default Admin",
+                identifier="admin",
+                initial_investment=0.0,
+                shares=0.0,
+                current_value=0.0,
+                password_hash=admin_hash,
+                is_admin=True,
+                **stamps,
+            )
+        ).inserted_primary_key[0]
+
+        counts["investors"] = _bulk_insert(
+            connection,
+            models.Investor,
+            (
+                {
+                    "name": f"Investor {index:05d}",
+                    "identifier": f"investor-{index:05d}",
+                    "initial_investment": float(shares[index] * INITIAL_NAV),
+                    "shares": float(shares[index]),
+                    "current_value": float(shares[index] * navs[-1]),
+                    "password_hash": investor_hash,
+                    "is_admin": False,
+                    **stamps,
+                }
+                for index in range(investors)
+            ),
+        )
+        investor_ids = [
+            investor_id
+            for investor_id, in connection.execute(
+                select(models.Investor.id).where(models.Investor.id != admin_id).order_by(models.Investor.id)
+            )
+        ]
+
+        counts["share_transactions"] = _bulk_insert(
+            connection,
+            models.ShareTransaction,
+            (
+                {
+                    "investor_id": investor_id,
+                    "date": first_day,
+                    "shares": float(shares[index]),
+                    "amount": float(shares[index] * INITIAL_NAV),
+                    "note": "opening balance",
+                    **stamps,
+                }
+                for index, investor_id in enumerate(investor_ids)
+            ),
+        )
+
+        expires_at = now + timedelta(days=90)
+        counts["investor_tokens"] = _bulk_insert(
+            connection,
+            models.InvestorToken,
+            (
+                {
+                    "token": secrets.token_urlsafe(32),
+                    "investor_id": investor_id,
+                    "expires_at": expires_at,
+                    "user_agent": "dataset-generator",
+                    **stamps,
+                }
+                for investor_id in [admin_id, *investor_ids]
+                for _ in range(tokens_per_investor)
+            ),
+        )
+
+        counts["cash_transactions"] = _bulk_insert(connection, models.CashTransaction, cash_rows)
+        connection.execute(insert(models.FundCash).values(amount=float(cash_by_day[-1]), **stamps))
+
+        counts["holdings"] = _bulk_insert(
+            connection,
+            models.Holding,
+            (
+                {
+                    "name": names[column],
+                    "symbol": symbols[column],
+                    "quantity": float(quantities[column]),
+                    "cost_price": float(start_prices[column]),
+                    "market_value": float(values[row, column]),
+                    "weight": float(values[row, column] / holdings_value[row]),
+                    "date": day,
+                    **stamps,
+                }
+                for row, day in enumerate(calendar)
+                for column in range(holdings)
+            ),
+        )
+
+        previous_totals = np.concatenate(([np.nan], totals[:-1]))
+        counts["fund_history"] = _bulk_insert(
+            connection,
+            models.FundHistory,
+            (
+                {
+                    "date": day,
+                    "nav": float(navs[row]),
+                    "total_value": float(totals[row]),
+                    "change_value": None if row == 0 else float(totals[row] - previous_totals[row]),
+                    "change_pct": None
+                    if row == 0
+                    else float((totals[row] - previous_totals[row]) / previous_totals[row] * 100),
+                    "created_by_id": admin_id,
+                    **stamps,
+                }
+                for row, day in enumerate(calendar)
+            ),
+        )
+    inserted = time.perf_counter()
+
+    if derived:
+        with SessionLocal() as db:
+            counts["fund_analytics"] = crud.rebuild_fund_analytics(db)
+            counts["investor_value_history"] = crud.rebuild_investor_values(db)
+            db.commit()
+
+    finished = time.perf_counter()
+    result = {
+        "trading_days": len(calendar),
+        "first_day": first_day.isoformat(),
+        "last_day": calendar[-1].isoformat(),
+        "rows": counts,
+        "insert_seconds": round(inserted - started, 3),
+        "derived_seconds": round(finished - inserted, 3),
+        "total_seconds": round(finished - started, 3),
+    }
+    logger.info("Generated dataset: {}", result)
+    return result
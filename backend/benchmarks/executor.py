@@ -0,0 +1,92 @@
+"""
+Job executor overhead benchmark.
+
+Runs the same job repeatedly through a fresh ``JobExecutor`` and reports the
+first (cold) job separately from the following (warm) ones::
+
+    python -m backend.benchmarks.executor --jobs 20
+    python -m backend.benchmarks.executor --task parse --image sample_holdings_ocr.png
+
+``preprocess`` upscales the screenshot with Pillow and NumPy, so a cold job
+includes spawning the worker and importing both; ``parse`` runs the whole OCR
+parse (``OCR_ENGINE`` picks PaddleOCR or a stand-in such as
+``benchmarks.fake_ocr``), so a cold job also includes loading the model. Warm jobs reuse the worker and pay none
+of that.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def preprocess_job(image_path: Path) -> tuple[int, ...]:
+    from ..utils.ocr_parser import preprocess_image
+
+    return tuple(preprocess_image(image_path).shape)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10, help="Jobs to run, the first one cold.")
+    parser.add_argument("--task", choices=("preprocess", "parse"), default="preprocess")
+    parser.add_argument("--image", type=Path, default=REPO_ROOT / "sample_holdings_ocr.png")
+    parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout.")
+    args = parser.parse_args(argv)
+    if args.jobs < 2:
+        parser.error("--jobs must be at least 2")
+
+    from ..utils import tasks
+    from ..utils.executor import JobExecutor
+
+    task = preprocess_job if args.task == "preprocess" else tasks.parse_screenshot
+    executor = JobExecutor(max_workers=1)
+    timings = []
+    try:
+        for _ in range(args.jobs):
+            started = time.perf_counter()
+            executor.run("ocr", task, args.image)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        executor.shutdown()
+
+    warm = sorted(timings[1:])
+    results = {
+        "task": args.task,
+        "jobs": args.jobs,
+        "cold_ms": timings[0],
+        "warm_median_ms": statistics.median(warm),
+        "warm_max_ms": warm[-1],
+    }
+    print(
+        f"{args.task}: cold {results['cold_ms']:.1f} ms, warm median {results['warm_median_ms']:.1f} ms "
+        f"(max {results['warm_max_ms']:.1f} ms) over {args.jobs - 1} jobs",
+        file=sys.stderr,
+    )
+    body = json.dumps(
+        {
+            "meta": {
+                "benchmark": "executor",
+                "created_at": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        args.output.write_text(body)
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
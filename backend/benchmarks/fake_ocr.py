@@ -0,0 +1,67 @@
+"""
+Stand-in OCR engine for load tests and environments without the OCR models.
+
+Select it with ``OCR_ENGINE=backend.benchmarks.fake_ocr:FakeOCR``; the load
+harness does so by default. It implements PaddleOCR's ``ocr(image, cls=True)``
+and answers with the token stream of a broker holdings table (see
+``ocr_replay.synthesize``), so uploads still go through preprocessing and the
+real layout parser. Positions are the stocks of ``sample_holdings.json`` with
+quantities and prices seeded from the image, so the same screenshot always
+parses to the same holdings. ``OCR_FAKE_HOLDINGS`` sets how many positions a
+screenshot has and ``OCR_FAKE_LATENCY_MS`` adds a fixed recognition delay.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from .ocr_replay import _letters, synthesize
+
+OCR_FAKE_HOLDINGS = int(os.getenv("OCR_FAKE_HOLDINGS", "20"))
+OCR_FAKE_LATENCY_MS = float(os.getenv("OCR_FAKE_LATENCY_MS", "0"))
+
+SAMPLE_HOLDINGS = Path(__file__).resolve().parents[2] / "sample_holdings.json"
+
+
+class FakeOCR:
+    def __init__(
+        self,
+        holdings: int = OCR_FAKE_HOLDINGS,
+        latency_ms: float = OCR_FAKE_LATENCY_MS,
+        sample: Path = SAMPLE_HOLDINGS,
+    ) -> None:
+        self.holdings = holdings
+        self.latency_ms = latency_ms
+        self.stocks = json.loads(sample.read_text(encoding="utf-8"))["holdings"]
+
+    def positions(self, seed: bytes) -> list[dict]:
+        """The holdings a screenshot with ``seed`` shows."""
+        rng = random.Random(seed)
+        positions = []
+        for index in range(self.holdings):
+            stock = self.stocks[index % len(self.stocks)]
+            quantity = float(rng.randint(1, 200) * 100)
+            price = round(rng.uniform(5.0, 200.0), 3)
+            positions.append(
+                {
+                    # Repeats get letter suffixes, as in ``synthesize``.
+                    "name": stock["name"] + _letters(index // len(self.stocks)),
+                    "quantity": quantity,
+                    "cost_price": round(price * rng.uniform(0.8, 1.2), 3),
+                    "market_value": round(quantity * price, 2),
+                }
+            )
+        return positions
+
+    def ocr(self, image: Any, cls: bool = True) -> list[list]:
+        # A sparse sample of the pixels is enough to tell screenshots apart.
+        seed = hashlib.sha256(image[::16, ::16].tobytes()).digest()
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        tokens = synthesize(self.positions(seed), seed=int.from_bytes(seed[:4], "big"))
+        return [[[token["bbox"], (token["text"], token["score"])] for token in tokens]]
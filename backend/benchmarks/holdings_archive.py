@@ -0,0 +1,109 @@
+"""
+Holdings archival benchmark.
+
+Fills a throwaway SQLite database with daily snapshots, runs the archival pass
+and reports live-table size and by-date read latency before and after::
+
+    python -m backend.benchmarks.holdings_archive --days 1000 --holdings 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+def _timed(func, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(days: int, holdings: int, retention_days: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="turtle-bench-"))
+    db_path = workdir / "bench.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import func, insert, select
+
+    from .. import crud, models
+    from ..database import SessionLocal, engine, init_db
+
+    init_db()
+    today = date.today()
+    first_day = today - timedelta(days=days - 1)
+    now = datetime.utcnow()
+
+    with SessionLocal() as db:
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            db.execute(
+                insert(models.Holding),
+                [
+                    {
+                        "name": f"Position {index}",
+                        "symbol": f"{index:06d}.SZ",
+                        "quantity": float(100 + index),
+                        "cost_price": 10.0 + index / 10,
+                        "market_value": 1000.0 + index * 10 + offset,
+                        "weight": 1 / holdings,
+                        "date": day,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for index in range(holdings)
+                ],
+            )
+        db.commit()
+
+        def live_rows() -> int:
+            return db.execute(select(func.count(models.Holding.id))).scalar_one()
+
+        old_day = first_day + timedelta(days=1)
+        result = {
+            "days": days,
+            "holdings_per_day": holdings,
+            "retention_days": retention_days,
+            "live_rows_before": live_rows(),
+            "db_bytes_before": db_path.stat().st_size,
+            "read_ms_live": _timed(lambda: crud.get_holdings_rows_by_date(db, old_day)),
+        }
+
+        start = time.perf_counter()
+        result["rows_archived"] = crud.archive_holdings(db, retention_days=retention_days, today=today)
+        result["archive_seconds"] = time.perf_counter() - start
+
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+
+    with SessionLocal() as db:
+        result["live_rows_after"] = db.execute(select(func.count(models.Holding.id))).scalar_one()
+        result["archive_months"] = db.execute(
+            select(func.count(models.HoldingsArchive.id))
+        ).scalar_one()
+        result["archive_bytes"] = db.execute(
+            select(func.sum(func.length(models.HoldingsArchive.payload)))
+        ).scalar_one()
+        result["db_bytes_after"] = db_path.stat().st_size
+        result["read_ms_archived"] = _timed(lambda: crud.get_holdings_rows_by_date(db, old_day))
+        result["read_ms_recent"] = _timed(lambda: crud.get_holdings_rows_by_date(db, today))
+        assert len(crud.get_holdings_rows_by_date(db, old_day)) == holdings
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--holdings", type=int, default=50)
+    parser.add_argument("--retention-days", type=int, default=90)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.days, args.holdings, args.retention_days), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+In-process load test for the FastAPI app.
+
+Generates a synthetic dataset (see ``benchmarks.dataset``) into a throwaway
+SQLite database, then drives the ASGI app through ``httpx.AsyncClient`` with a
+weighted mix of dashboard reads, logins and screenshot uploads::
+
+    python -m backend.benchmarks.load --investors 2000 --concurrency 16 --duration 30
+    python -m backend.benchmarks.load --mix dashboard=6,login=1,upload=1 --requests 2000
+
+No server or network is involved, so the numbers measure the application,
+its database access and serialization. Uploads are small generated images read
+by the stand-in OCR engine in ``benchmarks.fake_ocr``, so they exercise the
+executor, preprocessing, the layout parser and the NAV write path without the
+OCR models. The report gives throughput and p50/p95/p99 latency per
+operation as JSON; a summary table goes to stderr.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+
+# name -> (method, path, role); role picks the token sent with the request.
+OPERATIONS = {
+    "dashboard": ("GET", "/api/dashboard", "investor"),
+    "nav": ("GET", "/api/fund/nav", "investor"),
+    "history": ("GET", "/api/fund/history?limit=365", "investor"),
+    "history_range": ("GET", "/api/fund/history/range?limit=500", "investor"),
+    "holdings": ("GET", "/api/holdings/today", "investor"),
+    "me": ("GET", "/api/investors/me", "investor"),
+    "investors": ("GET", "/api/investors/", "admin"),
+    "login": ("POST", "/api/auth/login", None),
+    "preview": ("POST", "/api/upload/screenshot/preview", "admin"),
+    "upload": ("POST", "/api/upload/screenshot", "admin"),
+}
+DEFAULT_MIX = "dashboard=40,nav=15,history=10,holdings=10,me=15,login=5,preview=3,upload=2"
+
+
+def _prepare_environment(database_url: Optional[str]) -> None:
+    # Must run before the backend package creates its engine.
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+    else:
+        workdir = Path(tempfile.mkdtemp(prefix="turtle-load-"))
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'load.db'}"
+    os.environ.setdefault("EVENTS_BACKEND", "local")
+    os.environ.setdefault("OCR_ENGINE", f"{__package__}.fake_ocr:FakeOCR")
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("the mix needs at least one operation with a positive weight")
+    return mix
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _load_credentials(password: str) -> dict:
+    from sqlalchemy import select
+
+    from .. import models
+    from ..database import SessionLocal
+
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(models.InvestorToken.token, models.Investor.identifier, models.Investor.is_admin)
+            .join(models.Investor, models.InvestorToken.investor_id == models.Investor.id)
+            .where(models.InvestorToken.expires_at > datetime.utcnow())
+        ).all()
+    admin = [token for token, _, is_admin in rows if is_admin]
+    investors = [(token, identifier) for token, identifier, is_admin in rows if not is_admin]
+    if not admin or not investors:
+        raise RuntimeError("The database needs an admin and at least one investor with valid tokens.")
+    return {"admin": admin, "investor": investors, "password": password}
+
+
+def _screenshot(rng: random.Random) -> bytes:
+    # Random pixels; the stand-in OCR engine seeds its holdings from them.
+    from PIL import Image
+
+    size = (64, 48)
+    image = Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def run_load(
+    mix: dict[str, float],
+    concurrency: int,
+    requests: Optional[int],
+    duration: Optional[float],
+    credentials: dict,
+    seed: int = 0,
+) -> dict:
+    """
+    Issue requests from ``concurrency`` workers until ``requests`` have been
+    sent or ``duration`` seconds have passed, and return per-operation stats.
+    """
+    import httpx
+
+    from ..database import dispose_async_engine
+    from ..main import app
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = {name: 0 for name in names}
+    statuses: dict[str, dict[str, int]] = {name: {} for name in names}
+    issued = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    def next_slot() -> bool:
+        nonlocal issued
+        if requests is not None and issued >= requests:
+            return False
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        issued += 1
+        return True
+
+    async def worker(client: httpx.AsyncClient, worker_id: int) -> None:
+        rng = random.Random(seed * 1_000 + worker_id)
+        upload_index = 0
+        while next_slot():
+            name = rng.choices(names, weights)[0]
+            method, path, role = OPERATIONS[name]
+            headers = {}
+            kwargs: dict = {}
+            if role == "admin":
+                headers["user-token"] = rng.choice(credentials["admin"])
+            elif role == "investor":
+                headers["user-token"] = rng.choice(credentials["investor"])[0]
+            if name == "login":
+                identifier = rng.choice(credentials["investor"])[1]
+                kwargs["json"] = {"identifier": identifier, "password": credentials["password"]}
+            elif name in ("preview", "upload"):
+                upload_index += 1
+                # Unique names: the upload router stages files under their client filename.
+                filename = f"load-{worker_id}-{upload_index}.png"
+                kwargs["files"] = {"files": (filename, _screenshot(rng), "image/png")}
+                if name == "upload":
+                    kwargs["params"] = {"holdings_date": date.today().isoformat()}
+
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=headers, **kwargs)
+                code = str(response.status_code)
+                failed = response.status_code >= 400
+            except Exception:  # noqa: BLE001 - count and keep the load going
+                code = "exception"
+                failed = True
+            samples[name].append(time.perf_counter() - started)
+            statuses[name][code] = statuses[name].get(code, 0) + 1
+            if failed:
+                errors[name] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://load.test", timeout=None) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client, index) for index in range(concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        # The app's shutdown handler is not run; its async pool threads would keep the process alive.
+        await dispose_async_engine()
+
+    operations = []
+    for name in names:
+        timings = sorted(samples[name])
+        if not timings:
+            continue
+        operations.append(
+            {
+                "operation": name,
+                "method": OPERATIONS[name][0],
+                "path": OPERATIONS[name][1],
+                "count": len(timings),
+                "errors": errors[name],
+                "statuses": statuses[name],
+                "throughput_rps": len(timings) / elapsed,
+                "p50_ms": _percentile(timings, 0.50) * 1000,
+                "p95_ms": _percentile(timings, 0.95) * 1000,
+                "p99_ms": _percentile(timings, 0.99) * 1000,
+                "max_ms": timings[-1] * 1000,
+            }
+        )
+    total = sum(item["count"] for item in operations)
+    return {
+        "elapsed_seconds": elapsed,
+        "requests": total,
+        "errors": sum(item["errors"] for item in operations),
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "operations": operations,
+    }
+
+
+def _print_table(summary: dict) -> None:
+    print(
+        f"{'operation':<14} {'count':>7} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+        file=sys.stderr,
+    )
+    for item in summary["operations"]:
+        print(
+            f"{item['operation']:<14} {item['count']:>7} {item['errors']:>6} {item['throughput_rps']:>8.1f} "
+            f"{item['p50_ms']:>9.2f} {item['p95_ms']:>9.2f} {item['p99_ms']:>9.2f}",
+            file=sys.stderr,
+        )
+    print(
+        f"{'total':<14} {summary['requests']:>7} {summary['errors']:>6} {summary['throughput_rps']:>8.1f}"
+        f"  in {summary['elapsed_seconds']:.1f}s",
+        file=sys.stderr,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma-separated operation=weight pairs.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent simulated clients.")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests.")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds (default 30 without --requests).")
+    parser.add_argument("--database-url", help="Run against this database instead of a temporary SQLite file.")
+    parser.add_argument(
+        "--skip-generate",
+        action="store_true",
+        help="Use the data already in --database-url instead of generating a dataset.",
+    )
+    parser.add_argument("--days", type=int, default=365, help="Calendar days of generated history.")
+    parser.add_argument("--holdings", type=int, default=40, help="Holdings per generated snapshot.")
+    parser.add_argument("--investors", type=int, default=1_000, help="Generated investors.")
+    parser.add_argument("--password", default="password123", help="Investor password used by the login operation.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the dataset and the request mix.")
+    parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout.")
+    args = parser.parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.skip_generate and not args.database_url:
+        parser.error("--skip-generate needs --database-url")
+    duration = args.duration if args.duration or args.requests else 30.0
+
+    _prepare_environment(args.database_url)
+    from .dataset import generate
+
+    dataset = None
+    if not args.skip_generate:
+        print("generating dataset", file=sys.stderr)
+        dataset = generate(
+            days=args.days,
+            holdings=args.holdings,
+            investors=args.investors,
+            password=args.password,
+            seed=args.seed,
+            reset=True,
+            derived=True,
+        )
+    credentials = _load_credentials(args.password)
+
+    summary = asyncio.run(
+        run_load(mix, args.concurrency, args.requests, duration, credentials, seed=args.seed)
+    )
+    _print_table(summary)
+
+    import sqlalchemy
+
+    report = {
+        "meta": {
+            "benchmark": "load",
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "database": os.environ["DATABASE_URL"].split("://", 1)[0],
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "dataset": dataset,
+        },
+        **summary,
+    }
+    body = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(body)
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+NAV write path and read path benchmark suite.
+
+Builds a throwaway SQLite database for every point of a parameter sweep and
+times the crud functions behind the NAV update and the history/holdings reads.
+Each dimension is swept on its own while the others stay at their defaults, so
+the largest points (50,000 investors, 5,000 days) stay affordable::
+
+    python -m backend.benchmarks.nav_paths --output bench.json
+    python -m backend.benchmarks.nav_paths --baseline bench.json --tolerance 0.25
+
+Results are JSON (one record per case and operation, with timings in
+milliseconds and the number of SQL statements issued). With ``--baseline`` the
+medians are compared against a previous run and the process exits with status
+1 if any operation got slower than the tolerance allows.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULTS = {"holdings": 50, "investors": 100, "history": 250}
+SWEEPS = {
+    "holdings": [10, 100, 1_000, 10_000],
+    "investors": [10, 1_000, 10_000, 50_000],
+    "history": [30, 365, 1_000, 5_000],
+}
+# Reusing one hash keeps seeding fast; bcrypt cost is not what is measured here.
+_PASSWORD_HASH = "$2b$12$KIXQJ0mJ6bW1n0y6aQm7Fe3m3W4l3i0Yx7o0Jf9n8b1m2v5u6c7dO"
+
+
+def _prepare_environment(workdir: Path) -> None:
+    # Must run before the backend package creates its engine.
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+    os.environ.setdefault("EVENTS_BACKEND", "local")
+    os.environ.setdefault("METRICS_ENABLED", "false")
+
+
+def _holding_items(count: int, day: date, drift: float = 0.0) -> list:
+    from .. import schemas
+
+    return [
+        schemas.HoldingCreate(
+            name=f"Position {index}",
+            symbol=f"{index:06d}.SZ",
+            quantity=float(100 + index),
+            cost_price=10.0 + index / 100,
+            market_value=1000.0 + index * 3 + drift,
+            date=day,
+        )
+        for index in range(count)
+    ]
+
+
+def _changed(items: list) -> list:
+    # Identical snapshots short-circuit in update_holdings_and_nav; nudge one
+    # value so every timed call takes the full write path.
+    items[0].market_value += 1.0
+    return items
+
+
+def _seed(holdings: int, investors: int, history: int, today: date) -> None:
+    from sqlalchemy import insert
+
+    from .. import crud, models
+    from ..database import Base, SessionLocal, engine, init_db
+
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    now = datetime.utcnow()
+    first_day = today - timedelta(days=history)
+
+    with SessionLocal() as db:
+        db.execute(
+            insert(models.Investor),
+            [
+                {
+                    "name": f"Investor {index}",
+                    "identifier": f"investor-{index}",
+                    "initial_investment": 1000.0,
+                    "shares": 1000.0,
+                    "current_value": 1000.0,
+                    "password_hash": _PASSWORD_HASH,
+                    "is_admin": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(investors)
+            ],
+        )
+        db.execute(
+            insert(models.ShareTransaction),
+            [
+                {
+                    "investor_id": index + 1,
+                    "date": first_day,
+                    "shares": 1000.0,
+                    "amount": 1000.0,
+                    "note": "opening balance",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(investors)
+            ],
+        )
+        total_shares = investors * 1000.0
+        rows = []
+        for offset in range(history):
+            total_value = holdings * 1000.0 + offset * 10
+            rows.append(
+                {
+                    "date": first_day + timedelta(days=offset),
+                    "nav": total_value / total_shares,
+                    "total_value": total_value,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        db.execute(insert(models.FundHistory), rows)
+        last_day = first_day + timedelta(days=history - 1)
+        db.execute(
+            insert(models.Holding),
+            [
+                {**item.dict(exclude={"date", "weight"}), "date": last_day, "created_at": now, "updated_at": now}
+                for item in _holding_items(holdings, last_day)
+            ],
+        )
+        db.commit()
+        crud.rebuild_fund_analytics(db)
+
+
+def _measure(func: Callable[[], object], repeat: int, reset: Optional[Callable[[], None]] = None) -> dict:
+    from ..utils.sql_profiler import profile_queries
+
+    func()  # warm-up: statement cache, SQLite page cache
+    if reset:
+        reset()
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        with profile_queries() as profile:
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = profile.count
+        if reset:
+            reset()
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": timings[0],
+        "p95_ms": timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))],
+        "mean_ms": statistics.fmean(timings),
+        "queries": queries,
+        "repeat": repeat,
+    }
+
+
+def run_case(holdings: int, investors: int, history: int, repeat: int) -> list[dict]:
+    from .. import crud
+    from ..database import SessionLocal
+
+    today = date.today()
+    _seed(holdings, investors, history, today)
+    last_day = today - timedelta(days=1)
+    items = _holding_items(holdings, today, drift=5.0)
+    case = {"holdings": holdings, "investors": investors, "history": history}
+    results = []
+
+    with SessionLocal() as db:
+        operations: list[tuple[str, Callable[[], object], Optional[Callable[[], None]]]] = [
+            ("replace_holdings", lambda: (crud.replace_holdings(db, items, today), db.flush()), db.rollback),
+            ("update_holdings_and_nav", lambda: crud.update_holdings_and_nav(db, _changed(items), holdings_date=today), None),
+            ("update_holdings_and_nav_unchanged", lambda: crud.update_holdings_and_nav(db, items, holdings_date=today), None),
+            ("recalculate_nav_with_latest_holdings", lambda: crud._recalculate_nav_with_latest_holdings(db), None),
+            ("get_fund_history_rows", lambda: crud.get_fund_history_rows(db, limit=history), None),
+            ("get_fund_history_page", lambda: crud.get_fund_history_page(db, limit=500), None),
+            ("get_fund_history_series", lambda: crud.get_fund_history_series(db), None),
+            ("get_latest_holdings_rows", lambda: crud.get_latest_holdings_rows(db), None),
+            ("get_holdings_rows_by_date", lambda: crud.get_holdings_rows_by_date(db, last_day), None),
+            ("get_investor_rows", lambda: crud.get_investor_rows(db), None),
+        ]
+        for name, func, reset in operations:
+            results.append({"case": case, "operation": name, **_measure(func, repeat, reset)})
+            db.rollback()
+    return results
+
+
+def sweep_cases(dimensions: list[str]) -> list[dict]:
+    cases = [dict(DEFAULTS)]
+    for dimension in dimensions:
+        for value in SWEEPS[dimension]:
+            case = {**DEFAULTS, dimension: value}
+            if case not in cases:
+                cases.append(case)
+    return cases
+
+
+def compare(
+    results: list[dict],
+    baseline: list[dict],
+    tolerance: float,
+    min_delta_ms: float = 1.0,
+) -> list[dict]:
+    """
+    Median ratios against ``baseline`` for every case/operation present in both.
+
+    A slowdown counts as a regression only if it exceeds both ``tolerance``
+    (relative) and ``min_delta_ms`` (absolute), so sub-millisecond jitter on
+    fast reads does not fail a run.
+    """
+    previous = {
+        (json.dumps(item["case"], sort_keys=True), item["operation"]): item for item in baseline
+    }
+    rows = []
+    for item in results:
+        before = previous.get((json.dumps(item["case"], sort_keys=True), item["operation"]))
+        if before is None or before["median_ms"] <= 0:
+            continue
+        ratio = item["median_ms"] / before["median_ms"]
+        rows.append(
+            {
+                "case": item["case"],
+                "operation": item["operation"],
+                "baseline_ms": before["median_ms"],
+                "median_ms": item["median_ms"],
+                "ratio": ratio,
+                "queries_delta": item["queries"] - before.get("queries", item["queries"]),
+                "regression": ratio > 1 + tolerance
+                and item["median_ms"] - before["median_ms"] > min_delta_ms,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sweep",
+        default="holdings,investors,history",
+        help="Comma-separated dimensions to sweep (holdings, investors, history).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per operation.")
+    parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout.")
+    parser.add_argument("--baseline", type=Path, help="Results JSON of a previous run to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed median slowdown against the baseline before failing (0.25 = 25%%).",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="Ignore slowdowns smaller than this many milliseconds.",
+    )
+    args = parser.parse_args(argv)
+    dimensions = [part.strip() for part in args.sweep.split(",") if part.strip()]
+    unknown = set(dimensions) - set(SWEEPS)
+    if unknown:
+        parser.error(f"unknown sweep dimension(s): {', '.join(sorted(unknown))}")
+
+    _prepare_environment(Path(tempfile.mkdtemp(prefix="turtle-bench-")))
+    import sqlalchemy
+
+    results = []
+    for case in sweep_cases(dimensions):
+        print(f"running {case}", file=sys.stderr)
+        results.extend(run_case(case["holdings"], case["investors"], case["history"], args.repeat))
+
+    report = {
+        "meta": {
+            "benchmark": "nav_paths",
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        report["comparison"] = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+        for row in report["comparison"]:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['operation']:<40} {json.dumps(row['case'], sort_keys=True):<55} "
+                f"{row['baseline_ms']:>9.2f} -> {row['median_ms']:>9.2f} ms  x{row['ratio']:.2f} {flag}",
+                file=sys.stderr,
+            )
+
+    body = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(body)
+    else:
+        print(body)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+OCR layout-parser regression tests and benchmarks on recorded token streams.
+
+A fixture is the PaddleOCR output for one screenshot (``bbox``, ``text`` and
+``score`` per token) plus the holdings the layout parser must produce from it.
+Replaying fixtures needs neither the OCR models nor the images::
+
+    python -m backend.benchmarks.ocr_replay replay
+    python -m backend.benchmarks.ocr_replay record screenshots/*.png
+    python -m backend.benchmarks.ocr_replay images screenshots/*.png --repeat 3
+
+``replay`` runs every fixture through ``layout_tokens`` and ``parse_tokens``,
+compares the result with ``expected`` exactly and reports tokens per second;
+it exits with status 1 on any mismatch. ``record`` runs OCR on real
+screenshots and writes new fixtures (review ``expected`` before committing
+them); ``--update`` rewrites ``expected`` after an intended parser change.
+``images`` times preprocessing and inference on the images themselves, with
+the model loaded once up front. ``synthesize`` lays out a holdings JSON file
+(such as ``sample_holdings.json``) as the token stream of a two-row-per-stock
+broker table, for fixtures and larger throughput cases.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "ocr"
+
+
+def _dump_fixture(path: Path, fixture: dict) -> None:
+    # One token per line keeps fixture diffs readable.
+    lines = ["{"]
+    for key in ("source", "recorded_with"):
+        lines.append(f"  {json.dumps(key)}: {json.dumps(fixture.get(key), ensure_ascii=False)},")
+    lines.append('  "tokens": [')
+    tokens = fixture["tokens"]
+    for index, token in enumerate(tokens):
+        comma = "," if index < len(tokens) - 1 else ""
+        lines.append(f"    {json.dumps(token, ensure_ascii=False)}{comma}")
+    lines.append("  ],")
+    expected = json.dumps(fixture["expected"], ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    lines.append(f'  "expected": {expected}')
+    lines.append("}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _load_fixture(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _fixture_paths(paths: list[Path]) -> list[Path]:
+    if not paths:
+        return sorted(FIXTURES_DIR.glob("*.json"))
+    found: list[Path] = []
+    for path in paths:
+        found.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return found
+
+
+def _parse(tokens: list[dict], source: str) -> list[dict]:
+    from ..utils.ocr_parser import layout_tokens, parse_tokens
+
+    # Round-trip through JSON so results compare equal to the recorded form.
+    return json.loads(json.dumps(parse_tokens(layout_tokens(tokens), Path(source))))
+
+
+def replay(paths: list[Path], repeat: int, update: bool = False) -> list[dict]:
+    """Check and time every fixture; with ``update`` rewrite mismatching expectations."""
+    from loguru import logger
+
+    from ..utils import ocr_parser
+
+    results = []
+    for path in _fixture_paths(paths):
+        fixture = _load_fixture(path)
+        tokens = fixture["tokens"]
+        parsed = _parse(tokens, fixture["source"])
+        matches = parsed == fixture["expected"]
+        if not matches and update:
+            fixture["expected"] = parsed
+            _dump_fixture(path, fixture)
+
+        # The parser logs every call; keep that out of the timings.
+        logger.disable(ocr_parser.__name__)
+        try:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                ocr_parser.parse_tokens(ocr_parser.layout_tokens(tokens), path)
+                timings.append(time.perf_counter() - started)
+        finally:
+            logger.enable(ocr_parser.__name__)
+
+        median = statistics.median(timings)
+        results.append(
+            {
+                "fixture": path.name,
+                "tokens": len(tokens),
+                "holdings": len(parsed),
+                "matches": matches,
+                "updated": not matches and update,
+                "expected": fixture["expected"] if not matches and not update else None,
+                "actual": parsed if not matches and not update else None,
+                "median_ms": median * 1000,
+                "tokens_per_second": len(tokens) / median if median else 0.0,
+            }
+        )
+    return results
+
+
+def record(images: list[Path], output_dir: Path) -> list[Path]:
+    """Run OCR on ``images`` and write one fixture per image."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    from ..utils.ocr_parser import load_ocr_engine, preprocess_image, recognize
+
+    try:
+        engine_version = f"paddleocr {version('paddleocr')}"
+    except PackageNotFoundError:  # pragma: no cover - optional dependency
+        engine_version = "paddleocr"
+    ocr = load_ocr_engine()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for image in images:
+        tokens = recognize(ocr, preprocess_image(image))
+        fixture = {
+            "source": image.name,
+            "recorded_with": engine_version,
+            "tokens": tokens,
+            "expected": _parse(tokens, image.name),
+        }
+        destination = output_dir / f"{image.stem}.json"
+        _dump_fixture(destination, fixture)
+        written.append(destination)
+    return written
+
+
+def time_images(images: list[Path], repeat: int) -> dict:
+    """Median preprocessing, inference and parse time per image; inference is skipped without paddleocr."""
+    from ..utils.ocr_parser import layout_tokens, load_ocr_engine, parse_tokens, preprocess_image, recognize
+
+    started = time.perf_counter()
+    try:
+        ocr = load_ocr_engine()
+    except RuntimeError as exc:
+        print(f"{exc} Timing preprocessing only.", file=sys.stderr)
+        ocr = None
+    model_load = time.perf_counter() - started
+
+    rows = []
+    for image in images:
+        stages: dict[str, list[float]] = {"preprocess": [], "recognize": [], "parse": []}
+        tokens: list = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            image_np = preprocess_image(image)
+            stages["preprocess"].append(time.perf_counter() - started)
+            if ocr is None:
+                continue
+            started = time.perf_counter()
+            tokens = recognize(ocr, image_np)
+            stages["recognize"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            parse_tokens(layout_tokens(tokens), image)
+            stages["parse"].append(time.perf_counter() - started)
+        rows.append(
+            {
+                "image": image.name,
+                "shape": list(image_np.shape),
+                "tokens": len(tokens),
+                **{
+                    f"{stage}_ms": statistics.median(values) * 1000
+                    for stage, values in stages.items()
+                    if values
+                },
+            }
+        )
+    return {"model_load_ms": model_load * 1000 if ocr is not None else None, "images": rows}
+
+
+def _letters(index: int) -> str:
+    suffix = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        suffix = chr(ord("A") + remainder) + suffix
+    return suffix
+
+
+def synthesize(holdings: list[dict], copies: int = 1, seed: int = 0) -> list[dict]:
+    """
+    Token stream of a broker holdings table: a header row, then per stock an
+    upper row (name, P&L, quantity, cost) and a lower row (market value,
+    P&L %, available, price), with small positional jitter.
+    """
+    rng = random.Random(seed)
+    columns = {"name": 150.0, "profit": 420.0, "volume": 680.0, "cost": 930.0}
+    tokens: list[dict] = []
+
+    def add(text: str, cx: float, cy: float) -> None:
+        width = sum(30.0 if ord(char) > 0x2E7F else 17.0 for char in text)
+        cx += rng.uniform(-4.0, 4.0)
+        cy += rng.uniform(-3.0, 3.0)
+        left, right, top, bottom = cx - width / 2, cx + width / 2, cy - 18.0, cy + 18.0
+        tokens.append(
+            {
+                "bbox": [[round(left, 1), round(top, 1)], [round(right, 1), round(top, 1)],
+                         [round(right, 1), round(bottom, 1)], [round(left, 1), round(bottom, 1)]],
+                "text": text,
+                "score": round(rng.uniform(0.93, 0.999), 4),
+            }
+        )
+
+    # Copies get letter suffixes: the parser treats tokens containing digits as numbers.
+    rows = [
+        {**item, "name": item["name"] + _letters(copy)}
+        for copy in range(copies)
+        for item in holdings
+    ]
+    total_value = sum(float(item["market_value"]) for item in rows)
+    add("总资产", 150.0, 120.0)
+    add(f"{total_value:,.2f}", 150.0, 175.0)
+    add("名称/市值", columns["name"], 400.0)
+    add("盈亏/盈亏率", columns["profit"], 400.0)
+    add("持仓/可用", columns["volume"], 400.0)
+    add("成本/现价", columns["cost"], 400.0)
+
+    for index, item in enumerate(rows):
+        upper = 480.0 + index * 150.0
+        lower = upper + 50.0
+        quantity = float(item["quantity"])
+        cost = float(item["cost_price"])
+        value = float(item["market_value"])
+        price = value / quantity if quantity else 0.0
+        profit = value - cost * quantity
+        add(item["name"], columns["name"], upper)
+        add(f"{profit:+,.2f}", columns["profit"], upper)
+        add(f"{quantity:g}", columns["volume"], upper)
+        add(f"{cost:,.3f}", columns["cost"], upper)
+        add(f"{value:,.2f}", columns["name"], lower)
+        add(f"{profit / (cost * quantity) * 100 if cost and quantity else 0.0:+.2f}%", columns["profit"], lower)
+        add(f"{quantity:g}", columns["volume"], lower)
+        add(f"{price:,.3f}", columns["cost"], lower)
+    return tokens
+
+
+def _print_replay(results: list[dict]) -> None:
+    print(f"{'fixture':<32} {'tokens':>7} {'holdings':>8} {'ms':>9} {'tokens/s':>11}  result", file=sys.stderr)
+    for item in results:
+        outcome = "ok" if item["matches"] else ("updated" if item["updated"] else "MISMATCH")
+        print(
+            f"{item['fixture']:<32} {item['tokens']:>7} {item['holdings']:>8} {item['median_ms']:>9.3f} "
+            f"{item['tokens_per_second']:>11,.0f}  {outcome}",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="Check and time the layout parser on fixtures.")
+    replay_parser.add_argument("fixtures", nargs="*", type=Path, help=f"Fixture files or directories (default {FIXTURES_DIR}).")
+    replay_parser.add_argument("--repeat", type=int, default=200, help="Timed parses per fixture.")
+    replay_parser.add_argument("--update", action="store_true", help="Rewrite expected holdings that no longer match.")
+    replay_parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout.")
+
+    record_parser = commands.add_parser("record", help="Record fixtures from screenshots (needs paddleocr).")
+    record_parser.add_argument("images", nargs="+", type=Path)
+    record_parser.add_argument("--output-dir", type=Path, default=FIXTURES_DIR)
+
+    images_parser = commands.add_parser("images", help="Time preprocessing and inference on screenshots.")
+    images_parser.add_argument("images", nargs="+", type=Path)
+    images_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per image.")
+    images_parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout.")
+
+    synth_parser = commands.add_parser("synthesize", help="Write a synthetic fixture from a holdings JSON file.")
+    synth_parser.add_argument("holdings", type=Path, help='JSON list of holdings, or an object with a "holdings" list.')
+    synth_parser.add_argument("--output", type=Path, required=True)
+    synth_parser.add_argument("--copies", type=int, default=1, help="Repeat the holdings to build longer tables.")
+    synth_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        for path in record(args.images, args.output_dir):
+            print(path)
+        return
+
+    if args.command == "synthesize":
+        payload = json.loads(args.holdings.read_text(encoding="utf-8"))
+        holdings = payload["holdings"] if isinstance(payload, dict) else payload
+        tokens = synthesize(holdings, copies=args.copies, seed=args.seed)
+        fixture = {
+            "source": args.output.with_suffix(".png").name,
+            "recorded_with": f"synthetic from {args.holdings.name}",
+            "tokens": tokens,
+            "expected": _parse(tokens, args.output.name),
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        _dump_fixture(args.output, fixture)
+        print(args.output)
+        return
+
+    if args.command == "images":
+        report = time_images(args.images, args.repeat)
+        failed = False
+    else:
+        results = replay(args.fixtures, args.repeat, update=args.update)
+        if not results:
+            parser.error("no fixtures found")
+        _print_replay(results)
+        report = {"results": results}
+        failed = any(not item["matches"] and not item["updated"] for item in results)
+
+    body = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(body, encoding="utf-8")
+    else:
+        print(body)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+API startup-time benchmark.
+
+Measures, in fresh interpreters, how long ``import backend.main`` takes and
+which heavy optional stacks it pulls in, and how long a uvicorn worker takes
+from process start to its first ``/health`` response::
+
+    python -m backend.benchmarks.startup --output startup.json
+    python -m backend.benchmarks.startup --baseline startup.json --tolerance 0.2
+
+Runs against a throwaway SQLite database initialised with ``init-db``. Exits
+with status 1 if a module listed in ``--forbid`` is imported at startup or, with
+``--baseline``, if a median got slower than the tolerance allows.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+# Loaded on first OCR use or first numeric rebuild, never by a starting worker.
+DEFAULT_FORBIDDEN = "numpy,PIL,paddleocr,paddle,cv2,pandas,tushare"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main  # noqa: F401
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted({name.split(".")[0] for name in sys.modules})}))
+"""
+
+
+def _environment(database_url: str) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "DATABASE_URL": database_url,
+            "EVENTS_BACKEND": "local",
+            "INTRADAY_ENABLED": "false",
+            "PYTHONDONTWRITEBYTECODE": "1",
+        }
+    )
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE],
+        cwd=REPO_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_first_health(env: dict, timeout: float = 60.0) -> float:
+    """Seconds from spawning uvicorn until ``/health`` answers 200."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode} before serving /health")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                time.sleep(0.01)
+        raise RuntimeError(f"/health did not answer within {timeout:g}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _stats(values: list[float]) -> dict:
+    return {
+        "median_ms": statistics.median(values) * 1000,
+        "min_ms": min(values) * 1000,
+        "max_ms": max(values) * 1000,
+        "repeat": len(values),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per measurement.")
+    parser.add_argument("--forbid", default=DEFAULT_FORBIDDEN, help="Comma-separated top-level modules that must not load at import.")
+    parser.add_argument("--skip-server", action="store_true", help="Only measure the import.")
+    parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout.")
+    parser.add_argument("--baseline", type=Path, help="Results JSON of a previous run to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed median slowdown against the baseline before failing (0.2 = 20%%).",
+    )
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="Ignore slowdowns smaller than this.")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="turtle-startup-"))
+    env = _environment(f"sqlite:///{workdir / 'startup.db'}")
+    subprocess.run([sys.executable, "-m", "backend.cli", "init-db"], cwd=REPO_ROOT, env=env, check=True, capture_output=True)
+
+    import_runs = [measure_import(env) for _ in range(args.repeat)]
+    forbidden = {name.strip() for name in args.forbid.split(",") if name.strip()}
+    loaded = sorted(forbidden & set(import_runs[-1]["modules"]))
+    results = {"import": {**_stats([run["seconds"] for run in import_runs]), "forbidden_loaded": loaded}}
+    if not args.skip_server:
+        results["first_health"] = _stats([measure_first_health(env) for _ in range(args.repeat)])
+
+    report = {
+        "meta": {
+            "benchmark": "startup",
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    failed = bool(loaded)
+    for name in loaded:
+        print(f"{name} is imported at startup", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        comparison = []
+        for name, current in results.items():
+            before = baseline.get(name)
+            if not before or before["median_ms"] <= 0:
+                continue
+            ratio = current["median_ms"] / before["median_ms"]
+            regression = ratio > 1 + args.tolerance and current["median_ms"] - before["median_ms"] > args.min_delta_ms
+            comparison.append(
+                {
+                    "measurement": name,
+                    "baseline_ms": before["median_ms"],
+                    "median_ms": current["median_ms"],
+                    "ratio": ratio,
+                    "regression": regression,
+                }
+            )
+            failed = failed or regression
+        report["comparison"] = comparison
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['measurement']:<14} {row['baseline_ms']:>9.1f} -> {row['median_ms']:>9.1f} ms  x{row['ratio']:.2f} {flag}",
+                file=sys.stderr,
+            )
+
+    body = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(body)
+    else:
+        print(body)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+
+from loguru import logger
+
+from . import crud
+from .database import init_db, session_scope
+
+
+def initialize_database(args: argparse.Namespace) -> None:
+    init_db()
+    # Investors from before the share ledger get their opening entries and value history.
+    with session_scope() as db:
+        for fund_id in crud.get_fund_ids(db):
+            crud.backfill_opening_entries(db, fund_id)
+    logger.info("Database schema is up to date.")
+
+
+def _fund_ids(db, args: argparse.Namespace) -> list[int]:
+    return [args.fund] if args.fund is not None else crud.get_fund_ids(db)
+
+
+def rebuild_analytics(args: argparse.Namespace) -> None:
+    with session_scope() as db:
+        for fund_id in _fund_ids(db, args):
+            rows = crud.rebuild_fund_analytics(db, fund_id)
+            logger.info("Rebuilt {} fund analytics rows of fund {}.", rows, fund_id)
+
+
+def rebuild_investor_values(args: argparse.Namespace) -> None:
+    with session_scope() as db:
+        for fund_id in _fund_ids(db, args):
+            rows = crud.rebuild_investor_values(db, fund_id=fund_id)
+            logger.info("Rebuilt {} investor value rows of fund {}.", rows, fund_id)
+
+
+def archive_holdings(args: argparse.Namespace) -> None:
+    with session_scope() as db:
+        for fund_id in _fund_ids(db, args):
+            rows = crud.archive_holdings(db, retention_days=args.retention_days, fund_id=fund_id)
+            logger.info("Archived {} holdings rows of fund {}.", rows, fund_id)
+
+
+def generate_dataset(args: argparse.Namespace) -> None:
+    from .benchmarks.dataset import generate
+
+    generate(
+        days=args.days,
+        holdings=args.holdings,
+        investors=args.investors,
+        tokens_per_investor=args.tokens_per_investor,
+        password=args.password,
+        seed=args.seed,
+        reset=args.reset,
+        bcrypt_rounds=args.bcrypt_rounds,
+        derived=not args.skip_derived,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="Turtle Fund maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser(
+        "init-db",
+        help="Create missing tables and indexes. Run before starting the API and after upgrades.",
+    )
+    init.set_defaults(handler=initialize_database)
+
+    rebuild = commands.add_parser(
+        "rebuild-analytics",
+        help="Recompute fund_analytics from fund_history with a vectorized full pass.",
+    )
+    rebuild.add_argument("--fund", type=int, default=None, help="Only this fund id (default: every fund).")
+    rebuild.set_defaults(handler=rebuild_analytics)
+
+    values = commands.add_parser(
+        "rebuild-investor-values",
+        help="Recompute every investor's value series from the share ledger and NAV history.",
+    )
+    values.add_argument("--fund", type=int, default=None, help="Only this fund id (default: every fund).")
+    values.set_defaults(handler=rebuild_investor_values)
+
+    archive = commands.add_parser(
+        "archive-holdings",
+        help="Compact holdings snapshots older than the retention horizon into monthly archives.",
+    )
+    archive.add_argument(
+        "--retention-days",
+        type=int,
+        default=None,
+        help="Override HOLDINGS_RETENTION_DAYS for this run.",
+    )
+    archive.add_argument("--fund", type=int, default=None, help="Only this fund id (default: every fund).")
+    archive.set_defaults(handler=archive_holdings)
+
+    dataset = commands.add_parser(
+        "generate-dataset",
+        help="Bulk-insert a synthetic production-scale dataset into the configured database.",
+    )
+    dataset.add_argument("--days", type=int, default=1095, help="Calendar days of history (weekdays get snapshots).")
+    dataset.add_argument("--holdings", type=int, default=40, help="Positions per daily snapshot.")
+    dataset.add_argument("--investors", type=int, default=2000)
+    dataset.add_argument("--tokens-per-investor", type=int, default=1)
+    dataset.add_argument("--password", default="password123", help="Password shared by every generated investor.")
+    dataset.add_argument("--bcrypt-rounds", type=int, default=12)
+    dataset.add_argument("--seed", type=int, default=0)
+    dataset.add_argument(
+        "--reset",
+        action="store_true",
+        help="Drop and recreate every table first. Without it, a database with data is left untouched.",
+    )
+    dataset.add_argument(
+        "--skip-derived",
+        action="store_true",
+        help="Do not rebuild fund_analytics and investor_value_history (run the rebuild commands later).",
+    )
+    dataset.set_defaults(handler=generate_dataset)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
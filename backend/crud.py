@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
-from typing import Iterable, List, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+import hashlib
+import heapq
+import json
 import secrets
 import bcrypt
 
-from sqlalchemy import asc, desc, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import asc, case, desc, func, insert, literal, or_, select, tuple_
+from sqlalchemy.orm import Session, joinedload
 
 from loguru import logger
 
 from . import models, schemas
+from .utils import analytics, archive
+from .utils.events import publish
+from .utils.metrics import BCRYPT_SECONDS, NAV_UPDATE_SECONDS, PhaseTimer
+from .utils.cache import VersionedCache, bump_data_version
+from .database import read_transaction
+from .utils.responses import as_row, schema_fields
 
 
 def get_password_hash(password: str) -> str:
@@ -23,7 +33,8 @@ def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
 
     # Hash the password
-    hashed_password_bytes = bcrypt.hashpw(password_bytes, salt)
+    with BCRYPT_SECONDS.labels("hash").time():
+        hashed_password_bytes = bcrypt.hashpw(password_bytes, salt)
 
     return str(hashed_password_bytes, "utf-8")
 
@@ -35,48 +46,372 @@ def verify_password(password: str, hashed_password: str) -> bool:
 
     # Use bcrypt.checkpw to compare the password with the stored hash
     # It extracts the salt/cost from the stored hash automatically.
-    return bcrypt.checkpw(password_bytes, hashed_password.encode("utf-8"))
+    with BCRYPT_SECONDS.labels("verify").time():
+        return bcrypt.checkpw(password_bytes, hashed_password.encode("utf-8"))
 
 
-def get_latest_holdings(db: Session) -> Optional[schemas.HoldingsResponse]:
-    stmt = (
-        select(models.Holding.date)
-        .order_by(desc(models.Holding.date))
-        .limit(1)
+def _row_select(schema, model):
+    """Select exactly the columns ``schema`` serializes, in its field order."""
+    return select(*(getattr(model, field) for field in schema_fields(schema)))
+
+
+def _rows(db: Session, stmt, schema) -> List[dict]:
+    fields = schema_fields(schema)
+    return [dict(zip(fields, row)) for row in db.execute(stmt)]
+
+
+def _latest_holdings_date(fund_id: int):
+    return (
+        select(func.max(models.Holding.date))
+        .where(models.Holding.fund_id == fund_id)
+        .scalar_subquery()
     )
-    latest_date = db.execute(stmt).scalar_one_or_none()
-    if latest_date is None:
-        return None
 
+
+def get_latest_holdings(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> Optional[schemas.HoldingsResponse]:
     holdings_stmt = (
         select(models.Holding)
-        .where(models.Holding.date == latest_date)
+        .where(models.Holding.fund_id == fund_id, models.Holding.date == _latest_holdings_date(fund_id))
         .order_by(desc(models.Holding.market_value))
     )
     holdings = [holding for holding, in db.execute(holdings_stmt)]
+    if not holdings:
+        return None
     total_value = sum(h.market_value for h in holdings)
     return schemas.HoldingsResponse(
-        date=latest_date,
+        date=holdings[0].date,
         total_value=total_value,
         holdings=[schemas.HoldingRead.from_orm(h) for h in holdings],
     )
 
 
-def get_holdings_by_date(db: Session, target_date: date) -> List[models.Holding]:
+def get_holdings_by_date(
+    db: Session, target_date: date, fund_id: int = models.DEFAULT_FUND_ID
+) -> List[models.Holding]:
     stmt = (
         select(models.Holding)
-        .where(models.Holding.date == target_date)
+        .where(models.Holding.fund_id == fund_id, models.Holding.date == target_date)
+        .order_by(desc(models.Holding.market_value))
+    )
+    holdings = [holding for holding, in db.execute(stmt)]
+    if holdings:
+        return holdings
+    # Archived snapshots come back as transient objects that are never added to the session.
+    return [
+        models.Holding(fund_id=fund_id, **row)
+        for row in _archived_holding_rows(db, target_date, target_date, fund_id)
+    ]
+
+
+def get_latest_holdings_rows(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> Optional[dict]:
+    """
+    ``HoldingsResponse``-shaped dict for the latest snapshot, fetched in one query.
+    """
+    stmt = (
+        _row_select(schemas.HoldingRead, models.Holding)
+        .where(models.Holding.fund_id == fund_id, models.Holding.date == _latest_holdings_date(fund_id))
+        .order_by(desc(models.Holding.market_value))
+    )
+    holdings = _rows(db, stmt, schemas.HoldingRead)
+    if not holdings:
+        return None
+    return {
+        "date": holdings[0]["date"],
+        "total_value": sum(h["market_value"] for h in holdings),
+        "holdings": holdings,
+    }
+
+
+def get_holdings_rows_by_date(
+    db: Session, target_date: date, fund_id: int = models.DEFAULT_FUND_ID
+) -> List[dict]:
+    stmt = (
+        _row_select(schemas.HoldingRead, models.Holding)
+        .where(models.Holding.fund_id == fund_id, models.Holding.date == target_date)
         .order_by(desc(models.Holding.market_value))
     )
-    return [holding for holding, in db.execute(stmt)]
+    return _rows(db, stmt, schemas.HoldingRead) or _archived_holding_rows(
+        db, target_date, target_date, fund_id
+    )
+
+
+def get_symbol_history(
+    db: Session,
+    symbol: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> List[dict]:
+    """Daily snapshots of one position, served by the ``(fund_id, symbol, date)`` index."""
+    stmt = (
+        _row_select(schemas.HoldingSnapshotPoint, models.Holding)
+        .where(models.Holding.fund_id == fund_id, models.Holding.symbol == symbol)
+        .order_by(asc(models.Holding.date))
+    )
+    if start is not None:
+        stmt = stmt.where(models.Holding.date >= start)
+    if end is not None:
+        stmt = stmt.where(models.Holding.date <= end)
+    live = _rows(db, stmt, schemas.HoldingSnapshotPoint)
+
+    live_dates = {row["date"] for row in live}
+    fields = schema_fields(schemas.HoldingSnapshotPoint)
+    archived = [
+        {field: row[field] for field in fields}
+        for row in _archived_holding_rows(db, start, end, fund_id)
+        if row["symbol"] == symbol and row["date"] not in live_dates
+    ]
+    if not archived:
+        return live
+    return sorted(archived + live, key=lambda row: row["date"])
+
+
+def diff_holdings(
+    db: Session,
+    from_date: date,
+    to_date: date,
+    include_unchanged: bool = False,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> List[dict]:
+    """
+    Compare two snapshots in a single grouped query.
+
+    Positions are matched on symbol (falling back to name). Each row reports
+    whether the position was added, removed, changed or left unchanged, with
+    quantity and market value on both dates. Dates that only exist in the
+    holdings archive are compared in Python with the same rules.
+    """
+    for target in (from_date, to_date):
+        if not _has_live_holdings(db, target, fund_id) and _archived_holding_rows(
+            db, target, target, fund_id
+        ):
+            return _diff_holding_rows(
+                get_holdings_rows_by_date(db, from_date, fund_id),
+                get_holdings_rows_by_date(db, to_date, fund_id),
+                include_unchanged,
+            )
+
+    holding = models.Holding
+    key = func.coalesce(holding.symbol, holding.name)
+    is_from = holding.date == from_date
+    is_to = holding.date == to_date
+
+    in_from = func.max(case((is_from, 1), else_=0))
+    in_to = func.max(case((is_to, 1), else_=0))
+    quantity_from = func.sum(case((is_from, holding.quantity)))
+    quantity_to = func.sum(case((is_to, holding.quantity)))
+    value_from = func.sum(case((is_from, holding.market_value)))
+    value_to = func.sum(case((is_to, holding.market_value)))
+    value_change = func.coalesce(value_to, 0.0) - func.coalesce(value_from, 0.0)
+    quantity_change = func.coalesce(quantity_to, 0.0) - func.coalesce(quantity_from, 0.0)
+
+    status = case(
+        (in_from == 0, literal("added")),
+        (in_to == 0, literal("removed")),
+        (
+            or_(
+                func.abs(quantity_change) > 1e-9,
+                func.abs(value_change) > 1e-6,
+            ),
+            literal("changed"),
+        ),
+        else_=literal("unchanged"),
+    )
+
+    stmt = (
+        select(
+            key.label("symbol"),
+            func.max(holding.name).label("name"),
+            status.label("status"),
+            quantity_from.label("quantity_from"),
+            quantity_to.label("quantity_to"),
+            quantity_change.label("quantity_change"),
+            value_from.label("market_value_from"),
+            value_to.label("market_value_to"),
+            value_change.label("market_value_change"),
+        )
+        .where(holding.fund_id == fund_id, holding.date.in_([from_date, to_date]))
+        .group_by(key)
+        .order_by(desc(func.abs(value_change)), asc(key))
+    )
+    if not include_unchanged:
+        stmt = stmt.having(status != "unchanged")
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def _diff_holding_rows(
+    from_rows: List[dict],
+    to_rows: List[dict],
+    include_unchanged: bool,
+) -> List[dict]:
+    positions: dict[str, dict] = {}
+    for side, rows in (("from", from_rows), ("to", to_rows)):
+        for row in rows:
+            key = row["symbol"] if row["symbol"] is not None else row["name"]
+            entry = positions.setdefault(
+                key,
+                {"symbol": key, "name": row["name"], "from": False, "to": False,
+                 "quantity_from": None, "quantity_to": None,
+                 "market_value_from": None, "market_value_to": None},
+            )
+            entry["name"] = max(entry["name"], row["name"])
+            entry[side] = True
+            if row["quantity"] is not None:
+                entry[f"quantity_{side}"] = (entry[f"quantity_{side}"] or 0.0) + row["quantity"]
+            entry[f"market_value_{side}"] = (entry[f"market_value_{side}"] or 0.0) + row["market_value"]
+
+    items = []
+    for entry in positions.values():
+        quantity_change = (entry["quantity_to"] or 0.0) - (entry["quantity_from"] or 0.0)
+        value_change = (entry["market_value_to"] or 0.0) - (entry["market_value_from"] or 0.0)
+        if not entry["from"]:
+            status = "added"
+        elif not entry["to"]:
+            status = "removed"
+        elif abs(quantity_change) > 1e-9 or abs(value_change) > 1e-6:
+            status = "changed"
+        else:
+            status = "unchanged"
+        if status == "unchanged" and not include_unchanged:
+            continue
+        items.append(
+            {
+                "symbol": entry["symbol"],
+                "name": entry["name"],
+                "status": status,
+                "quantity_from": entry["quantity_from"],
+                "quantity_to": entry["quantity_to"],
+                "quantity_change": quantity_change,
+                "market_value_from": entry["market_value_from"],
+                "market_value_to": entry["market_value_to"],
+                "market_value_change": value_change,
+            }
+        )
+    items.sort(key=lambda item: (-abs(item["market_value_change"]), item["symbol"]))
+    return items
+
+
+def _has_live_holdings(db: Session, target_date: date, fund_id: int) -> bool:
+    stmt = (
+        select(models.Holding.id)
+        .where(models.Holding.fund_id == fund_id, models.Holding.date == target_date)
+        .limit(1)
+    )
+    return db.execute(stmt).first() is not None
+
+
+def _archived_holding_rows(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> List[dict]:
+    """
+    ``HoldingRead``-shaped rows from the monthly archive between two dates.
+
+    Rows are ordered by date, then by market value descending, like live reads.
+    """
+    stmt = (
+        select(models.HoldingsArchive.payload)
+        .where(models.HoldingsArchive.fund_id == fund_id)
+        .order_by(asc(models.HoldingsArchive.month))
+    )
+    if start is not None:
+        stmt = stmt.where(models.HoldingsArchive.end_date >= start)
+    if end is not None:
+        stmt = stmt.where(models.HoldingsArchive.start_date <= end)
+
+    fields = schema_fields(schemas.HoldingRead)
+    rows = []
+    for payload, in db.execute(stmt):
+        for row in archive.decode_rows(payload):
+            if (start is None or row["date"] >= start) and (end is None or row["date"] <= end):
+                rows.append({field: row[field] for field in fields})
+    rows.sort(key=lambda row: (row["date"], -row["market_value"]))
+    return rows
+
+
+def archive_holdings(
+    db: Session,
+    retention_days: Optional[int] = None,
+    today: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> int:
+    """
+    Move whole months of one fund's snapshots older than the retention horizon into the archive.
+
+    The latest snapshot is never archived. Late rows for an already archived
+    month are merged into its blob, replacing any archived rows for the same
+    dates. Each month is committed separately. Returns the number of rows moved.
+    """
+    retention_days = archive.RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = (today or date.today()) - timedelta(days=retention_days)
+    latest = db.execute(select(_latest_holdings_date(fund_id))).scalar_one_or_none()
+    if latest is None:
+        return 0
+    limit = archive.month_start(min(cutoff, latest))
+
+    months = sorted(
+        {
+            archive.month_start(day)
+            for day, in db.execute(
+                select(models.Holding.date)
+                .where(models.Holding.fund_id == fund_id, models.Holding.date < limit)
+                .distinct()
+            )
+        }
+    )
+
+    moved = 0
+    for month in months:
+        month_end = archive.next_month(month)
+        in_month = (
+            models.Holding.fund_id == fund_id,
+            models.Holding.date >= month,
+            models.Holding.date < month_end,
+        )
+        live_stmt = _row_select(schemas.HoldingRead, models.Holding).where(*in_month)
+        live = _rows(db, live_stmt, schemas.HoldingRead)
+        if not live:
+            continue
+
+        record = db.execute(
+            select(models.HoldingsArchive).where(
+                models.HoldingsArchive.fund_id == fund_id, models.HoldingsArchive.month == month
+            )
+        ).scalar_one_or_none()
+        rows = live
+        if record is not None:
+            live_dates = {row["date"] for row in live}
+            archived = archive.decode_rows(record.payload)
+            rows = [row for row in archived if row["date"] not in live_dates] + live
+        else:
+            record = models.HoldingsArchive(fund_id=fund_id, month=month)
+            db.add(record)
+        rows.sort(key=lambda row: (row["date"], -row["market_value"]))
+
+        record.payload = archive.encode_rows(rows)
+        record.row_count = len(rows)
+        record.start_date = rows[0]["date"]
+        record.end_date = rows[-1]["date"]
+        db.query(models.Holding).filter(*in_month).delete(synchronize_session=False)
+        db.commit()
+        moved += len(live)
+        logger.info(
+            "Archived {} holdings rows of fund {} for {}", len(live), fund_id, month.strftime("%Y-%m")
+        )
+    return moved
 
 
 def replace_holdings(
     db: Session,
     items: Iterable[schemas.HoldingCreate],
     holdings_date: date,
+    fund_id: int = models.DEFAULT_FUND_ID,
 ) -> List[models.Holding]:
-    db.query(models.Holding).filter(models.Holding.date == holdings_date).delete()
+    db.query(models.Holding).filter(
+        models.Holding.fund_id == fund_id, models.Holding.date == holdings_date
+    ).delete()
     db.flush()
 
     holdings: list[models.Holding] = []
@@ -84,6 +419,7 @@ def replace_holdings(
     for item in items:
         weight = (item.market_value / total_value) if total_value else None
         holding = models.Holding(
+            fund_id=fund_id,
             name=item.name,
             symbol=item.symbol,
             quantity=item.quantity,
@@ -98,11 +434,52 @@ def replace_holdings(
     return holdings
 
 
-def get_investors(db: Session) -> List[models.Investor]:
-    stmt = select(models.Investor).order_by(asc(models.Investor.id))
+def get_funds(db: Session) -> List[models.Fund]:
+    return list(db.execute(select(models.Fund).order_by(asc(models.Fund.id))).scalars())
+
+
+def get_fund_ids(db: Session) -> List[int]:
+    return list(db.execute(select(models.Fund.id).order_by(asc(models.Fund.id))).scalars())
+
+
+def get_fund(db: Session, fund_id: int) -> Optional[models.Fund]:
+    return db.get(models.Fund, fund_id)
+
+
+def create_fund(db: Session, payload: schemas.FundCreate) -> models.Fund:
+    code = payload.code.strip()
+    if db.execute(select(models.Fund.id).where(models.Fund.code == code)).first() is not None:
+        raise ValueError(f"A fund with code '{code}' already exists.")
+    account_code = (payload.account_code or "").strip() or None
+    fund = models.Fund(code=code, name=payload.name, account_code=account_code)
+    db.add(fund)
+    db.commit()
+    db.refresh(fund)
+    return fund
+
+
+def _fund_investor_ids(fund_id: int):
+    return select(models.Investor.id).where(models.Investor.fund_id == fund_id)
+
+
+def get_investors(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> List[models.Investor]:
+    stmt = (
+        select(models.Investor)
+        .where(models.Investor.fund_id == fund_id)
+        .order_by(asc(models.Investor.id))
+    )
     return [investor for investor, in db.execute(stmt)]
 
 
+def get_investor_rows(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> List[dict]:
+    stmt = (
+        _row_select(schemas.InvestorRead, models.Investor)
+        .where(models.Investor.fund_id == fund_id)
+        .order_by(asc(models.Investor.id))
+    )
+    return _rows(db, stmt, schemas.InvestorRead)
+
+
 def get_investor(db: Session, investor_id: int) -> Optional[models.Investor]:
     stmt = select(models.Investor).where(models.Investor.id == investor_id)
     return db.execute(stmt).scalar_one_or_none()
@@ -120,7 +497,12 @@ def authenticate_investor(db: Session, identifier: str, password: str) -> Option
     return investor
 
 
-def create_investor(db: Session, payload: schemas.InvestorCreate, current_investor: Optional[models.Investor] = None) -> models.Investor:
+def create_investor(
+    db: Session,
+    payload: schemas.InvestorCreate,
+    current_investor: Optional[models.Investor] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> models.Investor:
     # 检查是否有当前用户且尝试设置管理员权限
     is_admin = payload.is_admin if hasattr(payload, 'is_admin') else False
     
@@ -130,6 +512,7 @@ def create_investor(db: Session, payload: schemas.InvestorCreate, current_invest
 
     identifier = (payload.identifier or "").strip() or None
     investor = models.Investor(
+        fund_id=fund_id,
         name=payload.name,
         identifier=identifier,
         initial_investment=payload.initial_investment,
@@ -139,9 +522,15 @@ def create_investor(db: Session, payload: schemas.InvestorCreate, current_invest
         is_admin=is_admin
     )
     db.add(investor)
+    db.flush()
+    _record_share_change(
+        db, investor, payload.shares, payload.initial_investment, note="opening balance"
+    )
     db.commit()
+    bump_data_version(fund_id)
+    publish("investors.changed", {"fund_id": fund_id, "investor_id": investor.id, "action": "created"})
     db.refresh(investor)
-    _recalculate_nav_with_latest_holdings(db)
+    _recalculate_nav_with_latest_holdings(db, fund_id)
     db.refresh(investor)
     return investor
 
@@ -161,16 +550,30 @@ def update_investor(
     if "identifier" in update_data:
         raw_identifier = update_data["identifier"] or ""
         update_data["identifier"] = raw_identifier.strip() or None
-        
+
+    previous_shares = investor.shares
+    previous_investment = investor.initial_investment
     for field, value in update_data.items():
         if field == "password":
             investor.password_hash = get_password_hash(value)
             continue
         setattr(investor, field, value)
-        
+
+    _record_share_change(
+        db,
+        investor,
+        investor.shares - previous_shares,
+        investor.initial_investment - previous_investment,
+        note="admin adjustment",
+    )
     db.commit()
+    bump_data_version(investor.fund_id)
+    publish(
+        "investors.changed",
+        {"fund_id": investor.fund_id, "investor_id": investor.id, "action": "updated"},
+    )
     db.refresh(investor)
-    _recalculate_nav_with_latest_holdings(db)
+    _recalculate_nav_with_latest_holdings(db, investor.fund_id)
     db.refresh(investor)
     return investor
 
@@ -178,14 +581,270 @@ def update_investor(
 def update_investor_password(db: Session, investor: models.Investor, new_password: str) -> models.Investor:
     investor.password_hash = get_password_hash(new_password)
     db.commit()
+    bump_data_version(investor.fund_id)
     db.refresh(investor)
     return investor
 
 
 def delete_investor(db: Session, investor: models.Investor) -> None:
+    for model in (models.ShareTransaction, models.InvestorValueHistory):
+        db.query(model).filter(model.investor_id == investor.id).delete()
+    investor_id, fund_id = investor.id, investor.fund_id
     db.delete(investor)
     db.commit()
-    _recalculate_nav_with_latest_holdings(db)
+    bump_data_version(fund_id)
+    publish("investors.changed", {"fund_id": fund_id, "investor_id": investor_id, "action": "deleted"})
+    _recalculate_nav_with_latest_holdings(db, fund_id)
+
+
+def _record_share_change(
+    db: Session,
+    investor: models.Investor,
+    shares: float,
+    amount: float,
+    note: Optional[str] = None,
+    on: Optional[date] = None,
+) -> Optional[models.ShareTransaction]:
+    if not shares and not amount:
+        return None
+    entry = models.ShareTransaction(
+        investor_id=investor.id,
+        date=on or date.today(),
+        shares=shares,
+        amount=amount,
+        note=note,
+    )
+    db.add(entry)
+    return entry
+
+
+def get_share_transactions(db: Session, investor_id: int) -> List[models.ShareTransaction]:
+    stmt = (
+        select(models.ShareTransaction)
+        .where(models.ShareTransaction.investor_id == investor_id)
+        .order_by(asc(models.ShareTransaction.date), asc(models.ShareTransaction.id))
+    )
+    return [entry for entry, in db.execute(stmt)]
+
+
+def add_share_transaction(
+    db: Session,
+    investor: models.Investor,
+    payload: schemas.ShareTransactionCreate,
+) -> models.ShareTransaction:
+    """
+    Record a dated subscription or redemption and apply it to the investor's balance.
+
+    NAVs and investor values are revalued from the transaction's date on; one
+    dated after the latest NAV revalues that NAV, as rewriting it would.
+    """
+    if investor.shares + payload.shares < 0:
+        raise ValueError("Redemption exceeds the investor's current shares.")
+    investor.shares += payload.shares
+    investor.initial_investment = max(investor.initial_investment + payload.amount, 0.0)
+    entry = _record_share_change(
+        db, investor, payload.shares, payload.amount, note=payload.note, on=payload.date
+    )
+    if entry is None:
+        raise ValueError("A share transaction needs a non-zero share or amount change.")
+    db.flush()
+    fund_id = investor.fund_id
+    latest_date = _latest_nav_date(db, fund_id)
+    summary = None
+    if latest_date is not None:
+        summary = _revalue_history(db, min(entry.date, latest_date), fund_id, shares=payload.shares)
+        if summary is None:
+            # Amount-only entries leave NAVs alone but change the invested total.
+            rebuild_investor_values(db, investor_ids=[investor.id], fund_id=fund_id)
+    db.commit()
+    bump_data_version(fund_id)
+    publish(
+        "investors.changed",
+        {"fund_id": fund_id, "investor_id": investor.id, "action": "transaction"},
+    )
+    if summary is not None:
+        publish("nav.updated", {"fund_id": fund_id, **summary.dict()})
+    db.refresh(entry)
+    return entry
+
+
+def _ensure_opening_entries(db: Session, fund_id: int) -> List[int]:
+    """
+    Give investors created before the ledger existed an opening entry.
+
+    Their current shares are assumed to have been held since the first NAV date.
+    Returns the ids of the investors that were given one.
+    """
+    has_entries = (
+        select(models.ShareTransaction.id)
+        .where(models.ShareTransaction.investor_id == models.Investor.id)
+        .exists()
+    )
+    stmt = select(models.Investor).where(
+        models.Investor.fund_id == fund_id,
+        ~has_entries,
+        (models.Investor.shares != 0) | (models.Investor.initial_investment != 0),
+    )
+    missing = [investor for investor, in db.execute(stmt)]
+    if not missing:
+        return []
+    first_date = db.execute(
+        select(func.min(models.FundHistory.date)).where(models.FundHistory.fund_id == fund_id)
+    ).scalar_one_or_none()
+    for investor in missing:
+        _record_share_change(
+            db,
+            investor,
+            investor.shares,
+            investor.initial_investment,
+            note="opening balance",
+            on=first_date or date.today(),
+        )
+    db.flush()
+    return [investor.id for investor in missing]
+
+
+def backfill_opening_entries(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> List[int]:
+    """
+    Seed opening entries for investors that predate the ledger and build their
+    value series over the whole NAV history.
+
+    The caller owns the transaction. Returns the ids of the backfilled investors.
+    """
+    seeded = _ensure_opening_entries(db, fund_id)
+    if seeded:
+        rebuild_investor_values(db, investor_ids=seeded, fund_id=fund_id)
+        logger.info("Backfilled value history of {} investors in fund {}.", len(seeded), fund_id)
+    return seeded
+
+
+def _refresh_investor_values(db: Session, on_date: date, nav: float, fund_id: int) -> None:
+    """
+    Rewrite the materialized value of every investor in the fund for one NAV date.
+
+    A day's value depends only on that day's NAV and the ledger balance as of
+    the day, so a write for any date touches only that date's rows. Investors
+    seeded with an opening entry here get their full series rebuilt first.
+    """
+    backfill_opening_entries(db, fund_id)
+    fund_investors = _fund_investor_ids(fund_id)
+    balances_stmt = (
+        select(
+            models.ShareTransaction.investor_id,
+            func.sum(models.ShareTransaction.shares),
+            func.sum(models.ShareTransaction.amount),
+        )
+        .where(
+            models.ShareTransaction.investor_id.in_(fund_investors),
+            models.ShareTransaction.date <= on_date,
+        )
+        .group_by(models.ShareTransaction.investor_id)
+    )
+    rows = []
+    for investor_id, shares, invested in db.execute(balances_stmt):
+        value = shares * nav
+        rows.append(
+            {
+                "investor_id": investor_id,
+                "date": on_date,
+                "shares": shares,
+                "invested": invested,
+                "value": value,
+                "pnl": value - invested,
+            }
+        )
+    db.query(models.InvestorValueHistory).filter(
+        models.InvestorValueHistory.investor_id.in_(fund_investors),
+        models.InvestorValueHistory.date == on_date,
+    ).delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(models.InvestorValueHistory), rows)
+
+
+def rebuild_investor_values(
+    db: Session,
+    investor_ids: Optional[List[int]] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> int:
+    """
+    Recompute materialized investor value series from the ledger and NAV history.
+
+    Rebuilds all investors of the fund unless ``investor_ids`` is given. The
+    caller owns the transaction. Returns the number of rows written.
+    """
+    import numpy as np
+
+    from .utils.investor_values import value_series
+
+    _ensure_opening_entries(db, fund_id)
+    series = get_fund_history_series(db, fund_id=fund_id)
+    fund_investors = _fund_investor_ids(fund_id)
+    ledger_stmt = select(
+        models.ShareTransaction.investor_id,
+        models.ShareTransaction.date,
+        models.ShareTransaction.shares,
+        models.ShareTransaction.amount,
+    ).where(models.ShareTransaction.investor_id.in_(fund_investors))
+    delete_query = db.query(models.InvestorValueHistory).filter(
+        models.InvestorValueHistory.investor_id.in_(fund_investors)
+    )
+    if investor_ids is not None:
+        ledger_stmt = ledger_stmt.where(models.ShareTransaction.investor_id.in_(investor_ids))
+        delete_query = delete_query.filter(
+            models.InvestorValueHistory.investor_id.in_(investor_ids)
+        )
+    ledger = db.execute(ledger_stmt).all()
+    delete_query.delete(synchronize_session=False)
+    if not series or not ledger:
+        return 0
+
+    columns = value_series(
+        nav_dates=np.array([d.toordinal() for d, _, _ in series], dtype=np.int64),
+        navs=np.array([nav for _, nav, _ in series], dtype=np.float64),
+        investor_ids=np.array([row[0] for row in ledger], dtype=np.int64),
+        ledger_dates=np.array([row[1].toordinal() for row in ledger], dtype=np.int64),
+        share_deltas=np.array([row[2] for row in ledger], dtype=np.float64),
+        amounts=np.array([row[3] for row in ledger], dtype=np.float64),
+    )
+    rows = [
+        {
+            "investor_id": investor_id,
+            "date": date.fromordinal(ordinal),
+            "shares": shares,
+            "invested": invested,
+            "value": value,
+            "pnl": pnl,
+        }
+        for investor_id, ordinal, shares, invested, value, pnl in zip(
+            columns["investor_id"].tolist(),
+            columns["date"].tolist(),
+            columns["shares"].tolist(),
+            columns["invested"].tolist(),
+            columns["value"].tolist(),
+            columns["pnl"].tolist(),
+        )
+    ]
+    if rows:
+        db.execute(insert(models.InvestorValueHistory), rows)
+    return len(rows)
+
+
+def get_investor_value_history(
+    db: Session,
+    investor_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[dict]:
+    stmt = (
+        _row_select(schemas.InvestorValuePoint, models.InvestorValueHistory)
+        .where(models.InvestorValueHistory.investor_id == investor_id)
+        .order_by(asc(models.InvestorValueHistory.date))
+    )
+    if start is not None:
+        stmt = stmt.where(models.InvestorValueHistory.date >= start)
+    if end is not None:
+        stmt = stmt.where(models.InvestorValueHistory.date <= end)
+    return _rows(db, stmt, schemas.InvestorValuePoint)
 
 
 def create_investor_token(
@@ -215,7 +874,11 @@ def create_investor_token(
 
 def get_investor_token(db: Session, token: str) -> Optional[models.InvestorToken]:
     """根据令牌字符串获取投资者令牌"""
-    stmt = select(models.InvestorToken).where(models.InvestorToken.token == token)
+    stmt = (
+        select(models.InvestorToken)
+        .options(joinedload(models.InvestorToken.investor))
+        .where(models.InvestorToken.token == token)
+    )
     return db.execute(stmt).scalar_one_or_none()
 
 
@@ -240,30 +903,36 @@ def cleanup_expired_tokens(db: Session) -> int:
     return count
 
 
-def get_initial_total_investment(db: Session) -> float:
-    stmt = select(func.sum(models.Investor.initial_investment))
+def get_initial_total_investment(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> float:
+    stmt = select(func.sum(models.Investor.initial_investment)).where(
+        models.Investor.fund_id == fund_id
+    )
     result = db.execute(stmt).scalar_one_or_none()
     return float(result or 0.0)
 
 
-def get_total_shares(db: Session) -> float:
-    stmt = select(func.sum(models.Investor.shares))
+def get_total_shares(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> float:
+    stmt = select(func.sum(models.Investor.shares)).where(models.Investor.fund_id == fund_id)
     result = db.execute(stmt).scalar_one_or_none()
     return float(result or 0.0)
 
 
-def get_latest_fund_history(db: Session) -> Optional[models.FundHistory]:
+def get_latest_fund_history(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> Optional[models.FundHistory]:
     stmt = (
         select(models.FundHistory)
+        .where(models.FundHistory.fund_id == fund_id)
         .order_by(desc(models.FundHistory.date))
         .limit(1)
     )
     return db.execute(stmt).scalar_one_or_none()
 
 
-def get_fund_history(db: Session, limit: int = 30) -> List[models.FundHistory]:
+def get_fund_history(
+    db: Session, limit: int = 30, fund_id: int = models.DEFAULT_FUND_ID
+) -> List[models.FundHistory]:
     stmt = (
         select(models.FundHistory)
+        .where(models.FundHistory.fund_id == fund_id)
         .order_by(desc(models.FundHistory.date))
         .limit(limit)
     )
@@ -271,39 +940,439 @@ def get_fund_history(db: Session, limit: int = 30) -> List[models.FundHistory]:
     return list(reversed(records))
 
 
+def get_fund_history_rows(db: Session, limit: int = 30, fund_id: int = models.DEFAULT_FUND_ID) -> List[dict]:
+    """Same records as ``get_fund_history`` as plain ``FundHistoryRead``-shaped dicts."""
+    stmt = (
+        _row_select(schemas.FundHistoryRead, models.FundHistory)
+        .where(models.FundHistory.fund_id == fund_id)
+        .order_by(desc(models.FundHistory.date))
+        .limit(limit)
+    )
+    return list(reversed(_rows(db, stmt, schemas.FundHistoryRead)))
+
+
+def _fund_history_range_stmt(
+    stmt,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    after: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+):
+    stmt = stmt.where(models.FundHistory.fund_id == fund_id).order_by(asc(models.FundHistory.date))
+    if start is not None:
+        stmt = stmt.where(models.FundHistory.date >= start)
+    if end is not None:
+        stmt = stmt.where(models.FundHistory.date <= end)
+    if after is not None:
+        stmt = stmt.where(models.FundHistory.date > after)
+    return stmt
+
+
+def get_fund_history_page(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    after: Optional[date] = None,
+    limit: int = 500,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> tuple[List[dict], Optional[date]]:
+    """
+    Return one page of history rows in ascending date order using keyset pagination.
+
+    ``after`` is the cursor returned by the previous page (the last date seen);
+    the returned cursor is ``None`` once the range is exhausted.
+    """
+    stmt = _fund_history_range_stmt(
+        _row_select(schemas.FundHistoryRead, models.FundHistory), start, end, after, fund_id
+    ).limit(limit + 1)
+    records = _rows(db, stmt, schemas.FundHistoryRead)
+    if len(records) > limit:
+        records = records[:limit]
+        return records, records[-1]["date"]
+    return records, None
+
+
+def iter_fund_history(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    chunk_size: int = 500,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> Iterator[dict]:
+    """
+    Yield history rows in ascending date order, fetching ``chunk_size`` rows at a time.
+
+    Each chunk is a separate keyset query, so memory stays bounded by the chunk
+    size and no cursor is held open between chunks.
+    """
+    after: Optional[date] = None
+    while True:
+        records, after = get_fund_history_page(db, start, end, after, chunk_size, fund_id)
+        yield from records
+        if after is None:
+            return
+
+
+def get_fund_history_series(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> List[tuple[date, float, float]]:
+    """Return ``(date, nav, total_value)`` tuples in ascending date order."""
+    stmt = _fund_history_range_stmt(
+        select(
+            models.FundHistory.date,
+            models.FundHistory.nav,
+            models.FundHistory.total_value,
+        ),
+        start,
+        end,
+        fund_id=fund_id,
+    )
+    return [tuple(row) for row in db.execute(stmt)]
+
+
+def _keyset_chunks(db: Session, stmt, keys: list, chunk_size: int) -> Iterator[List[tuple]]:
+    """
+    Yield the rows of ``stmt`` in chunks, paging on the leading ``keys`` columns.
+
+    ``stmt`` must select ``keys`` first and have no ordering of its own. The
+    session is rolled back after every chunk so a long export never keeps a
+    transaction (and, on SQLite, a read lock) open between chunks.
+    """
+    stmt = stmt.order_by(*(asc(key) for key in keys)).limit(chunk_size)
+    after: Optional[tuple] = None
+    while True:
+        page = stmt
+        if after is not None:
+            page = page.where(tuple_(*keys) > after if len(keys) > 1 else keys[0] > after[0])
+        rows = [tuple(row) for row in db.execute(page)]
+        db.rollback()
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        after = rows[-1][: len(keys)]
+
+
+def _date_range(stmt, column, start: Optional[date], end: Optional[date]):
+    if start is not None:
+        stmt = stmt.where(column >= start)
+    if end is not None:
+        stmt = stmt.where(column <= end)
+    return stmt
+
+
+FUND_HISTORY_EXPORT_COLUMNS = [
+    ("date", "date"),
+    ("nav", "float"),
+    ("total_value", "float"),
+    ("change_value", "float"),
+    ("change_pct", "float"),
+]
+
+HOLDINGS_EXPORT_COLUMNS = [
+    ("date", "date"),
+    ("id", "int"),
+    ("symbol", "str"),
+    ("name", "str"),
+    ("quantity", "float"),
+    ("cost_price", "float"),
+    ("market_value", "float"),
+    ("weight", "float"),
+]
+
+INVESTOR_VALUES_EXPORT_COLUMNS = [
+    ("date", "date"),
+    ("investor_id", "int"),
+    ("investor_name", "str"),
+    ("shares", "float"),
+    ("invested", "float"),
+    ("value", "float"),
+    ("pnl", "float"),
+]
+
+
+def iter_fund_history_export(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    chunk_size: int = 5000,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> Iterator[List[tuple]]:
+    """Chunks of ``FUND_HISTORY_EXPORT_COLUMNS`` tuples in ascending date order."""
+    history = models.FundHistory
+    stmt = _date_range(
+        select(
+            history.date,
+            history.nav,
+            history.total_value,
+            history.change_value,
+            history.change_pct,
+        ).where(history.fund_id == fund_id),
+        history.date,
+        start,
+        end,
+    )
+    return _keyset_chunks(db, stmt, [history.date], chunk_size)
+
+
+def iter_holdings_export(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    chunk_size: int = 5000,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> Iterator[List[tuple]]:
+    """
+    Chunks of ``HOLDINGS_EXPORT_COLUMNS`` tuples ordered by date and id.
+
+    Live rows and archived months are merged, so the export covers the full
+    history regardless of how much of it has been compacted.
+    """
+    holding = models.Holding
+    stmt = _date_range(
+        select(
+            holding.date,
+            holding.id,
+            holding.symbol,
+            holding.name,
+            holding.quantity,
+            holding.cost_price,
+            holding.market_value,
+            holding.weight,
+        ).where(holding.fund_id == fund_id),
+        holding.date,
+        start,
+        end,
+    )
+    live_dates_stmt = select(holding.date).where(holding.fund_id == fund_id).distinct()
+    live_dates = set(db.execute(_date_range(live_dates_stmt, holding.date, start, end)).scalars())
+    db.rollback()
+    live = (
+        row
+        for chunk in _keyset_chunks(db, stmt, [holding.date, holding.id], chunk_size)
+        for row in chunk
+    )
+    archived = _iter_archived_export_rows(db, start, end, live_dates, fund_id)
+
+    merged = heapq.merge(live, archived, key=lambda row: row[:2])
+    while True:
+        chunk = list(islice(merged, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_archived_export_rows(
+    db: Session,
+    start: Optional[date],
+    end: Optional[date],
+    skip_dates: set,
+    fund_id: int,
+) -> Iterator[tuple]:
+    # Months are decoded one at a time to keep memory bounded by a single month.
+    archived = models.HoldingsArchive
+    stmt = select(archived.id).where(archived.fund_id == fund_id).order_by(asc(archived.month))
+    if start is not None:
+        stmt = stmt.where(archived.end_date >= start)
+    if end is not None:
+        stmt = stmt.where(archived.start_date <= end)
+    month_ids = list(db.execute(stmt).scalars())
+    db.rollback()
+
+    columns = [name for name, _ in HOLDINGS_EXPORT_COLUMNS]
+    for month_id in month_ids:
+        payload = db.execute(select(archived.payload).where(archived.id == month_id)).scalar()
+        db.rollback()
+        if payload is None:
+            continue
+        rows = [
+            tuple(row[column] for column in columns)
+            for row in archive.decode_rows(payload)
+            if row["date"] not in skip_dates
+            and (start is None or row["date"] >= start)
+            and (end is None or row["date"] <= end)
+        ]
+        rows.sort(key=lambda row: row[:2])
+        yield from rows
+
+
+def iter_investor_values_export(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    chunk_size: int = 5000,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> Iterator[List[tuple]]:
+    """Chunks of ``INVESTOR_VALUES_EXPORT_COLUMNS`` tuples ordered by date and investor."""
+    values = models.InvestorValueHistory
+    stmt = _date_range(
+        select(
+            values.date,
+            values.investor_id,
+            models.Investor.name,
+            values.shares,
+            values.invested,
+            values.value,
+            values.pnl,
+        )
+        .join(models.Investor, models.Investor.id == values.investor_id)
+        .where(models.Investor.fund_id == fund_id),
+        values.date,
+        start,
+        end,
+    )
+    return _keyset_chunks(db, stmt, [values.date, values.investor_id], chunk_size)
+
+
+def get_dashboard_rows(
+    db: Session,
+    investor: models.Investor,
+    history_limit: int = 90,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> dict:
+    """
+    Everything the dashboard renders, read inside one snapshot transaction.
+
+    The NAV summary is derived from the newest history row, so this costs one
+    query each for history, latest holdings and cash (plus the as-of cash
+    lookup for the summary), and the investor list for administrators.
+    """
+    # Read the caller before the snapshot starts: its rollback expires
+    # ``investor``, and touching it afterwards would reload it.
+    investor_row = as_row(schemas.InvestorRead, investor)
+    with read_transaction(db):
+        history = get_fund_history_rows(db, limit=history_limit, fund_id=fund_id)
+        holdings = get_latest_holdings_rows(db, fund_id)
+        cash_stmt = _row_select(schemas.CashBalance, models.FundCash).where(
+            models.FundCash.fund_id == fund_id
+        )
+        cash_rows = _rows(db, cash_stmt, schemas.CashBalance)
+        investors = get_investor_rows(db, fund_id) if investor_row["is_admin"] else None
+        summary_cash = (
+            get_cash_balance_as_of(db, history[-1]["date"], fund_id) if history else None
+        )
+
+    cash = cash_rows[0] if cash_rows else None
+    summary = None
+    if history:
+        latest = history[-1]
+        summary = {
+            "date": latest["date"],
+            "nav": latest["nav"],
+            "total_value": latest["total_value"],
+            "cash": summary_cash,
+            "change_pct": latest["change_pct"],
+            "change_value": latest["change_value"],
+        }
+    return {
+        "summary": summary,
+        "history": history,
+        "holdings": holdings,
+        "cash": cash,
+        "investor": investor_row,
+        "investors": investors,
+    }
+
+
+def _snapshot_hash(
+    items: Iterable[schemas.HoldingCreate], holdings_date: date, cash: float, total_shares: float
+) -> str:
+    """
+    Canonical SHA-256 of a NAV write's inputs.
+
+    Covers the stored holding fields (weights are derived, so they are left
+    out) in a stable order, plus the cash balance and total shares, so
+    re-sending the same snapshot in any order produces the same hash.
+    """
+    # Rows are ordered by their JSON encoding: optional fields may be None,
+    # which does not compare against numbers.
+    rows = sorted(
+        json.dumps(
+            [item.symbol, item.name, item.quantity, item.cost_price, item.market_value],
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        for item in items
+    )
+    payload = {
+        "date": holdings_date.isoformat(),
+        "holdings": rows,
+        "cash": round(cash, 6),
+        "total_shares": round(total_shares, 6),
+    }
+    encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
 def update_holdings_and_nav(
     db: Session,
     items: Iterable[schemas.HoldingCreate],
     holdings_date: Optional[date] = None,
     created_by: Optional[models.Investor] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
 ) -> schemas.FundSummary:
+    """
+    Replace the holdings snapshot of ``holdings_date`` and recompute its NAV.
+
+    Writes nothing when the same holdings, cash and total shares were already
+    recorded for that date; the stored summary is returned instead.
+    """
     holdings_date = holdings_date or date.today()
     items = list(items)
     if not items:
         raise ValueError("Holdings data is empty; nothing to update.")
 
-    holdings = replace_holdings(db, items, holdings_date)
-    total_value = sum(h.market_value for h in holdings)
-    cash_balance = get_cash_balance(db)
-    total_assets = total_value + cash_balance.amount
-
-    total_shares = get_total_shares(db)
+    timer = PhaseTimer(NAV_UPDATE_SECONDS)
+    cash_amount = get_cash_balance_as_of(db, holdings_date, fund_id)
+    total_shares = get_total_shares(db, fund_id)
     if total_shares <= 0:
         raise ValueError("Investor total shares must be greater than zero.")
 
+    digest = _snapshot_hash(items, holdings_date, cash_amount, total_shares)
+    unchanged = db.execute(
+        select(models.FundHistory).where(
+            models.FundHistory.fund_id == fund_id,
+            models.FundHistory.date == holdings_date,
+            models.FundHistory.snapshot_hash == digest,
+        )
+    ).scalar_one_or_none()
+    if unchanged is not None:
+        timer.mark("unchanged")
+        timer.finish()
+        logger.info("Holdings snapshot for fund {} on {} is unchanged; skipping NAV write.", fund_id, holdings_date)
+        return schemas.FundSummary(
+            date=unchanged.date,
+            nav=unchanged.nav,
+            total_value=unchanged.total_value,
+            cash=cash_amount,
+            change_value=unchanged.change_value,
+            change_pct=unchanged.change_pct,
+        )
+
+    holdings = replace_holdings(db, items, holdings_date, fund_id)
+    timer.mark("holdings")
+    total_value = sum(h.market_value for h in holdings)
+    total_assets = total_value + cash_amount
+
     nav = total_assets / total_shares
 
-    investors = get_investors(db)
+    investors = get_investors(db, fund_id)
     for investor in investors:
         investor.current_value = investor.shares * nav
+    timer.mark("valuation")
 
     # Remove history entry for the same date to avoid duplicates
-    db.query(models.FundHistory).filter(models.FundHistory.date == holdings_date).delete()
+    db.query(models.FundHistory).filter(
+        models.FundHistory.fund_id == fund_id, models.FundHistory.date == holdings_date
+    ).delete()
     db.flush()
 
     previous_history_stmt = (
         select(models.FundHistory)
-        .where(models.FundHistory.date < holdings_date)
+        .where(models.FundHistory.fund_id == fund_id, models.FundHistory.date < holdings_date)
         .order_by(desc(models.FundHistory.date))
         .limit(1)
     )
@@ -317,48 +1386,504 @@ def update_holdings_and_nav(
             change_pct = (change_value / previous_history.total_value) * 100
 
     history = models.FundHistory(
+        fund_id=fund_id,
         date=holdings_date,
         nav=nav,
         total_value=total_assets,
         change_value=change_value,
         change_pct=change_pct,
+        snapshot_hash=digest,
         created_by_id=getattr(created_by, "id", None),
     )
     db.add(history)
+    db.flush()
+    timer.mark("history")
+    _update_fund_analytics(db, history, previous_history)
+    timer.mark("analytics")
+    _refresh_investor_values(db, holdings_date, nav, fund_id)
+    timer.mark("investor_values")
     db.commit()
+    bump_data_version(fund_id)
     db.refresh(history)
+    timer.mark("commit")
+    timer.finish()
 
-    return schemas.FundSummary(
+    summary = schemas.FundSummary(
         date=holdings_date,
         nav=nav,
         total_value=total_assets,
-        cash=cash_balance.amount,
+        cash=cash_amount,
         change_value=change_value,
         change_pct=change_pct,
     )
+    publish("nav.updated", {"fund_id": fund_id, **summary.dict()})
+    return summary
+
+
+def estimate_intraday_point(
+    db: Session,
+    quote_source,
+    on_date: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> Optional[tuple[float, float, float]]:
+    """
+    Revalue the fund's latest holdings snapshot at live quotes.
+
+    Returns ``(nav, total_value, holdings_value)`` or ``None`` without holdings.
+    """
+    import numpy as np
+
+    from .utils.intraday import estimate_nav
+
+    latest = get_latest_holdings_rows(db, fund_id)
+    if latest is None:
+        return None
+    holdings = latest["holdings"]
+    symbols = [holding["symbol"] for holding in holdings]
+    reference = {
+        h["symbol"]: h["market_value"] / h["quantity"]
+        for h in holdings
+        if h["symbol"] and h["quantity"]
+    }
+    quotes = quote_source.get_quotes([symbol for symbol in symbols if symbol], reference)
+
+    quantities = np.array(
+        [np.nan if h["quantity"] is None else h["quantity"] for h in holdings], dtype=np.float64
+    )
+    prices = np.array([quotes.get(symbol, np.nan) for symbol in symbols], dtype=np.float64)
+    fallback = np.array([h["market_value"] for h in holdings], dtype=np.float64)
+    cash = get_cash_balance_as_of(db, on_date or date.today(), fund_id)
+    return estimate_nav(quantities, prices, fallback, cash, get_total_shares(db, fund_id))
+
+
+def save_intraday_points(db: Session, points, fund_id: int = models.DEFAULT_FUND_ID) -> int:
+    """Persist compacted ring-buffer points (rows of ``utils.intraday.FIELDS``)."""
+    from .utils.intraday import trading_date
+
+    rows = []
+    for timestamp, nav, total_value, holdings_value in points:
+        moment = datetime.utcfromtimestamp(float(timestamp))
+        rows.append(
+            {
+                "fund_id": fund_id,
+                "date": trading_date(float(timestamp)),
+                "timestamp": moment,
+                "nav": float(nav),
+                "total_value": float(total_value),
+                "holdings_value": float(holdings_value),
+            }
+        )
+    if rows:
+        existing = set(
+            db.execute(
+                select(models.IntradayNav.timestamp).where(
+                    models.IntradayNav.fund_id == fund_id,
+                    models.IntradayNav.timestamp.in_([row["timestamp"] for row in rows]),
+                )
+            ).scalars()
+        )
+        rows = [row for row in rows if row["timestamp"] not in existing]
+    if rows:
+        db.execute(insert(models.IntradayNav), rows)
+    db.commit()
+    return len(rows)
+
+
+def get_intraday_points(db: Session, on_date: date, fund_id: int = models.DEFAULT_FUND_ID) -> List[dict]:
+    stmt = (
+        _row_select(schemas.IntradayPoint, models.IntradayNav)
+        .where(models.IntradayNav.fund_id == fund_id, models.IntradayNav.date == on_date)
+        .order_by(asc(models.IntradayNav.timestamp))
+    )
+    return _rows(db, stmt, schemas.IntradayPoint)
 
 
-def get_cash_balance(db: Session) -> models.FundCash:
-    cash = db.query(models.FundCash).first()
+def get_base_nav(db: Session, before: date, fund_id: int = models.DEFAULT_FUND_ID) -> Optional[float]:
+    """Latest official NAV strictly before ``before``."""
+    stmt = (
+        select(models.FundHistory.nav)
+        .where(models.FundHistory.fund_id == fund_id, models.FundHistory.date < before)
+        .order_by(desc(models.FundHistory.date))
+        .limit(1)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def get_fund_analytics(
+    db: Session, as_of: Optional[date] = None, fund_id: int = models.DEFAULT_FUND_ID
+) -> Optional[models.FundAnalytics]:
+    stmt = (
+        select(models.FundAnalytics)
+        .where(models.FundAnalytics.fund_id == fund_id)
+        .order_by(desc(models.FundAnalytics.date))
+        .limit(1)
+    )
+    if as_of is not None:
+        stmt = stmt.where(models.FundAnalytics.date <= as_of)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def _update_fund_analytics(
+    db: Session,
+    history: models.FundHistory,
+    previous_history: Optional[models.FundHistory],
+) -> None:
+    """
+    Derive the analytics row for a freshly written history row from the day before.
+
+    Writes that land before the newest analytics row, or that find the table out
+    of step with ``fund_history``, fall back to a full rebuild.
+    """
+    fund_id = history.fund_id
+    newer_stmt = select(models.FundAnalytics.id).where(
+        models.FundAnalytics.fund_id == fund_id, models.FundAnalytics.date > history.date
+    ).limit(1)
+    if db.execute(newer_stmt).first() is not None:
+        rebuild_fund_analytics(db, fund_id)
+        return
+
+    db.query(models.FundAnalytics).filter(
+        models.FundAnalytics.fund_id == fund_id, models.FundAnalytics.date == history.date
+    ).delete()
+    previous = get_fund_analytics(db, as_of=history.date - timedelta(days=1), fund_id=fund_id)
+    previous_date = previous.date if previous else None
+    if previous_date != getattr(previous_history, "date", None):
+        rebuild_fund_analytics(db, fund_id)
+        return
+
+    state = None
+    dropped_return = None
+    if previous is not None:
+        state = {field: getattr(previous, field) for field in ("nav", *analytics.STATE_FIELDS)}
+        if previous.rolling_count >= analytics.ROLLING_WINDOW:
+            dropped_stmt = (
+                select(models.FundAnalytics.daily_return)
+                .where(
+                    models.FundAnalytics.fund_id == fund_id,
+                    models.FundAnalytics.date < history.date,
+                )
+                .order_by(desc(models.FundAnalytics.date))
+                .offset(analytics.ROLLING_WINDOW - 1)
+                .limit(1)
+            )
+            dropped_return = db.execute(dropped_stmt).scalar_one_or_none()
+
+    row = analytics.next_row(state, history.nav, dropped_return)
+    db.add(models.FundAnalytics(fund_id=fund_id, date=history.date, **row))
+
+
+def rebuild_fund_analytics(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> int:
+    """
+    Recompute every analytics row of a fund from ``fund_history`` in one vectorized pass.
+
+    The caller owns the transaction. Returns the number of rows written.
+    """
+    series = get_fund_history_series(db, fund_id=fund_id)
+    db.query(models.FundAnalytics).filter(models.FundAnalytics.fund_id == fund_id).delete()
+    if not series:
+        return 0
+
+    columns = analytics.rebuild_rows([nav for _, nav, _ in series])
+    names = list(columns)
+    rows = []
+    for index, (history_date, _, _) in enumerate(series):
+        row = {"fund_id": fund_id, "date": history_date}
+        for name in names:
+            value = columns[name][index]
+            if value is not None:
+                value = value.item() if hasattr(value, "item") else value
+                if isinstance(value, float) and value != value:
+                    value = None
+            row[name] = value
+        rows.append(row)
+    db.execute(insert(models.FundAnalytics), rows)
+    return len(rows)
+
+
+_cash_cache = VersionedCache(maxsize=64, name="cash")
+
+
+def get_cash_balance(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> schemas.CashBalance:
+    """
+    Current cash balance. Read-only: a fund without cash reports a zero balance.
+    """
+
+    def load() -> schemas.CashBalance:
+        cash = db.execute(
+            select(models.FundCash).where(models.FundCash.fund_id == fund_id)
+        ).scalar_one_or_none()
+        if cash is None:
+            now = datetime.utcnow()
+            return schemas.CashBalance(amount=0.0, created_at=now, updated_at=now)
+        return schemas.CashBalance.from_orm(cash)
+
+    return _cash_cache.get_or_compute(fund_id, load, fund_id=fund_id)
+
+
+def get_cash_balance_as_of(db: Session, as_of: date, fund_id: int = models.DEFAULT_FUND_ID) -> float:
+    """
+    Cash balance at the end of ``as_of`` according to the cash ledger.
+
+    Funds that predate the ledger fall back to the current balance.
+    """
+    if not _has_cash_ledger(db, fund_id):
+        return get_cash_balance(db, fund_id).amount
+    stmt = select(func.coalesce(func.sum(models.CashTransaction.amount), 0.0)).where(
+        models.CashTransaction.fund_id == fund_id, models.CashTransaction.date <= as_of
+    )
+    return float(db.execute(stmt).scalar_one())
+
+
+def get_cash_transactions(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fund_id: int = models.DEFAULT_FUND_ID,
+) -> List[models.CashTransaction]:
+    stmt = (
+        select(models.CashTransaction)
+        .where(models.CashTransaction.fund_id == fund_id)
+        .order_by(asc(models.CashTransaction.date), asc(models.CashTransaction.id))
+    )
+    if start is not None:
+        stmt = stmt.where(models.CashTransaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(models.CashTransaction.date <= end)
+    return [entry for entry, in db.execute(stmt)]
+
+
+def _has_cash_ledger(db: Session, fund_id: int) -> bool:
+    stmt = select(models.CashTransaction.id).where(models.CashTransaction.fund_id == fund_id).limit(1)
+    return db.execute(stmt).first() is not None
+
+
+def _current_cash_row(db: Session, fund_id: int) -> models.FundCash:
+    cash = db.query(models.FundCash).filter(models.FundCash.fund_id == fund_id).first()
     if not cash:
-        cash = models.FundCash(amount=0.0)
+        cash = models.FundCash(fund_id=fund_id, amount=0.0)
         db.add(cash)
-        db.commit()
-        db.refresh(cash)
+        db.flush()
     return cash
 
 
-def update_cash_balance(db: Session, amount: float) -> models.FundCash:
-    cash = get_cash_balance(db)
+def _ensure_cash_opening_entry(db: Session, cash: models.FundCash) -> None:
+    """Seed the ledger with the pre-ledger balance, dated at the first NAV date."""
+    if _has_cash_ledger(db, cash.fund_id):
+        return
+    if not cash.amount:
+        return
+    first_date = db.execute(
+        select(func.min(models.FundHistory.date)).where(models.FundHistory.fund_id == cash.fund_id)
+    ).scalar_one_or_none()
+    db.add(
+        models.CashTransaction(
+            fund_id=cash.fund_id,
+            date=first_date or date.today(),
+            amount=cash.amount,
+            note="opening balance",
+        )
+    )
+    db.flush()
+
+
+def _latest_nav_date(db: Session, fund_id: int) -> Optional[date]:
+    stmt = select(func.max(models.FundHistory.date)).where(models.FundHistory.fund_id == fund_id)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def _revalue_history(
+    db: Session, since: date, fund_id: int, cash: float = 0.0, shares: float = 0.0
+) -> Optional[schemas.FundSummary]:
+    """
+    Revalue every NAV date on or after ``since`` for a movement of ``cash``
+    and/or ``shares`` dated ``since``.
+
+    Each date keeps the share count its NAV was computed with (total value over
+    NAV) plus ``shares``, so later subscriptions do not dilute historical NAVs.
+    Changes follow ``update_holdings_and_nav``: holdings value against the
+    previous day's total. Investor values of the affected dates and the fund
+    analytics are rewritten too. The caller commits. Returns the new latest
+    summary if it changed.
+    """
+    if not cash and not shares:
+        return None
+    rows = db.execute(
+        select(models.FundHistory)
+        .where(models.FundHistory.fund_id == fund_id, models.FundHistory.date >= since)
+        .order_by(asc(models.FundHistory.date))
+    ).scalars().all()
+    if not rows:
+        return None
+    previous_total = db.execute(
+        select(models.FundHistory.total_value)
+        .where(models.FundHistory.fund_id == fund_id, models.FundHistory.date < since)
+        .order_by(desc(models.FundHistory.date))
+        .limit(1)
+    ).scalar_one_or_none()
+    previous_new = previous_total
+    for row in rows:
+        old_total = row.total_value
+        row_shares = (old_total / row.nav if row.nav else get_total_shares(db, fund_id)) + shares
+        row.total_value = old_total + cash
+        if row_shares > 0:
+            row.nav = row.total_value / row_shares
+        if row.change_value is not None and previous_total is not None:
+            holdings_value = row.change_value + previous_total
+            row.change_value = holdings_value - previous_new
+            row.change_pct = (row.change_value / previous_new) * 100 if previous_new else None
+        # The stored hash describes the inputs before this movement.
+        row.snapshot_hash = None
+        previous_total, previous_new = old_total, row.total_value
+        _refresh_investor_values(db, row.date, row.nav, fund_id)
+
+    latest = rows[-1]
+    for investor in get_investors(db, fund_id):
+        investor.current_value = investor.shares * latest.nav
+    db.flush()
+    rebuild_fund_analytics(db, fund_id)
+    return schemas.FundSummary(
+        date=latest.date,
+        nav=latest.nav,
+        total_value=latest.total_value,
+        cash=get_cash_balance_as_of(db, latest.date, fund_id),
+        change_value=latest.change_value,
+        change_pct=latest.change_pct,
+    )
+
+
+def _publish_cash_change(fund_id: int, amount: float, summary: Optional[schemas.FundSummary]) -> None:
+    bump_data_version(fund_id)
+    publish("cash.updated", {"fund_id": fund_id, "amount": amount})
+    if summary is not None:
+        publish("nav.updated", {"fund_id": fund_id, **summary.dict()})
+
+
+def add_cash_transaction(
+    db: Session, payload: schemas.CashTransactionCreate, fund_id: int = models.DEFAULT_FUND_ID
+) -> models.CashTransaction:
+    """
+    Record a dated cash movement, refresh the materialized current balance and
+    revalue the NAV history from the movement's date on.
+    """
+    cash = _current_cash_row(db, fund_id)
+    _ensure_cash_opening_entry(db, cash)
+    entry = models.CashTransaction(
+        fund_id=fund_id, date=payload.date, amount=payload.amount, note=payload.note
+    )
+    db.add(entry)
+    db.flush()
+    cash.amount = get_cash_balance_as_of(db, date.today(), fund_id)
+    summary = _revalue_history(db, payload.date, fund_id, cash=payload.amount)
+    db.commit()
+    _publish_cash_change(fund_id, cash.amount, summary)
+    db.refresh(entry)
+    return entry
+
+
+def update_cash_balance(db: Session, amount: float, fund_id: int = models.DEFAULT_FUND_ID) -> models.FundCash:
+    """
+    Set the current cash balance through a balance-adjustment ledger entry.
+
+    The balance applies to the latest valuation: before today's NAV exists the
+    adjustment is dated at the latest NAV date, so that NAV is revalued and a
+    later rewrite of it reads the same balance.
+    """
+    cash = _current_cash_row(db, fund_id)
+    _ensure_cash_opening_entry(db, cash)
+    current = get_cash_balance_as_of(db, date.today(), fund_id)
+    summary = None
+    if amount != current:
+        latest_date = _latest_nav_date(db, fund_id)
+        on = min(latest_date, date.today()) if latest_date else date.today()
+        db.add(
+            models.CashTransaction(
+                fund_id=fund_id, date=on, amount=amount - current, note="balance adjustment"
+            )
+        )
+        db.flush()
+        summary = _revalue_history(db, on, fund_id, cash=amount - current)
     cash.amount = amount
     db.commit()
+    _publish_cash_change(fund_id, cash.amount, summary)
     db.refresh(cash)
-    _recalculate_nav_with_latest_holdings(db)
     return cash
 
 
-def _recalculate_nav_with_latest_holdings(db: Session) -> None:
-    latest_holdings = get_latest_holdings(db)
+def start_job_run(
+    db: Session,
+    job_id: str,
+    trigger: str = "schedule",
+    scheduled_for: Optional[date] = None,
+    fund_id: Optional[int] = None,
+) -> models.JobRun:
+    run = models.JobRun(
+        job_id=job_id,
+        fund_id=fund_id,
+        trigger=trigger,
+        scheduled_for=scheduled_for,
+        started_at=datetime.utcnow(),
+        status="running",
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def finish_job_run(
+    db: Session,
+    run: models.JobRun,
+    status: str,
+    message: Optional[str] = None,
+) -> models.JobRun:
+    run.finished_at = datetime.utcnow()
+    run.duration_ms = (run.finished_at - run.started_at).total_seconds() * 1000
+    run.status = status
+    run.message = message[:500] if message else None
+    db.commit()
+    return run
+
+
+def get_job_runs(
+    db: Session,
+    job_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 100,
+    fund_id: Optional[int] = None,
+) -> List[models.JobRun]:
+    stmt = select(models.JobRun).order_by(desc(models.JobRun.started_at)).limit(limit)
+    if job_id is not None:
+        stmt = stmt.where(models.JobRun.job_id == job_id)
+    if status is not None:
+        stmt = stmt.where(models.JobRun.status == status)
+    if fund_id is not None:
+        stmt = stmt.where(models.JobRun.fund_id == fund_id)
+    return list(db.execute(stmt).scalars())
+
+
+def get_missing_nav_dates(
+    db: Session, start: date, end: date, fund_id: int = models.DEFAULT_FUND_ID
+) -> List[date]:
+    """
+    Weekdays between ``start`` and ``end`` (inclusive) that have no NAV record.
+
+    Exchange holidays are not known here; a holiday simply finds no data
+    upstream and its catch-up run is recorded as skipped.
+    """
+    if start > end:
+        return []
+    stmt = select(models.FundHistory.date).where(
+        models.FundHistory.fund_id == fund_id,
+        models.FundHistory.date >= start,
+        models.FundHistory.date <= end,
+    )
+    recorded = set(db.execute(stmt).scalars())
+    days = (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+    return [day for day in days if day.weekday() < 5 and day not in recorded]
+
+
+def _recalculate_nav_with_latest_holdings(db: Session, fund_id: int = models.DEFAULT_FUND_ID) -> None:
+    latest_holdings = get_latest_holdings(db, fund_id)
     if not latest_holdings or not latest_holdings.holdings:
         return
     try:
@@ -378,6 +1903,7 @@ def _recalculate_nav_with_latest_holdings(db: Session) -> None:
             db,
             holdings_payload,
             holdings_date=latest_holdings.date,
+            fund_id=fund_id,
         )
     except ValueError as exc:
-        logger.warning("NAV recalculation skipped: %s", exc)
\ No newline at end of file
+        logger.warning("NAV recalculation skipped for fund %s: %s", fund_id, exc)
\ No newline at end of file
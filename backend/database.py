@@ -1,11 +1,17 @@
 import os
+import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import UniqueConstraint, create_engine, event, exc, insert, inspect, select, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateColumn
 
 
 load_dotenv()
@@ -14,16 +20,217 @@ DEFAULT_SQLITE_PATH = Path(__file__).resolve().parent.parent / "data" / "app.db"
 DEFAULT_SQLITE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DEFAULT_SQLITE_PATH}")
+# Optional read replica (or a second connection pool) for read-only sessions.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+# Async driver URL for the async read endpoints; derived from DATABASE_URL when unset.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or None
 
-engine_args: dict = {}
-if DATABASE_URL.startswith("sqlite"):
-    engine_args["connect_args"] = {"check_same_thread": False}
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
 
-engine = create_engine(DATABASE_URL, future=True, echo=False, **engine_args)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+
+# Create missing tables when the API starts; otherwise run ``python -m backend.cli init-db``.
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "false").lower() in ("1", "true", "yes")
+
+
+class PoolStats:
+    """Checkout counters for one engine's connection pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` that records how long callers wait for a connection."""
+
+    def __init__(self, *args, stats: Optional[PoolStats] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        # A negative cache_size is a size in KiB rather than a page count.
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    finally:
+        cursor.close()
+
+
+def create_configured_engine(url: str) -> Engine:
+    """
+    Create an engine with the pool settings and SQLite pragmas from the environment.
+
+    File-backed SQLite and server databases get a ``TimedQueuePool``; in-memory
+    SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    engine_args: dict = {}
+    database_url = make_url(url)
+    is_sqlite = database_url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and database_url.database in (None, "", ":memory:")
+
+    if is_sqlite:
+        engine_args["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    if not in_memory:
+        engine_args.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+        if not is_sqlite:
+            engine_args["pool_recycle"] = DB_POOL_RECYCLE
+
+    configured = create_engine(url, future=True, echo=False, **engine_args)
+    if is_sqlite:
+        event.listen(configured, "connect", _apply_sqlite_pragmas)
+    return configured
+
+
+def pool_status(target) -> dict:
+    """Current pool occupancy and checkout wait statistics for ``target``."""
+    if isinstance(target, AsyncEngine):
+        target = target.sync_engine
+    pool = target.pool
+    status: dict = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_seconds_total=round(stats.wait_seconds_total, 6),
+            wait_seconds_max=round(stats.wait_seconds_max, 6),
+        )
+    return status
+
+
+engine = create_configured_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+read_engine = create_configured_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+ReadSessionLocal = (
+    sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
+    if DATABASE_READ_URL
+    else SessionLocal
+)
+
 Base = declarative_base()
 
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+_async_lock = threading.Lock()
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync DBAPI driver in ``url`` for its asyncio counterpart."""
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for '{backend}'; set ASYNC_DATABASE_URL.")
+    return database_url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Async engine for the hot read endpoints, created on first use.
+
+    Creation is deferred so the CLI and scheduler never import the async driver
+    (aiosqlite/asyncpg). Pool settings and SQLite pragmas match the sync engine.
+    """
+    global _async_engine, _async_sessionmaker
+    with _async_lock:
+        if _async_engine is None:
+            url = ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+            database_url = make_url(url)
+            is_sqlite = database_url.get_backend_name() == "sqlite"
+            engine_args: dict = {}
+            if is_sqlite:
+                engine_args["connect_args"] = {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+            if not (is_sqlite and database_url.database in (None, "", ":memory:")):
+                engine_args.update(
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_timeout=DB_POOL_TIMEOUT,
+                    pool_pre_ping=DB_POOL_PRE_PING,
+                )
+                if not is_sqlite:
+                    engine_args["pool_recycle"] = DB_POOL_RECYCLE
+            _async_engine = create_async_engine(url, echo=False, **engine_args)
+            if is_sqlite:
+                event.listen(_async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+            _async_sessionmaker = async_sessionmaker(
+                _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        return _async_engine
+
+
+def current_async_engine() -> Optional[AsyncEngine]:
+    """The async engine if an async endpoint has created it, else ``None``."""
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_sessionmaker
+    with _async_lock:
+        engine_to_dispose, _async_engine, _async_sessionmaker = _async_engine, None, None
+    if engine_to_dispose is not None:
+        await engine_to_dispose.dispose()
+
 
 def get_db() -> Generator:
     db = SessionLocal()
@@ -33,6 +240,141 @@ def get_db() -> Generator:
         db.close()
 
 
+def get_read_db() -> Generator:
+    """Session for read-only endpoints; uses ``DATABASE_READ_URL`` when configured."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    ``AsyncSession`` dependency for read endpoints.
+
+    Sync ``crud`` readers run on it through ``AsyncSession.run_sync``, which
+    drives the same statements over the async driver without a threadpool thread.
+    """
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        yield db
+
+
+def _add_missing_columns(connection) -> None:
+    # Columns added to existing tables since they were created, e.g. ``fund_id``.
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(f"Cannot add {table.name}.{column.name}: NOT NULL without a server default.")
+            # Foreign keys are left out: SQLite cannot add them to an existing table.
+            column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+
+
+def _declared_unique_columns(table) -> set:
+    declared = {
+        frozenset(column.name for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    }
+    declared.update(frozenset(column.name for column in index.columns) for index in table.indexes if index.unique)
+    return declared
+
+
+def _rebuild_sqlite_table(connection, table) -> None:
+    # SQLite cannot drop an inline UNIQUE constraint; copy the rows into a fresh table.
+    legacy = f"_legacy_{table.name}"
+    for index in inspect(connection).get_indexes(table.name):
+        connection.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+    connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {legacy}"))
+    table.create(bind=connection)
+    copied = ", ".join(
+        column["name"]
+        for column in inspect(connection).get_columns(legacy)
+        if column["name"] in table.columns
+    )
+    connection.execute(text(f"INSERT INTO {table.name} ({copied}) SELECT {copied} FROM {legacy}"))
+    connection.execute(text(f"DROP TABLE {legacy}"))
+
+
+def _drop_stale_unique_constraints(connection) -> None:
+    """Drop uniqueness the models no longer declare, e.g. ``fund_analytics.date`` before funds."""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        declared = _declared_unique_columns(table)
+        for index in inspector.get_indexes(table.name):
+            if index.get("duplicates_constraint"):
+                continue
+            if index["unique"] and frozenset(index["column_names"]) not in declared:
+                connection.execute(text(f"DROP INDEX {index['name']}"))
+        stale = [
+            constraint
+            for constraint in inspector.get_unique_constraints(table.name)
+            if frozenset(constraint["column_names"]) not in declared
+        ]
+        if not stale:
+            continue
+        if connection.dialect.name == "sqlite":
+            _rebuild_sqlite_table(connection, table)
+        else:
+            for constraint in stale:
+                connection.execute(text(f"ALTER TABLE {table.name} DROP CONSTRAINT {constraint['name']}"))
+
+
+# Indexes replaced by their (fund_id, ...) counterparts; they only slow down writes.
+_SUPERSEDED_INDEXES = (
+    "ix_holdings_date",
+    "ix_holdings_symbol",
+    "ix_holdings_symbol_date",
+    "ix_fund_history_date",
+    "ix_cash_transactions_date",
+    "ix_intraday_nav_date_timestamp",
+)
+
+
+def _ensure_default_fund(connection) -> None:
+    from . import models
+
+    if connection.execute(select(models.Fund.id).where(models.Fund.id == models.DEFAULT_FUND_ID)).first():
+        return
+    connection.execute(
+        insert(models.Fund).values(id=models.DEFAULT_FUND_ID, code="default", name="Default Fund")
+    )
+    if connection.dialect.name == "postgresql":
+        # The explicit id does not advance the serial sequence.
+        connection.execute(text("SELECT setval(pg_get_serial_sequence('funds', 'id'), (SELECT MAX(id) FROM funds))"))
+
+
+def init_db(bind: Optional[Engine] = None) -> None:
+    """
+    Create missing tables and bring existing ones up to the models.
+
+    There is no migration framework, so the upgrades this schema has needed are
+    applied here: columns and indexes added since a table was created are
+    added, uniqueness and indexes the models dropped are removed, and the
+    default fund that pre-existing rows belong to is created.
+    """
+    from . import models  # noqa: F401 - registers every table on Base.metadata
+
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        _add_missing_columns(connection)
+        _drop_stale_unique_constraints(connection)
+        for name in _SUPERSEDED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        _ensure_default_fund(connection)
+    # create_all skips tables that already exist, so add indexes introduced later.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
 @contextmanager
 def session_scope() -> Generator:
     db = SessionLocal()
@@ -45,3 +387,22 @@ def session_scope() -> Generator:
     finally:
         db.close()
 
+
+@contextmanager
+def read_transaction(db: Session) -> Generator:
+    """
+    Run a group of reads inside one transaction so they observe one snapshot.
+
+    pysqlite does not open a transaction for SELECT statements on its own, so an
+    explicit BEGIN is issued; on other backends the transaction is marked
+    repeatable-read and read-only. The transaction is always rolled back.
+    """
+    db.rollback()
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("BEGIN"))
+    else:
+        db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+    try:
+        yield db
+    finally:
+        db.rollback()
@@ -1,14 +1,26 @@
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
-from .database import Base, engine, SessionLocal
-from .routers import fund, holdings, investors, upload, login
+from .database import (
+    DB_AUTO_CREATE,
+    SessionLocal,
+    current_async_engine,
+    dispose_async_engine,
+    engine,
+    init_db,
+    pool_status,
+    read_engine,
+)
+from .routers import dashboard, events, export, fund, funds, holdings, investors, jobs, upload, login
 from . import models, crud
-from .utils.scheduler import scheduler
+from .utils import metrics, sql_profiler
+from .utils.events import event_bus
+from .utils.executor import executor
+from .utils.scheduler import start_scheduler, stop_scheduler
 
 
 def create_app() -> FastAPI:
@@ -22,9 +34,9 @@ def create_app() -> FastAPI:
         contact={"name": "Turtle Fund Ops"},
     )
 
-    # Ensure database schema exists before the API starts serving requests.
-    Base.metadata.create_all(bind=engine)
-
+    app.add_middleware(sql_profiler.SQLProfilingMiddleware)
+    if metrics.METRICS_ENABLED:
+        app.add_middleware(metrics.MetricsMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -34,10 +46,15 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(fund.router, prefix="/api/fund", tags=["fund"])
+    app.include_router(funds.router, prefix="/api/funds", tags=["funds"])
     app.include_router(holdings.router, prefix="/api/holdings", tags=["holdings"])
     app.include_router(investors.router, prefix="/api/investors", tags=["investors"])
     app.include_router(upload.router, prefix="/api/upload", tags=["upload"])
     app.include_router(login.router, prefix="/api/auth", tags=["authentication"])
+    app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+    app.include_router(export.router, prefix="/api/export", tags=["export"])
+    app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+    app.include_router(events.router, prefix="/api/events", tags=["events"])
 
     @app.on_event("startup")
     async def startup_event() -> None:
@@ -45,6 +62,11 @@ def create_app() -> FastAPI:
         uploads_dir = Path(__file__).resolve().parent.parent / "uploads"
         uploads_dir.mkdir(parents=True, exist_ok=True)
 
+        # The schema is created by `python -m backend.cli init-db`, once per deployment
+        # rather than by every worker; DB_AUTO_CREATE restores the old behaviour.
+        if DB_AUTO_CREATE:
+            init_db()
+
         # Create default admin investor if not exists
         db: Session = SessionLocal()
         try:
@@ -68,17 +90,19 @@ def create_app() -> FastAPI:
                 print("Default admin investor created with username: admin and password: admin123")
         except Exception as e:
             db.rollback()
-            print(f"Error creating default admin investor: {e}")
+            print(f"Error creating default admin investor: {e} (has `python -m backend.cli init-db` been run?)")
         finally:
             db.close()
 
-        if not scheduler.running:
-            scheduler.start()
+        event_bus.start()
+        start_scheduler()
 
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
-        if scheduler.running:
-            scheduler.shutdown(wait=False)
+        stop_scheduler()
+        executor.shutdown()
+        await event_bus.stop()
+        await dispose_async_engine()
 
     @app.get("/health")
     async def healthcheck() -> dict[str, str]:
@@ -87,6 +111,29 @@ def create_app() -> FastAPI:
         """
         return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
 
+    @app.get("/health/db")
+    def database_pool_status() -> dict:
+        """
+        Connection pool occupancy and checkout wait statistics.
+        """
+        status = {"primary": pool_status(engine)}
+        if read_engine is not engine:
+            status["read"] = pool_status(read_engine)
+        async_engine = current_async_engine()
+        if async_engine is not None:
+            status["async"] = pool_status(async_engine)
+        return status
+
+    if metrics.METRICS_ENABLED:
+
+        @app.get("/metrics", include_in_schema=False)
+        def prometheus_metrics() -> Response:
+            """
+            Prometheus text exposition of request, job, OCR, Tushare and cache metrics.
+            """
+            body, content_type = metrics.render()
+            return Response(content=body, media_type=content_type)
+
     return app
 
 
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Boolean
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Boolean, Text, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 
 from .database import Base
 
+# The fund rows written before the fund dimension existed belong to, and
+# single-fund deployments keep using, this fund.
+DEFAULT_FUND_ID = 1
+
 
 class TimestampMixin:
     created_at = Column(
@@ -22,11 +26,37 @@ class TimestampMixin:
     )
 
 
+def _fund_column() -> Column:
+    return Column(
+        Integer,
+        ForeignKey("funds.id"),
+        nullable=False,
+        default=DEFAULT_FUND_ID,
+        server_default=text(str(DEFAULT_FUND_ID)),
+    )
+
+
+class Fund(Base, TimestampMixin):
+    """One portfolio. Holdings, NAV, cash and investors are partitioned by fund."""
+
+    __tablename__ = "funds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String(32), nullable=False, unique=True)
+    name = Column(String(128), nullable=False)
+    # Broker account Tushare pulls holdings from; None uses the token's default account.
+    account_code = Column(String(32), nullable=True)
+
+
 class Investor(Base, TimestampMixin):
     __tablename__ = "investors"
+    __table_args__ = (Index("ix_investors_fund_id", "fund_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
     name = Column(String(128), nullable=False)
+    # Logins are global on purpose: an identifier resolves to exactly one
+    # investor, whose fund then scopes everything they can read.
     identifier = Column(String(64), nullable=True, unique=True)
     initial_investment = Column(Float, nullable=False, default=0.0)
     shares = Column(Float, nullable=False, default=0.0)
@@ -36,42 +66,160 @@ class Investor(Base, TimestampMixin):
 
     histories = relationship("FundHistory", back_populates="created_by", viewonly=True)
     tokens = relationship("InvestorToken", back_populates="investor")
+    share_transactions = relationship("ShareTransaction", back_populates="investor")
+
+
+class ShareTransaction(Base, TimestampMixin):
+    __tablename__ = "share_transactions"
+    __table_args__ = (
+        Index("ix_share_transactions_investor_date", "investor_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    investor_id = Column(Integer, ForeignKey("investors.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False, index=True, default=date.today)
+    shares = Column(Float, nullable=False)  # positive for subscriptions, negative for redemptions
+    amount = Column(Float, nullable=False, default=0.0)  # cash paid in (+) or out (-)
+    note = Column(String(255), nullable=True)
+
+    investor = relationship("Investor", back_populates="share_transactions")
+
+
+class InvestorValueHistory(Base, TimestampMixin):
+    __tablename__ = "investor_value_history"
+    __table_args__ = (
+        UniqueConstraint("investor_id", "date", name="uq_investor_value_history_investor_date"),
+        Index("ix_investor_value_history_date", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    investor_id = Column(Integer, ForeignKey("investors.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    shares = Column(Float, nullable=False)
+    invested = Column(Float, nullable=False)
+    value = Column(Float, nullable=False)
+    pnl = Column(Float, nullable=False)
 
 
 class Holding(Base, TimestampMixin):
     __tablename__ = "holdings"
+    __table_args__ = (
+        Index("ix_holdings_fund_date", "fund_id", "date"),
+        Index("ix_holdings_fund_symbol_date", "fund_id", "symbol", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
     name = Column(String(128), nullable=False)
-    symbol = Column(String(32), nullable=True, index=True)
+    symbol = Column(String(32), nullable=True)
     quantity = Column(Float, nullable=True)
     cost_price = Column(Float, nullable=True)
     market_value = Column(Float, nullable=False, default=0.0)
     weight = Column(Float, nullable=True)
-    date = Column(Date, nullable=False, index=True, default=date.today)
+    date = Column(Date, nullable=False, default=date.today)
+
+
+class HoldingsArchive(Base, TimestampMixin):
+    __tablename__ = "holdings_archive"
+    __table_args__ = (
+        Index("ix_holdings_archive_fund_month", "fund_id", "month", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
+    month = Column(Date, nullable=False)  # first day of the month
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary, nullable=False)  # see utils.archive.encode_rows
 
 
 class FundHistory(Base, TimestampMixin):
     __tablename__ = "fund_history"
+    __table_args__ = (Index("ix_fund_history_fund_date", "fund_id", "date"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, nullable=False, default=date.today, index=True)
+    fund_id = _fund_column()
+    date = Column(Date, nullable=False, default=date.today)
     nav = Column(Float, nullable=False)
     total_value = Column(Float, nullable=False)
     change_pct = Column(Float, nullable=True)
     change_value = Column(Float, nullable=True)
+    # Content hash of the holdings, cash and total shares the NAV was computed from.
+    snapshot_hash = Column(String(64), nullable=True)
     created_by_id = Column(Integer, ForeignKey("investors.id"), nullable=True)
 
     created_by = relationship("Investor", back_populates="histories")
 
 
+class IntradayNav(Base):
+    """Compacted intraday NAV estimates, one row per closed bucket."""
+
+    __tablename__ = "intraday_nav"
+    __table_args__ = (
+        Index("ix_intraday_nav_fund_timestamp", "fund_id", "timestamp", unique=True),
+        Index("ix_intraday_nav_fund_date_timestamp", "fund_id", "date", "timestamp"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
+    date = Column(Date, nullable=False)
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    nav = Column(Float, nullable=False)
+    total_value = Column(Float, nullable=False)
+    holdings_value = Column(Float, nullable=False)
+
+
+class FundAnalytics(Base, TimestampMixin):
+    __tablename__ = "fund_analytics"
+    __table_args__ = (
+        Index("ix_fund_analytics_fund_date", "fund_id", "date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
+    date = Column(Date, nullable=False)
+    nav = Column(Float, nullable=False)
+    daily_return = Column(Float, nullable=True)
+    cumulative_return = Column(Float, nullable=True)
+    annualized_return = Column(Float, nullable=True)
+    drawdown = Column(Float, nullable=True)
+    max_drawdown = Column(Float, nullable=True)
+    volatility = Column(Float, nullable=True)
+    rolling_volatility = Column(Float, nullable=True)
+    sharpe_ratio = Column(Float, nullable=True)
+
+    # Running statistics needed to derive the next day's row in O(1).
+    base_nav = Column(Float, nullable=False)
+    peak_nav = Column(Float, nullable=False)
+    return_count = Column(Integer, nullable=False, default=0)
+    return_mean = Column(Float, nullable=False, default=0.0)
+    return_m2 = Column(Float, nullable=False, default=0.0)
+    rolling_count = Column(Integer, nullable=False, default=0)
+    rolling_sum = Column(Float, nullable=False, default=0.0)
+    rolling_sum_sq = Column(Float, nullable=False, default=0.0)
+
+
 class FundCash(Base, TimestampMixin):
     __tablename__ = "fund_cash"
+    __table_args__ = (Index("ix_fund_cash_fund_id", "fund_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
     amount = Column(Float, nullable=False, default=0.0)
 
 
+class CashTransaction(Base, TimestampMixin):
+    __tablename__ = "cash_transactions"
+    __table_args__ = (Index("ix_cash_transactions_fund_date", "fund_id", "date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    fund_id = _fund_column()
+    date = Column(Date, nullable=False, default=date.today)
+    amount = Column(Float, nullable=False)  # deposit (+) or withdrawal (-)
+    note = Column(String(255), nullable=True)
+
+
 class InvestorToken(Base, TimestampMixin):
     __tablename__ = "investor_tokens"
     
@@ -83,4 +231,46 @@ class InvestorToken(Base, TimestampMixin):
     user_agent = Column(String(255), nullable=True)
     ip_address = Column(String(45), nullable=True)
     
-    investor = relationship("Investor", back_populates="tokens")
\ No newline at end of file
+    investor = relationship("Investor", back_populates="tokens")
+
+
+class JobRun(Base):
+    """One execution of a scheduled job, including catch-up runs for missed days."""
+
+    __tablename__ = "job_runs"
+    __table_args__ = (Index("ix_job_runs_job_id_started_at", "job_id", "started_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(64), nullable=False)
+    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=True)  # None for jobs spanning all funds
+    trigger = Column(String(16), nullable=False, default="schedule")  # schedule / catchup / manual
+    scheduled_for = Column(Date, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    status = Column(String(16), nullable=False, default="running")  # running / success / skipped / failed
+    message = Column(String(500), nullable=True)
+
+
+class FundEvent(Base):
+    """Change notifications relayed between API workers (see ``utils.events``)."""
+
+    __tablename__ = "fund_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    origin = Column(String(32), nullable=False)
+    type = Column(String(64), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
+
+
+class SchedulerLease(Base):
+    """Leader lease row used to elect the one process that runs scheduled jobs."""
+
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(64), primary_key=True)
+    owner = Column(String(128), nullable=False)
+    acquired_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from .dependencies import get_current_investor, get_fund_id
+from .. import crud, schemas, models
+from ..database import get_db
+from ..utils.cache import VersionedCache
+from ..utils.responses import FastJSONResponse
+
+
+router = APIRouter()
+
+_dashboard_cache = VersionedCache(maxsize=256, name="dashboard")
+
+
+@router.get("", response_model=schemas.DashboardResponse)
+def read_dashboard(
+    history_limit: int = Query(90, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> FastJSONResponse:
+    """
+    NAV summary, history, latest holdings, cash and investor data in one response.
+    """
+    content = _dashboard_cache.get_or_compute(
+        (current_investor.id, fund_id, history_limit),
+        lambda: crud.get_dashboard_rows(db, current_investor, history_limit, fund_id),
+        fund_id=fund_id,
+    )
+    return FastJSONResponse(content)
@@ -1,9 +1,10 @@
-from fastapi import Header, HTTPException, Depends
+from fastapi import Header, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from .. import crud, models
-from ..database import get_db
+from ..database import get_async_db, get_db
 
 
 def get_current_investor(token: str = Header(alias="user-token", default=None), db: Session = Depends(get_db)) -> models.Investor:
@@ -28,4 +29,86 @@ def get_current_admin_investor(token: str = Header(alias="user-token", default=N
     if not investor.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
         
-    return investor
\ No newline at end of file
+    return investor
+
+
+def _investor_for_token(db: Session, token: str) -> Optional[models.Investor]:
+    investor_token = crud.get_investor_token(db, token)
+    return investor_token.investor if investor_token else None
+
+
+async def get_current_investor_async(
+    token: str = Header(alias="user-token", default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.Investor:
+    """
+    从header中获取当前用户（异步会话版本，供异步读接口使用）
+    """
+    if not token:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    investor = await db.run_sync(_investor_for_token, token)
+    if investor is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    return investor
+
+
+FUND_QUERY = Query(None, ge=1, description="Fund to act on; defaults to the investor's own fund.")
+
+
+def _check_fund_access(investor: models.Investor, fund_id: Optional[int]) -> int:
+    # Investors only see their own fund; administrators may pick any fund.
+    if fund_id is None or fund_id == investor.fund_id:
+        return investor.fund_id
+    if not investor.is_admin:
+        raise HTTPException(status_code=403, detail="No access to this fund")
+    return fund_id
+
+
+def _require_fund(db: Session, fund_id: int) -> int:
+    if crud.get_fund(db, fund_id) is None:
+        raise HTTPException(status_code=404, detail="Fund not found.")
+    return fund_id
+
+
+def get_fund_id(
+    fund_id: Optional[int] = FUND_QUERY,
+    current_investor: models.Investor = Depends(get_current_investor),
+    db: Session = Depends(get_db),
+) -> int:
+    """
+    从查询参数 fund_id 解析当前请求的基金，默认为当前用户所属基金
+    """
+    resolved = _check_fund_access(current_investor, fund_id)
+    if resolved != current_investor.fund_id:
+        _require_fund(db, resolved)
+    return resolved
+
+
+def get_admin_fund_id(
+    fund_id: Optional[int] = FUND_QUERY,
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    db: Session = Depends(get_db),
+) -> int:
+    """
+    管理员接口的基金解析（要求管理员权限）
+    """
+    resolved = _check_fund_access(current_investor, fund_id)
+    if resolved != current_investor.fund_id:
+        _require_fund(db, resolved)
+    return resolved
+
+
+async def get_fund_id_async(
+    fund_id: Optional[int] = FUND_QUERY,
+    current_investor: models.Investor = Depends(get_current_investor_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
+    """
+    基金解析（异步会话版本）
+    """
+    resolved = _check_fund_access(current_investor, fund_id)
+    if resolved != current_investor.fund_id:
+        await db.run_sync(_require_fund, resolved)
+    return resolved
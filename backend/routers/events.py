@@ -0,0 +1,88 @@
+import json
+import os
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .dependencies import _investor_for_token
+from ..database import get_async_db
+from ..utils.events import Subscription, event_bus
+
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+def _format_event(event: dict) -> str:
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    payload = {"data": event["data"], "at": event["at"]}
+    lines.append(f"data: {json.dumps(payload, default=str, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _visible_to(event: dict, investor_id: int, fund_id: int, is_admin: bool) -> bool:
+    if is_admin:
+        return True
+    # Investors only hear about their own fund.
+    if event["data"].get("fund_id", fund_id) != fund_id:
+        return False
+    # Investor changes carry another person's id; only admins and that investor see them.
+    if event["type"] == "investors.changed":
+        return event["data"].get("investor_id") == investor_id
+    return True
+
+
+async def _event_stream(
+    request: Request,
+    subscription: Subscription,
+    investor_id: int,
+    fund_id: int,
+    is_admin: bool,
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {int(HEARTBEAT_SECONDS * 1000)}\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+            if event is None:
+                # Comment line keeps proxies from closing an idle connection.
+                yield ": ping\n\n"
+                continue
+            if _visible_to(event, investor_id, fund_id, is_admin):
+                yield _format_event(event)
+    finally:
+        subscription.close()
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="EventSource cannot send headers, so the token may be passed here"),
+    header_token: Optional[str] = Header(None, alias="user-token"),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    """
+    Server-sent events for NAV, cash, investor and intraday changes.
+
+    Event types: ``nav.updated``, ``cash.updated``, ``investors.changed`` and
+    ``intraday.estimate``; each carries the ``fund_id`` it concerns. Clients
+    reload the affected views when one arrives instead of polling.
+    """
+    token = header_token or token
+    if not token:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    investor = await db.run_sync(_investor_for_token, token)
+    if investor is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    subscription = event_bus.subscribe()
+    return StreamingResponse(
+        _event_stream(request, subscription, investor.id, investor.fund_id, investor.is_admin),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,127 @@
+from datetime import date
+from typing import Callable, Iterator, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from .dependencies import get_admin_fund_id, get_current_admin_investor
+from .fund import _validate_range
+from .. import crud, models
+from ..database import ReadSessionLocal
+from ..utils.export import CSV_MEDIA_TYPE, PARQUET_MEDIA_TYPE, csv_stream, parquet_stream
+
+
+router = APIRouter()
+
+ExportFormat = Literal["csv", "parquet"]
+
+
+def _export_chunks(
+    iterate: Callable[..., Iterator[List[tuple]]],
+    start: Optional[date],
+    end: Optional[date],
+    fund_id: int,
+) -> Iterator[List[tuple]]:
+    # The request-scoped session is closed before the body is streamed, so the
+    # generator owns its own session for the lifetime of the response.
+    db = ReadSessionLocal()
+    try:
+        yield from iterate(db, start=start, end=end, fund_id=fund_id)
+    finally:
+        db.close()
+
+
+def _export_response(
+    name: str,
+    columns: list,
+    iterate: Callable[..., Iterator[List[tuple]]],
+    start: Optional[date],
+    end: Optional[date],
+    export_format: ExportFormat,
+    fund_id: int,
+) -> StreamingResponse:
+    _validate_range(start, end)
+    chunks = _export_chunks(iterate, start, end, fund_id)
+    if export_format == "parquet":
+        try:
+            body = parquet_stream(columns, chunks)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=501, detail=str(exc)) from exc
+        media_type = PARQUET_MEDIA_TYPE
+    else:
+        body = csv_stream(columns, chunks)
+        media_type = CSV_MEDIA_TYPE
+
+    suffix = "_".join(part.isoformat() for part in (start, end) if part)
+    filename = f"{name}_{suffix}" if suffix else name
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
+@router.get("/fund-history")
+def export_fund_history(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    export_format: ExportFormat = Query("csv", alias="format"),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> StreamingResponse:
+    """
+    Download NAV history between two dates as CSV or Parquet.
+    """
+    return _export_response(
+        "fund_history",
+        crud.FUND_HISTORY_EXPORT_COLUMNS,
+        crud.iter_fund_history_export,
+        start,
+        end,
+        export_format,
+        fund_id,
+    )
+
+
+@router.get("/holdings")
+def export_holdings(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    export_format: ExportFormat = Query("csv", alias="format"),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> StreamingResponse:
+    """
+    Download every holdings snapshot between two dates, archived months included.
+    """
+    return _export_response(
+        "holdings",
+        crud.HOLDINGS_EXPORT_COLUMNS,
+        crud.iter_holdings_export,
+        start,
+        end,
+        export_format,
+        fund_id,
+    )
+
+
+@router.get("/investor-values")
+def export_investor_values(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    export_format: ExportFormat = Query("csv", alias="format"),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> StreamingResponse:
+    """
+    Download the daily value series of all investors between two dates.
+    """
+    return _export_response(
+        "investor_values",
+        crud.INVESTOR_VALUES_EXPORT_COLUMNS,
+        crud.iter_investor_values_export,
+        start,
+        end,
+        export_format,
+        fund_id,
+    )
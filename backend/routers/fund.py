@@ -1,44 +1,206 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import Iterator, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .dependencies import get_current_admin_investor, get_current_investor
+from .dependencies import (
+    get_admin_fund_id,
+    get_current_admin_investor,
+    get_current_investor,
+    get_current_investor_async,
+    get_fund_id,
+    get_fund_id_async,
+)
 from .. import crud, schemas, models
-from ..database import get_db
+from ..database import ReadSessionLocal, get_async_db, get_db, get_read_db
+from ..utils import intraday, tasks
+from ..utils.cache import VersionedCache, bump_data_version
+from ..utils.executor import JobFailed, JobTimeout, executor, fund_kind
+from ..utils.responses import FastJSONResponse, dumps
 
 
 router = APIRouter()
 
+_downsample_cache = VersionedCache(maxsize=64, name="downsample")
 
-@router.get("/nav", response_model=Optional[schemas.FundSummary])
-def get_latest_nav(
-    db: Session = Depends(get_db),
-    current_investor: models.Investor = Depends(get_current_investor),
-) -> Optional[schemas.FundSummary]:
-    latest_history = crud.get_latest_fund_history(db)
+
+def _latest_nav_summary(db: Session, fund_id: int) -> Optional[schemas.FundSummary]:
+    latest_history = crud.get_latest_fund_history(db, fund_id)
     if not latest_history:
         return None
-    cash_balance = crud.get_cash_balance(db)
     return schemas.FundSummary(
         date=latest_history.date,
         nav=latest_history.nav,
         total_value=latest_history.total_value,
-        cash=cash_balance.amount,
+        cash=crud.get_cash_balance_as_of(db, latest_history.date, fund_id),
         change_value=latest_history.change_value,
         change_pct=latest_history.change_pct,
     )
 
 
+@router.get("/nav", response_model=Optional[schemas.FundSummary])
+async def get_latest_nav(
+    db: AsyncSession = Depends(get_async_db),
+    current_investor: models.Investor = Depends(get_current_investor_async),
+    fund_id: int = Depends(get_fund_id_async),
+) -> Optional[schemas.FundSummary]:
+    return await db.run_sync(_latest_nav_summary, fund_id)
+
+
 @router.get("/history", response_model=list[schemas.FundHistoryRead])
-def get_history(
+async def get_history(
     limit: int = Query(60, ge=1, le=365),
+    db: AsyncSession = Depends(get_async_db),
+    current_investor: models.Investor = Depends(get_current_investor_async),
+    fund_id: int = Depends(get_fund_id_async),
+) -> FastJSONResponse:
+    return FastJSONResponse(
+        await db.run_sync(crud.get_fund_history_rows, limit=limit, fund_id=fund_id)
+    )
+
+
+def _validate_range(start: Optional[date], end: Optional[date]) -> None:
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be later than 'to'.")
+
+
+@router.get("/history/range", response_model=schemas.FundHistoryPage)
+def get_history_range(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    cursor: Optional[date] = Query(None, description="next_cursor from the previous page."),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> FastJSONResponse:
+    """
+    Page through history between two dates in ascending order.
+    """
+    _validate_range(start, end)
+    records, next_cursor = crud.get_fund_history_page(
+        db, start=start, end=end, after=cursor, limit=limit, fund_id=fund_id
+    )
+    return FastJSONResponse({"items": records, "next_cursor": next_cursor})
+
+
+def _stream_history_lines(
+    start: Optional[date], end: Optional[date], fund_id: int
+) -> Iterator[bytes]:
+    # The request-scoped session is closed before the body is streamed, so the
+    # generator owns its own session for the lifetime of the response.
+    db = ReadSessionLocal()
+    try:
+        for record in crud.iter_fund_history(db, start=start, end=end, fund_id=fund_id):
+            yield dumps(record) + b"\n"
+    finally:
+        db.close()
+
+
+@router.get("/history/stream")
+def stream_history(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> StreamingResponse:
+    """
+    Stream history between two dates as newline-delimited JSON.
+    """
+    _validate_range(start, end)
+    return StreamingResponse(
+        _stream_history_lines(start, end, fund_id),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/intraday", response_model=schemas.IntradayNavSeries)
+def get_intraday_nav(
+    on_date: Optional[date] = Query(None, alias="date"),
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_investor),
-) -> list[schemas.FundHistoryRead]:
-    history = crud.get_fund_history(db, limit=limit)
-    return [schemas.FundHistoryRead.from_orm(record) for record in history]
+    fund_id: int = Depends(get_fund_id),
+) -> schemas.IntradayNavSeries:
+    """
+    Estimated NAV points for one trading day (today by default).
+
+    Compacted points come from the database; this worker's ring buffer for the
+    fund adds the points recorded since the last compaction.
+    """
+    on_date = on_date or datetime.now(intraday.TIMEZONE).date()
+    points = crud.get_intraday_points(db, on_date, fund_id)
+    last_saved = points[-1]["timestamp"].replace(tzinfo=timezone.utc).timestamp() if points else None
+    for timestamp, nav, total_value, holdings_value in intraday.buffer_for(fund_id).points():
+        if intraday.trading_date(timestamp) != on_date:
+            continue
+        if last_saved is not None and timestamp <= last_saved:
+            continue
+        points.append(
+            {
+                "timestamp": datetime.utcfromtimestamp(timestamp),
+                "nav": float(nav),
+                "total_value": float(total_value),
+                "holdings_value": float(holdings_value),
+            }
+        )
+    return schemas.IntradayNavSeries(
+        date=on_date,
+        base_nav=crud.get_base_nav(db, on_date, fund_id),
+        points=points,
+    )
+
+
+def _downsample_history(
+    db: Session,
+    start: Optional[date],
+    end: Optional[date],
+    points: int,
+    fund_id: int,
+) -> schemas.FundHistoryDownsample:
+    import numpy as np
+
+    from ..utils.downsample import lttb_indices
+
+    series = crud.get_fund_history_series(db, start=start, end=end, fund_id=fund_id)
+    dates = [row[0] for row in series]
+    x = np.fromiter((d.toordinal() for d in dates), dtype=np.float64, count=len(dates))
+    values = np.array([row[1:] for row in series], dtype=np.float64).reshape(-1, 2)
+
+    def pick(column: int) -> list[schemas.SeriesPoint]:
+        y = values[:, column]
+        return [
+            schemas.SeriesPoint(date=dates[i], value=float(y[i]))
+            for i in lttb_indices(x, y, points)
+        ]
+
+    return schemas.FundHistoryDownsample(
+        source_points=len(series),
+        nav=pick(0),
+        total_value=pick(1),
+    )
+
+
+@router.get("/history/downsample", response_model=schemas.FundHistoryDownsample)
+def get_history_downsample(
+    points: int = Query(300, ge=3, le=5000, description="Target number of points per series."),
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> schemas.FundHistoryDownsample:
+    """
+    Return NAV and total value reduced to at most ``points`` points each (LTTB).
+    """
+    _validate_range(start, end)
+    return _downsample_cache.get_or_compute(
+        (fund_id, start, end, points),
+        lambda: _downsample_history(db, start, end, points, fund_id),
+        fund_id=fund_id,
+    )
 
 
 @router.post("/recalculate", response_model=schemas.FundSummary)
@@ -46,9 +208,10 @@ def recalculate_nav(
     holdings_date: Optional[date] = None,
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.FundSummary:
     target_date = holdings_date or date.today()
-    holdings = crud.get_holdings_by_date(db, target_date)
+    holdings = crud.get_holdings_by_date(db, target_date, fund_id)
     if not holdings:
         raise HTTPException(status_code=404, detail="No holdings available for the requested date.")
 
@@ -64,20 +227,84 @@ def recalculate_nav(
         )
         for h in holdings
     ]
-    return crud.update_holdings_and_nav(db, payload, holdings_date=target_date)
+    return crud.update_holdings_and_nav(db, payload, holdings_date=target_date, fund_id=fund_id)
+
+
+@router.get("/analytics", response_model=Optional[schemas.FundAnalyticsRead])
+def read_fund_analytics(
+    as_of: Optional[date] = Query(None, description="Return the metrics as of this date."),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> Optional[schemas.FundAnalyticsRead]:
+    """
+    Precomputed performance metrics maintained on every NAV write.
+    """
+    record = crud.get_fund_analytics(db, as_of=as_of, fund_id=fund_id)
+    if not record:
+        return None
+    return schemas.FundAnalyticsRead.from_orm(record)
+
+
+@router.post("/analytics/rebuild")
+def rebuild_fund_analytics(
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> dict[str, int]:
+    """
+    Recompute all analytics rows from fund history, e.g. after manual corrections.
+    """
+    try:
+        rows = executor.run(
+            fund_kind("backfill", fund_id), tasks.rebuild_fund_analytics, fund_id=fund_id
+        )
+    except (JobFailed, JobTimeout) as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    finally:
+        bump_data_version(fund_id)
+    return {"rows": rows}
 
 
 @router.get("/cash", response_model=schemas.CashBalance)
 def read_cash_balance(
     db: Session = Depends(get_db),
-    current_investor: models.Investor = Depends(get_current_investor)
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
 ) -> schemas.CashBalance:
-    cash = crud.get_cash_balance(db)
-    return schemas.CashBalance(
-        amount=cash.amount,
-        created_at=cash.created_at,
-        updated_at=cash.updated_at,
-    )
+    return crud.get_cash_balance(db, fund_id)
+
+
+@router.get("/cash/transactions", response_model=list[schemas.CashTransactionRead])
+def list_cash_transactions(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> list[schemas.CashTransactionRead]:
+    _validate_range(start, end)
+    return [
+        schemas.CashTransactionRead.from_orm(entry)
+        for entry in crud.get_cash_transactions(db, start=start, end=end, fund_id=fund_id)
+    ]
+
+
+@router.post(
+    "/cash/transactions",
+    response_model=schemas.CashTransactionRead,
+    status_code=201,
+)
+def create_cash_transaction(
+    payload: schemas.CashTransactionCreate,
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> schemas.CashTransactionRead:
+    """
+    Record a dated deposit (positive) or withdrawal (negative).
+    """
+    entry = crud.add_cash_transaction(db, payload, fund_id)
+    return schemas.CashTransactionRead.from_orm(entry)
 
 
 @router.put("/cash", response_model=schemas.CashBalance)
@@ -85,8 +312,9 @@ def update_cash_balance(
     payload: schemas.CashUpdate,
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.CashBalance:
-    cash = crud.update_cash_balance(db, payload.amount)
+    cash = crud.update_cash_balance(db, payload.amount, fund_id)
     return schemas.CashBalance(
         amount=cash.amount,
         created_at=cash.created_at,
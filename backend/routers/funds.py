@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from .dependencies import get_current_admin_investor, get_current_investor
+from .. import crud, schemas, models
+from ..database import get_db
+
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[schemas.FundRead])
+def list_funds(
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+) -> list[schemas.FundRead]:
+    """
+    Funds served by this deployment; investors only see their own.
+    """
+    if current_investor.is_admin:
+        funds = crud.get_funds(db)
+    else:
+        funds = [crud.get_fund(db, current_investor.fund_id)]
+    return [schemas.FundRead.from_orm(fund) for fund in funds if fund is not None]
+
+
+@router.post("", response_model=schemas.FundRead, status_code=status.HTTP_201_CREATED)
+def create_fund(
+    payload: schemas.FundCreate,
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+) -> schemas.FundRead:
+    """
+    Add a portfolio. Pass its id as ``fund_id`` to the other endpoints to act on it.
+    """
+    try:
+        fund = crud.create_fund(db, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return schemas.FundRead.from_orm(fund)
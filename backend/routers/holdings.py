@@ -2,25 +2,35 @@ from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .dependencies import get_current_admin_investor, get_current_investor
+from .dependencies import (
+    get_admin_fund_id,
+    get_current_admin_investor,
+    get_current_investor,
+    get_current_investor_async,
+    get_fund_id,
+    get_fund_id_async,
+)
 from .. import crud, schemas, models
-from ..database import get_db
+from ..database import get_async_db, get_db, get_read_db
+from ..utils.responses import FastJSONResponse
 
 
 router = APIRouter()
 
 
 @router.get("/today", response_model=Optional[schemas.HoldingsResponse])
-def read_latest_holdings(
-    db: Session = Depends(get_db),
-    current_investor: models.Investor = Depends(get_current_investor),
-) -> Optional[schemas.HoldingsResponse]:
+async def read_latest_holdings(
+    db: AsyncSession = Depends(get_async_db),
+    current_investor: models.Investor = Depends(get_current_investor_async),
+    fund_id: int = Depends(get_fund_id_async),
+) -> FastJSONResponse:
     """
     Fetch the most recent holdings snapshot.
     """
-    return crud.get_latest_holdings(db)
+    return FastJSONResponse(await db.run_sync(crud.get_latest_holdings_rows, fund_id))
 
 
 @router.get("/by-date/{target_date}", response_model=list[schemas.HoldingRead])
@@ -28,14 +38,50 @@ def read_holdings_by_date(
     target_date: date,
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_investor),
-) -> list[schemas.HoldingRead]:
+    fund_id: int = Depends(get_fund_id),
+) -> FastJSONResponse:
     """
     Fetch holdings for a specific trading date.
     """
-    records = crud.get_holdings_by_date(db, target_date)
+    records = crud.get_holdings_rows_by_date(db, target_date, fund_id)
     if not records:
         raise HTTPException(status_code=404, detail="Holdings not found for provided date.")
-    return [schemas.HoldingRead.from_orm(record) for record in records]
+    return FastJSONResponse(records)
+
+
+@router.get("/symbol/{symbol}/history", response_model=list[schemas.HoldingSnapshotPoint])
+def read_symbol_history(
+    symbol: str,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_read_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> FastJSONResponse:
+    """
+    Fetch the daily snapshots of a single position.
+    """
+    return FastJSONResponse(
+        crud.get_symbol_history(db, symbol, start=start, end=end, fund_id=fund_id)
+    )
+
+
+@router.get("/diff", response_model=schemas.HoldingsDiff)
+def read_holdings_diff(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    include_unchanged: bool = Query(False),
+    db: Session = Depends(get_read_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+    fund_id: int = Depends(get_fund_id),
+) -> FastJSONResponse:
+    """
+    Compare two holdings snapshots: added, removed and changed positions.
+    """
+    items = crud.diff_holdings(
+        db, from_date, to_date, include_unchanged=include_unchanged, fund_id=fund_id
+    )
+    return FastJSONResponse({"from_date": from_date, "to_date": to_date, "items": items})
 
 
 @router.post("/manual", response_model=schemas.FundSummary)
@@ -44,17 +90,20 @@ def upsert_holdings(
     overwrite: bool = Query(True, description="Replace existing holdings for the given date."),
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.FundSummary:
     """
     Allow manual upload of holdings data (e.g., CSV import or admin edits).
     """
-    if not overwrite and crud.get_holdings_by_date(db, payload.date):
+    if not overwrite and crud.get_holdings_by_date(db, payload.date, fund_id):
         raise HTTPException(
             status_code=400,
             detail="Holdings already exist for this date. Set overwrite=true to replace them.",
         )
     try:
-        return crud.update_holdings_and_nav(db, payload.holdings, holdings_date=payload.date)
+        return crud.update_holdings_and_nav(
+            db, payload.holdings, holdings_date=payload.date, fund_id=fund_id
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -1,41 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, models
 from ..database import get_db
-from .dependencies import get_current_investor, get_current_admin_investor
+from ..utils.responses import FastJSONResponse, as_row
+from .dependencies import (
+    get_admin_fund_id,
+    get_current_admin_investor,
+    get_current_investor,
+    get_current_investor_async,
+)
 
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=schemas.InvestorRead)
-def get_current_investor_info(
-    current_investor: models.Investor = Depends(get_current_investor)
-) -> schemas.InvestorRead:
+async def get_current_investor_info(
+    current_investor: models.Investor = Depends(get_current_investor_async)
+) -> FastJSONResponse:
     """
     获取当前登录投资者的信息
     """
-    return schemas.InvestorRead.from_orm(current_investor)
+    return FastJSONResponse(as_row(schemas.InvestorRead, current_investor))
+
+
+@router.get("/me/history", response_model=list[schemas.InvestorValuePoint])
+def get_current_investor_history(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_investor),
+) -> FastJSONResponse:
+    """
+    当前投资者的每日份额、市值与盈亏序列
+    """
+    return FastJSONResponse(
+        crud.get_investor_value_history(db, current_investor.id, start=start, end=end)
+    )
 
 
 @router.get("/", response_model=list[schemas.InvestorRead])
 def list_investors(
     db: Session = Depends(get_db),
-    current_investor: models.Investor = Depends(get_current_admin_investor)
-) -> list[schemas.InvestorRead]:
-    investors = crud.get_investors(db)
-    return [schemas.InvestorRead.from_orm(inv) for inv in investors]
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> FastJSONResponse:
+    return FastJSONResponse(crud.get_investor_rows(db, fund_id))
 
 
 @router.post("/", response_model=schemas.InvestorRead, status_code=status.HTTP_201_CREATED)
 def create_investor(
     payload: schemas.InvestorCreate,
     db: Session = Depends(get_db),
-    current_investor: models.Investor = Depends(get_current_admin_investor)
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.InvestorRead:
     try:
-        investor = crud.create_investor(db, payload, current_investor)
+        investor = crud.create_investor(db, payload, current_investor, fund_id=fund_id)
         return schemas.InvestorRead.from_orm(investor)
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
@@ -68,4 +93,57 @@ def delete_investor(
     investor = crud.get_investor(db, investor_id)
     if not investor:
         raise HTTPException(status_code=404, detail="Investor not found.")
-    crud.delete_investor(db, investor)
\ No newline at end of file
+    crud.delete_investor(db, investor)
+
+
+@router.get("/{investor_id}/history", response_model=list[schemas.InvestorValuePoint])
+def get_investor_history(
+    investor_id: int = Path(..., ge=1),
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor)
+) -> FastJSONResponse:
+    if not crud.get_investor(db, investor_id):
+        raise HTTPException(status_code=404, detail="Investor not found.")
+    return FastJSONResponse(
+        crud.get_investor_value_history(db, investor_id, start=start, end=end)
+    )
+
+
+@router.get("/{investor_id}/transactions", response_model=list[schemas.ShareTransactionRead])
+def list_share_transactions(
+    investor_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor)
+) -> list[schemas.ShareTransactionRead]:
+    if not crud.get_investor(db, investor_id):
+        raise HTTPException(status_code=404, detail="Investor not found.")
+    return [
+        schemas.ShareTransactionRead.from_orm(entry)
+        for entry in crud.get_share_transactions(db, investor_id)
+    ]
+
+
+@router.post(
+    "/{investor_id}/transactions",
+    response_model=schemas.ShareTransactionRead,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_share_transaction(
+    payload: schemas.ShareTransactionCreate,
+    investor_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor)
+) -> schemas.ShareTransactionRead:
+    """
+    登记申购（份额为正）或赎回（份额为负）
+    """
+    investor = crud.get_investor(db, investor_id)
+    if not investor:
+        raise HTTPException(status_code=404, detail="Investor not found.")
+    try:
+        entry = crud.add_share_transaction(db, investor, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return schemas.ShareTransactionRead.from_orm(entry)
@@ -0,0 +1,78 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .dependencies import get_admin_fund_id, get_current_admin_investor
+from .. import crud, schemas, models
+from ..database import get_db
+from ..utils.executor import executor
+from ..utils.scheduler import MANUAL_JOBS, run_manual_job, scheduler
+
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[schemas.ScheduledJobRead])
+def list_scheduled_jobs(
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+) -> list[schemas.ScheduledJobRead]:
+    """
+    Jobs in the persistent job store with their next run time.
+    """
+    return [
+        schemas.ScheduledJobRead(
+            id=job.id,
+            trigger=str(job.trigger),
+            next_run_time=getattr(job, "next_run_time", None),
+        )
+        for job in scheduler.get_jobs()
+    ]
+
+
+@router.get("/runs", response_model=list[schemas.JobRunRead])
+def list_job_runs(
+    job_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, pattern="^(running|success|skipped|failed|timeout)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    fund_id: Optional[int] = Query(None, ge=1, description="Only runs for this fund."),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+) -> list[schemas.JobRunRead]:
+    """
+    Recent job executions, newest first, including catch-up runs for missed days.
+    """
+    runs = crud.get_job_runs(db, job_id=job_id, status=status, limit=limit, fund_id=fund_id)
+    return [schemas.JobRunRead.from_orm(run) for run in runs]
+
+
+@router.get("/executions", response_model=list[schemas.JobExecutionRead])
+def list_job_executions(
+    active_only: bool = Query(False),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+) -> list[schemas.JobExecutionRead]:
+    """
+    Jobs this worker has handed to its process pool, newest first.
+    """
+    return [
+        schemas.JobExecutionRead(**status.as_dict())
+        for status in executor.statuses(active_only=active_only)
+    ]
+
+
+@router.post("/{job_id}/run", response_model=schemas.JobRunRead)
+def run_job(
+    job_id: str,
+    trade_date: Optional[date] = Query(None, description="Trade date for daily_nav_refresh."),
+    db: Session = Depends(get_db),
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
+) -> schemas.JobRunRead:
+    """
+    Run a job for one fund now in the process pool and return its recorded run.
+    """
+    if job_id not in MANUAL_JOBS:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    run_id = run_manual_job(job_id, trade_date=trade_date, fund_id=fund_id)
+    return schemas.JobRunRead.from_orm(db.get(models.JobRun, run_id))
@@ -1,22 +1,28 @@
+import os
 import shutil
 from datetime import date
 from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas
 from ..database import get_db
-from ..routers.dependencies import get_current_admin_investor
+from ..routers.dependencies import get_admin_fund_id, get_current_admin_investor
 from .. import models
-from ..utils.ocr_parser import parse_account_screenshot
+from ..utils import tasks
+from ..utils.executor import JobFailed, JobTimeout, executor
+from ..utils.metrics import ERRORS
 from ..utils.tushare_client import fetch_holdings
 
 
 router = APIRouter()
 
+OCR_TIMEOUT_SECONDS = float(os.getenv("OCR_TIMEOUT_SECONDS", "300"))
+
 
 def _aggregate_holdings_from_files(files: list[UploadFile]) -> list[schemas.HoldingCreate]:
     uploads_dir = Path(__file__).resolve().parent.parent.parent / "uploads"
@@ -29,8 +35,10 @@ def _aggregate_holdings_from_files(files: list[UploadFile]) -> list[schemas.Hold
             shutil.copyfileobj(file.file, buffer)
 
         try:
-            parsed = parse_account_screenshot(destination)
-        except RuntimeError as exc:
+            # OCR runs in the job executor so it does not hold the GIL of this worker.
+            parsed = executor.run("ocr", tasks.parse_screenshot, destination, timeout=OCR_TIMEOUT_SECONDS)
+        except (JobFailed, JobTimeout) as exc:
+            ERRORS.labels("ocr").inc()
             logger.exception("OCR parsing failed for file %s", file.filename)
             raise HTTPException(status_code=500, detail=str(exc)) from exc
         finally:
@@ -121,18 +129,19 @@ def _aggregate_holdings_from_files(files: list[UploadFile]) -> list[schemas.Hold
 @router.post("/tushare", response_model=schemas.FundSummary)
 def refresh_from_tushare(
     db: Session = Depends(get_db), 
-    current_investor: models.Investor = Depends(get_current_admin_investor)
+    current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.FundSummary:
     """
-    Attempt to pull the latest holdings from the configured Tushare account.
+    Attempt to pull the latest holdings from the fund's Tushare account.
     """
     try:
-        holdings = fetch_holdings()
+        holdings = fetch_holdings(account_code=crud.get_fund(db, fund_id).account_code)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     try:
-        return crud.update_holdings_and_nav(db, holdings)
+        return crud.update_holdings_and_nav(db, holdings, fund_id=fund_id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -143,16 +152,17 @@ async def preview_screenshot(
     holdings_date: Optional[date] = None,
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.UploadPreviewResponse:
     """
     Parse the uploaded screenshot and return holdings for client confirmation.
     """
-    holdings_payload = _aggregate_holdings_from_files(files)
+    holdings_payload = await run_in_threadpool(_aggregate_holdings_from_files, files)
     holdings_value = sum(item.market_value for item in holdings_payload)
 
-    cash_balance = crud.get_cash_balance(db).amount
+    cash_balance = crud.get_cash_balance_as_of(db, holdings_date or date.today(), fund_id)
     total_assets = holdings_value + cash_balance
-    total_shares = crud.get_total_shares(db)
+    total_shares = crud.get_total_shares(db, fund_id)
     nav = total_assets / total_shares if total_shares > 0 else None
 
     return schemas.UploadPreviewResponse(
@@ -171,15 +181,16 @@ async def upload_screenshot(
     holdings_date: Optional[date] = None,
     db: Session = Depends(get_db),
     current_investor: models.Investor = Depends(get_current_admin_investor),
+    fund_id: int = Depends(get_admin_fund_id),
 ) -> schemas.UploadResponse:
     """
     Accept a broker screenshot, parse it via OCR, and update holdings for the selected date.
     """
-    holdings_payload = _aggregate_holdings_from_files(files)
+    holdings_payload = await run_in_threadpool(_aggregate_holdings_from_files, files)
 
     holdings_date = holdings_date or date.today()
     try:
-        summary = crud.update_holdings_and_nav(db, holdings_payload, holdings_date)
+        summary = crud.update_holdings_and_nav(db, holdings_payload, holdings_date, fund_id=fund_id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
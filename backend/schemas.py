@@ -32,6 +32,44 @@ class HoldingRead(HoldingBase, TimestampModel):
     id: int
 
 
+class HoldingSnapshotPoint(BaseModel):
+    date: date
+    name: str
+    symbol: Optional[str] = None
+    quantity: Optional[float] = None
+    cost_price: Optional[float] = None
+    market_value: float
+    weight: Optional[float] = None
+
+
+class HoldingDiffItem(BaseModel):
+    symbol: str
+    name: str
+    status: str
+    quantity_from: Optional[float] = None
+    quantity_to: Optional[float] = None
+    quantity_change: Optional[float] = None
+    market_value_from: Optional[float] = None
+    market_value_to: Optional[float] = None
+    market_value_change: float
+
+
+class HoldingsDiff(BaseModel):
+    from_date: date
+    to_date: date
+    items: List[HoldingDiffItem]
+
+
+class FundCreate(BaseModel):
+    code: str = Field(..., min_length=1, max_length=32)
+    name: str = Field(..., min_length=1, max_length=128)
+    account_code: Optional[str] = Field(None, max_length=32)
+
+
+class FundRead(FundCreate, TimestampModel):
+    id: int
+
+
 class InvestorBase(BaseModel):
     name: str
     identifier: Optional[str] = None
@@ -55,9 +93,30 @@ class InvestorUpdate(BaseModel):
 
 class InvestorRead(InvestorBase, TimestampModel):
     id: int
+    fund_id: int
     current_value: float
 
 
+class ShareTransactionCreate(BaseModel):
+    date: date
+    shares: float
+    amount: float = 0.0
+    note: Optional[str] = None
+
+
+class ShareTransactionRead(ShareTransactionCreate, TimestampModel):
+    id: int
+    investor_id: int
+
+
+class InvestorValuePoint(BaseModel):
+    date: date
+    shares: float
+    invested: float
+    value: float
+    pnl: float
+
+
 class FundHistoryBase(BaseModel):
     date: date
     nav: float
@@ -70,6 +129,51 @@ class FundHistoryRead(FundHistoryBase, TimestampModel):
     id: int
 
 
+class FundHistoryPage(BaseModel):
+    items: List[FundHistoryRead]
+    next_cursor: Optional[date] = None
+
+
+class SeriesPoint(BaseModel):
+    date: date
+    value: float
+
+
+class FundHistoryDownsample(BaseModel):
+    source_points: int
+    nav: List[SeriesPoint]
+    total_value: List[SeriesPoint]
+
+
+class FundAnalyticsRead(BaseModel):
+    date: date
+    nav: float
+    daily_return: Optional[float] = None
+    cumulative_return: Optional[float] = None
+    annualized_return: Optional[float] = None
+    drawdown: Optional[float] = None
+    max_drawdown: Optional[float] = None
+    volatility: Optional[float] = None
+    rolling_volatility: Optional[float] = None
+    sharpe_ratio: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+
+
+class IntradayPoint(BaseModel):
+    timestamp: datetime
+    nav: float
+    total_value: float
+    holdings_value: float
+
+
+class IntradayNavSeries(BaseModel):
+    date: date
+    base_nav: Optional[float] = None  # latest official NAV before ``date``
+    points: List[IntradayPoint]
+
+
 class FundSummary(BaseModel):
     date: date
     nav: float
@@ -114,6 +218,59 @@ class CashUpdate(BaseModel):
     amount: float = Field(..., ge=0)
 
 
+class CashTransactionCreate(BaseModel):
+    date: date
+    amount: float
+    note: Optional[str] = None
+
+
+class CashTransactionRead(CashTransactionCreate, TimestampModel):
+    id: int
+
+
+class JobRunRead(BaseModel):
+    id: int
+    job_id: str
+    fund_id: Optional[int] = None
+    trigger: str
+    scheduled_for: Optional[date] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+    status: str
+    message: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
+class JobExecutionRead(BaseModel):
+    id: str
+    kind: str
+    task: str
+    state: str
+    pid: Optional[int] = None
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    message: Optional[str] = None
+
+
+class ScheduledJobRead(BaseModel):
+    id: str
+    trigger: str
+    next_run_time: Optional[datetime] = None
+
+
+class DashboardResponse(BaseModel):
+    summary: Optional[FundSummary] = None
+    history: List[FundHistoryRead]
+    holdings: Optional[HoldingsResponse] = None
+    cash: Optional[CashBalance] = None
+    investor: InvestorRead
+    investors: Optional[List[InvestorRead]] = None
+
+
 class LoginRequest(BaseModel):
     identifier: str
     password: str
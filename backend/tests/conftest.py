@@ -0,0 +1,67 @@
+"""
+Shared fixtures. Each test gets a freshly initialised throwaway SQLite
+database; the environment is set before ``backend`` creates its engines.
+"""
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+_WORKDIR = Path(tempfile.mkdtemp(prefix="turtle-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_WORKDIR / 'test.db'}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ["EVENTS_BACKEND"] = "local"
+os.environ["INTRADAY_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["OCR_ENGINE"] = "backend.benchmarks.fake_ocr:FakeOCR"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import crud, models  # noqa: E402
+from backend.database import Base, SessionLocal, dispose_async_engine, engine, init_db  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.utils.cache import bump_data_version  # noqa: E402
+
+# Fixed bcrypt hash of "password123"; hashing per test would dominate the run time.
+PASSWORD = "password123"
+PASSWORD_HASH = "$2b$04$EQ6PVbAhe3zlb4SDFOE9u.AXLbAev3PtghxXWR4E7v92bLju2d1Re"
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    bump_data_version()
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    """API client without the lifespan hooks (no scheduler, leader or intraday loop)."""
+    yield TestClient(app)
+    asyncio.run(dispose_async_engine())
+
+
+def auth_headers(db, investor) -> dict:
+    return {"user-token": crud.create_investor_token(db, investor.id).token}
+
+
+def add_investor(db, name: str, shares: float, is_admin: bool = False, fund_id: int = models.DEFAULT_FUND_ID):
+    """Insert an investor without going through bcrypt or the NAV recompute."""
+    investor = models.Investor(
+        fund_id=fund_id,
+        name=name,
+        identifier=name.lower(),
+        initial_investment=shares,
+        shares=shares,
+        current_value=shares,
+        password_hash=PASSWORD_HASH,
+        is_admin=is_admin,
+    )
+    db.add(investor)
+    db.commit()
+    db.refresh(investor)
+    return investor
@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+
+from backend.utils import analytics
+
+
+def _fold(navs):
+    rows = []
+    for nav in navs:
+        rows.append(analytics.next_row(rows[-1] if rows else None, nav))
+    return rows
+
+
+def test_small_samples_report_no_annualized_return_or_sharpe():
+    rows = _fold([1.0, 1.05, 1.11])
+    for row in rows:
+        assert row["annualized_return"] is None
+        assert row["sharpe_ratio"] is None
+    assert math.isclose(rows[-1]["cumulative_return"], 0.11)
+
+    rebuilt = analytics.rebuild_rows(np.array([1.0, 0.9]))
+    assert np.isnan(rebuilt["annualized_return"]).all()
+    assert np.isnan(rebuilt["sharpe_ratio"]).all()
+
+
+def test_metrics_appear_after_min_periods():
+    rng = np.random.default_rng(0)
+    navs = np.cumprod(1 + rng.normal(0.001, 0.01, size=analytics.MIN_PERIODS + 5))
+    rows = _fold(navs)
+    ready = analytics.MIN_PERIODS  # row index with MIN_PERIODS daily returns
+    assert rows[ready - 1]["annualized_return"] is None
+    assert rows[ready]["annualized_return"] is not None
+    assert rows[ready]["sharpe_ratio"] is not None
+
+    rebuilt = analytics.rebuild_rows(navs)
+    assert np.isnan(rebuilt["sharpe_ratio"][:ready]).all()
+    assert np.allclose(rebuilt["annualized_return"][ready:], [row["annualized_return"] for row in rows[ready:]])
+    assert np.allclose(rebuilt["sharpe_ratio"][ready:], [row["sharpe_ratio"] for row in rows[ready:]])
@@ -0,0 +1,50 @@
+from datetime import date
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from backend import crud, schemas
+from backend.database import async_database_url
+
+from .conftest import add_investor, auth_headers
+
+DAY = date(2024, 4, 1)
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("sqlite:///./data/turtle.db", "sqlite+aiosqlite:///./data/turtle.db"),
+        ("postgresql+psycopg2://user:secret@db/turtle", "postgresql+asyncpg://user:secret@db/turtle"),
+        ("mysql+pymysql://user@db/turtle", "mysql+aiomysql://user@db/turtle"),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert async_database_url(url) == expected
+
+
+def test_async_database_url_rejects_unknown_backends():
+    with pytest.raises(RuntimeError, match="ASYNC_DATABASE_URL"):
+        async_database_url("oracle://user@db/turtle")
+
+
+def test_async_endpoints_read_sync_writes(db, client):
+    alice = add_investor(db, "Alice", 1000.0)
+    headers = auth_headers(db, alice)
+    crud.update_holdings_and_nav(db, [schemas.HoldingCreate(name="A", symbol="A", market_value=1200.0)], holdings_date=DAY)
+
+    nav = client.get("/api/fund/nav", headers=headers).json()
+    assert (nav["date"], nav["nav"], nav["total_value"]) == (DAY.isoformat(), 1.2, 1200.0)
+    history = client.get("/api/fund/history", headers=headers).json()
+    assert history == jsonable_encoder([schemas.FundHistoryRead.from_orm(row) for row in crud.get_fund_history(db)])
+    assert client.get("/api/holdings/today", headers=headers).json()["total_value"] == 1200.0
+    assert client.get("/api/investors/me", headers=headers).json()["current_value"] == pytest.approx(1200.0)
+
+    # A later sync write is visible to the next async read.
+    crud.update_holdings_and_nav(db, [schemas.HoldingCreate(name="A", symbol="A", market_value=900.0)], holdings_date=DAY)
+    assert client.get("/api/fund/nav", headers=headers).json()["nav"] == 0.9
+
+
+def test_async_endpoints_require_a_valid_token(db, client):
+    assert client.get("/api/fund/nav").status_code == 401
+    assert client.get("/api/fund/nav", headers={"user-token": "nope"}).status_code == 401
@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from backend import crud, models, schemas
+
+from .conftest import add_investor
+
+DAYS = [date(2024, 5, 1) + timedelta(days=offset) for offset in range(4)]
+VALUES = [1000.0, 1040.0, 990.0, 1100.0]
+
+
+def _write_history(db, fund_id):
+    for day, value in zip(DAYS, VALUES):
+        crud.update_holdings_and_nav(
+            db, [schemas.HoldingCreate(name="A", symbol="A", market_value=value)], holdings_date=day, fund_id=fund_id
+        )
+
+
+def _history(db, fund_id):
+    stmt = (
+        select(models.FundHistory)
+        .where(models.FundHistory.fund_id == fund_id)
+        .order_by(models.FundHistory.date)
+    )
+    return [
+        (row.date, row.nav, row.total_value, row.change_value, row.change_pct)
+        for row in db.execute(stmt).scalars()
+    ]
+
+
+def _investor_values(db, investor_id):
+    return [(point["date"], point["value"]) for point in crud.get_investor_value_history(db, investor_id)]
+
+
+def test_backdated_cash_revalues_every_later_nav_date(db):
+    other = crud.create_fund(db, schemas.FundCreate(code="other", name="Other"))
+    late = add_investor(db, "Late", 600.0)
+    early = add_investor(db, "Early", 600.0, fund_id=other.id)
+    add_investor(db, "Alice", 400.0)
+    add_investor(db, "Bob", 400.0, fund_id=other.id)
+    entry = schemas.CashTransactionCreate(date=DAYS[1], amount=100.0, note="deposit")
+
+    # The default fund learns about the deposit after its NAV history was written,
+    # the other fund before; both must end up with the same history.
+    _write_history(db, models.DEFAULT_FUND_ID)
+    before = _history(db, models.DEFAULT_FUND_ID)
+    crud.add_cash_transaction(db, entry)
+    crud.add_cash_transaction(db, entry, fund_id=other.id)
+    _write_history(db, other.id)
+
+    revalued = _history(db, models.DEFAULT_FUND_ID)
+    assert revalued[0] == before[0]
+    assert [row[2] for row in revalued] == [1000.0, 1140.0, 1090.0, 1200.0]
+    for got, expected in zip(revalued, _history(db, other.id)):
+        assert got[0] == expected[0]
+        assert got[1:] == pytest.approx(expected[1:])
+    late_values, early_values = _investor_values(db, late.id), _investor_values(db, early.id)
+    assert [day for day, _ in late_values] == DAYS
+    assert [value for _, value in late_values] == pytest.approx([value for _, value in early_values])
+    assert db.get(models.Investor, late.id).current_value == pytest.approx(600.0 * 1.2)
+
+    analytics = crud.get_fund_analytics(db)
+    assert analytics.nav == pytest.approx(1.2)
+
+
+def test_backdated_cash_keeps_historical_share_counts(db):
+    add_investor(db, "Alice", 1000.0)
+    _write_history(db, models.DEFAULT_FUND_ID)
+    # A later subscription must not dilute NAVs written before it.
+    add_investor(db, "Newcomer", 1000.0)
+
+    crud.add_cash_transaction(db, schemas.CashTransactionCreate(date=DAYS[2], amount=50.0))
+
+    navs = [row[1] for row in _history(db, models.DEFAULT_FUND_ID)]
+    assert navs == pytest.approx([1.0, 1.04, 1.04, 1.15])
+
+
+def test_balance_adjustment_revalues_todays_nav(db):
+    add_investor(db, "Alice", 1000.0)
+    crud.update_holdings_and_nav(db, [schemas.HoldingCreate(name="A", symbol="A", market_value=1000.0)])
+
+    crud.update_cash_balance(db, 250.0)
+
+    latest = crud.get_latest_fund_history(db)
+    assert (latest.total_value, latest.nav) == pytest.approx((1250.0, 1.25))
+    assert crud.get_cash_balance(db).amount == 250.0
+
+
+def test_balance_set_before_todays_nav_revalues_the_latest_nav(db):
+    add_investor(db, "Alice", 1000.0)
+    yesterday = date.today() - timedelta(days=1)
+    holdings = [schemas.HoldingCreate(name="A", symbol="A", market_value=1000.0)]
+    crud.update_holdings_and_nav(db, holdings, holdings_date=yesterday)
+
+    crud.update_cash_balance(db, 250.0)
+
+    latest = crud.get_latest_fund_history(db)
+    assert latest.date == yesterday
+    assert (latest.total_value, latest.nav) == pytest.approx((1250.0, 1.25))
+    assert crud.get_cash_balance(db).amount == 250.0
+    # Re-sending the same snapshot reads the adjusted balance.
+    summary = crud.update_holdings_and_nav(db, holdings, holdings_date=yesterday)
+    assert (summary.total_value, summary.cash) == pytest.approx((1250.0, 250.0))
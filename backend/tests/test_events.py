@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.routers.events import _event_stream, _visible_to
+from backend.utils.events import EventBus
+
+OWN_FUND, OTHER_FUND = 1, 2
+
+
+def _event(event_type, **data):
+    return {"type": event_type, "data": data, "at": "2024-01-01T00:00:00"}
+
+
+@pytest.mark.parametrize(
+    ("event", "investor_visible", "admin_visible"),
+    [
+        (_event("nav.updated", fund_id=OWN_FUND), True, True),
+        (_event("nav.updated", fund_id=OTHER_FUND), False, True),
+        (_event("cash.updated", fund_id=OTHER_FUND, amount=5.0), False, True),
+        (_event("investors.changed", fund_id=OWN_FUND, investor_id=7), True, True),
+        (_event("investors.changed", fund_id=OWN_FUND, investor_id=8), False, True),
+        (_event("investors.changed", fund_id=OTHER_FUND, investor_id=7), False, True),
+    ],
+)
+def test_visibility(event, investor_visible, admin_visible):
+    assert _visible_to(event, 7, OWN_FUND, is_admin=False) is investor_visible
+    assert _visible_to(event, 7, OWN_FUND, is_admin=True) is admin_visible
+
+
+class _Request:
+    """Stands in for a client that stays connected for ``polls`` checks."""
+
+    def __init__(self, polls: int) -> None:
+        self.polls = polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls -= 1
+        return self.polls < 0
+
+
+def test_stream_only_forwards_visible_events():
+    async def collect() -> list[str]:
+        bus = EventBus(backend="local")
+        bus.start()
+        subscription = bus.subscribe()
+        for event in (
+            _event("nav.updated", fund_id=OTHER_FUND, nav=2.0),
+            _event("investors.changed", fund_id=OWN_FUND, investor_id=8),
+            _event("nav.updated", fund_id=OWN_FUND, nav=1.5),
+        ):
+            bus.publish(event["type"], event["data"])
+        frames = [frame async for frame in _event_stream(_Request(3), subscription, 7, OWN_FUND, False)]
+        assert bus.subscriber_count == 0
+        await bus.stop()
+        return frames
+
+    frames = asyncio.run(collect())
+
+    assert frames[0].startswith("retry: ")
+    events = [frame for frame in frames[1:] if not frame.startswith(":")]
+    assert len(events) == 1
+    name, data = events[0].splitlines()[:2]
+    assert name == "event: nav.updated"
+    assert json.loads(data.removeprefix("data: "))["data"] == {"fund_id": OWN_FUND, "nav": 1.5}
+
+
+def test_stream_requires_a_valid_token(db, client):
+    assert client.get("/api/events/stream").status_code == 401
+    assert client.get("/api/events/stream", params={"token": "nope"}).status_code == 401
@@ -0,0 +1,82 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.utils.executor import JobExecutor, JobFailed, JobSkipped, JobTimeout
+
+
+# Job bodies must be module-level so the spawned workers can import them.
+def _pid() -> int:
+    return os.getpid()
+
+
+def _skip() -> None:
+    raise JobSkipped("nothing to do")
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _sleep_pid(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@pytest.fixture
+def executor():
+    executor = JobExecutor(max_workers=1, limits={})
+    yield executor
+    executor.shutdown()
+
+
+def test_workers_are_reused_between_jobs(executor):
+    first = executor.run("ocr", _pid)
+    assert first != os.getpid()
+    assert executor.run("ocr", _pid) == first
+    assert executor.statuses()[0].pid == first
+    # Kinds have separate pools.
+    assert executor.run("nav:1", _pid) != first
+
+
+def test_skipped_and_failed_jobs(executor):
+    with pytest.raises(JobSkipped, match="nothing to do"):
+        executor.run("nav", _skip)
+    with pytest.raises(JobFailed, match="ValueError: boom"):
+        executor.run("nav", _fail)
+    assert [status.state for status in executor.statuses()] == ["failed", "skipped"]
+
+
+def test_timeout_kills_the_worker_and_the_next_job_gets_a_new_one(executor):
+    before = executor.run("ocr", _pid)
+    with pytest.raises(JobTimeout):
+        executor.run("ocr", _sleep, 30, timeout=0.5)
+    assert executor.statuses()[0].state == "timeout"
+    after = executor.run("ocr", _pid)
+    assert after != before
+
+
+@pytest.mark.parametrize("kinds", [("ocr", "ocr"), ("nav:1", "nav:2")])
+def test_timeout_spares_other_jobs_of_the_same_kind(kinds):
+    executor = JobExecutor(max_workers=2, limits={"ocr": 2, "nav": 1})
+    try:
+        with ThreadPoolExecutor(2) as threads:
+            # Start both workers first so spawning does not count against the timeout.
+            list(threads.map(lambda kind: executor.run(kind, _sleep, 0.5), kinds))
+            stuck = threads.submit(executor.run, kinds[0], _sleep, 30, timeout=0.5)
+            other = threads.submit(executor.run, kinds[1], _sleep_pid, 1.5)
+            with pytest.raises(JobTimeout):
+                stuck.result()
+            survivor = other.result()
+        assert sorted(status.state for status in executor.statuses()[:2]) == ["success", "timeout"]
+        # The worker that finished is kept; only the stuck one was replaced.
+        assert executor.run(kinds[1], _pid) == survivor
+    finally:
+        executor.shutdown()
@@ -0,0 +1,73 @@
+import csv
+import io
+from datetime import date
+
+import pytest
+
+from backend import crud, schemas
+
+from .conftest import add_investor, auth_headers
+
+DAYS = [date(2024, 1, 15), date(2024, 1, 16), date(2024, 2, 9), date(2024, 3, 5)]
+
+
+@pytest.fixture
+def archived(db):
+    """Holdings on four days, January archived, NAV history on every day."""
+    add_investor(db, "Alice", 1000.0)
+    for index, day in enumerate(DAYS):
+        crud.update_holdings_and_nav(
+            db,
+            [
+                schemas.HoldingCreate(name="贵州茅台", symbol="600519.SH", quantity=1.0, market_value=600.0 + index),
+                schemas.HoldingCreate(name="Bond", symbol="BOND", market_value=400.0),
+            ],
+            holdings_date=day,
+        )
+    crud.archive_holdings(db, retention_days=30, today=date(2024, 3, 20))
+
+
+def _rows(chunks):
+    return [row for chunk in chunks for row in chunk]
+
+
+def test_holdings_export_merges_archive_and_live_rows(db, archived):
+    rows = _rows(crud.iter_holdings_export(db, chunk_size=3))
+    assert [row[0] for row in rows] == [day for day in DAYS for _ in range(2)]
+    assert rows == sorted(rows, key=lambda row: row[:2])
+    assert {row[2] for row in rows} == {"600519.SH", "BOND"}
+
+    bounded = _rows(crud.iter_holdings_export(db, start=DAYS[1], end=DAYS[2], chunk_size=1))
+    assert [row[0] for row in bounded] == [DAYS[1], DAYS[1], DAYS[2], DAYS[2]]
+
+
+def test_csv_export_endpoint(db, client, archived):
+    headers = auth_headers(db, add_investor(db, "Admin", 0.0, is_admin=True))
+    response = client.get("/api/export/holdings", params={"to": DAYS[2]}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == f'attachment; filename="holdings_{DAYS[2]}.csv"'
+    assert response.content.startswith(b"\xef\xbb\xbf")
+    lines = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert lines[0] == [name for name, _ in crud.HOLDINGS_EXPORT_COLUMNS]
+    assert [line[0] for line in lines[1:]] == [day.isoformat() for day in DAYS[:3] for _ in range(2)]
+    assert "贵州茅台" in {line[3] for line in lines[1:]}
+
+
+def test_parquet_export_endpoint(db, client, archived):
+    pq = pytest.importorskip("pyarrow.parquet")
+    headers = auth_headers(db, add_investor(db, "Admin", 0.0, is_admin=True))
+
+    response = client.get("/api/export/fund-history", params={"format": "parquet"}, headers=headers)
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == [name for name, _ in crud.FUND_HISTORY_EXPORT_COLUMNS]
+    assert table.column("date").to_pylist() == DAYS
+
+    values = client.get("/api/export/investor-values", params={"format": "parquet"}, headers=headers)
+    assert pq.read_table(io.BytesIO(values.content)).column("investor_name").to_pylist() == ["Alice"] * 4
+
+
+def test_exports_are_admin_only(db, client, archived):
+    headers = auth_headers(db, add_investor(db, "Bob", 10.0))
+    assert client.get("/api/export/holdings", headers=headers).status_code == 403
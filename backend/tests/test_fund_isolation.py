@@ -0,0 +1,98 @@
+import csv
+import io
+from datetime import date
+
+import pytest
+
+from backend import crud, schemas
+from backend.utils import tasks, tushare_client
+
+from .conftest import add_investor, auth_headers
+
+DAYS = [date(2024, 3, 4), date(2024, 3, 5)]
+
+
+@pytest.fixture
+def funds(db):
+    """Two funds with holdings and NAV history on the same days but different symbols and totals."""
+    other = crud.create_fund(db, schemas.FundCreate(code="other", name="Other", account_code="8800123"))
+    fund_ids = {"F1": 1, "F2": other.id}
+    investors = {
+        "F1": add_investor(db, "Alice", 1000.0),
+        "F2": add_investor(db, "Bob", 2000.0, fund_id=other.id),
+    }
+    for symbol, fund_id in fund_ids.items():
+        for index, day in enumerate(DAYS):
+            crud.update_holdings_and_nav(
+                db,
+                [schemas.HoldingCreate(name=symbol, symbol=symbol, quantity=1.0, market_value=fund_id * 1000.0 + index)],
+                holdings_date=day,
+                fund_id=fund_id,
+            )
+    return fund_ids, investors
+
+
+def _totals(rows) -> set:
+    return {row["total_value"] for row in rows}
+
+
+F2_TOTALS = {2000.0, 2001.0}
+
+
+def test_investor_reads_only_their_fund(db, client, funds):
+    fund_ids, investors = funds
+    headers = auth_headers(db, investors["F2"])
+
+    today = client.get("/api/holdings/today", headers=headers).json()
+    assert {row["symbol"] for row in today["holdings"]} == {"F2"}
+    by_date = client.get(f"/api/holdings/by-date/{DAYS[0]}", headers=headers).json()
+    assert {row["symbol"] for row in by_date} == {"F2"}
+    assert client.get("/api/holdings/symbol/F1/history", headers=headers).json() == []
+
+    assert _totals(client.get("/api/fund/history", headers=headers).json()) == F2_TOTALS
+    page = client.get("/api/fund/history/range", headers=headers).json()
+    assert _totals(page["items"]) == F2_TOTALS
+
+    dashboard = client.get("/api/dashboard", headers=headers).json()
+    assert dashboard["summary"]["total_value"] == 2001.0
+    assert _totals(dashboard["history"]) == F2_TOTALS
+    assert {row["symbol"] for row in dashboard["holdings"]["holdings"]} == {"F2"}
+
+    for path in ("/api/holdings/today", "/api/fund/history", "/api/dashboard"):
+        response = client.get(path, params={"fund_id": fund_ids["F1"]}, headers=headers)
+        assert response.status_code == 403
+
+
+def test_admin_dashboard_and_exports_scope_to_the_requested_fund(db, client, funds):
+    fund_ids, investors = funds
+    headers = auth_headers(db, add_investor(db, "Admin", 0.0, is_admin=True))
+    params = {"fund_id": fund_ids["F2"]}
+
+    dashboard = client.get("/api/dashboard", params=params, headers=headers).json()
+    assert _totals(dashboard["history"]) == F2_TOTALS
+    assert [row["name"] for row in dashboard["investors"]] == ["Bob"]
+
+    def export(path):
+        response = client.get(f"/api/export/{path}", params=params, headers=headers)
+        assert response.status_code == 200
+        return list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+
+    assert {float(row["total_value"]) for row in export("fund-history")} == F2_TOTALS
+    assert {row["symbol"] for row in export("holdings")} == {"F2"}
+    assert {row["investor_name"] for row in export("investor-values")} == {"Bob"}
+
+
+def test_refresh_nav_uses_the_fund_broker_account(db, funds, monkeypatch):
+    fund_ids, _ = funds
+    requested = []
+
+    def fake_fetch_holdings(account_code=None, trade_date=None):
+        requested.append(account_code)
+        return [schemas.HoldingCreate(name="F", symbol="F", market_value=100.0)]
+
+    monkeypatch.setattr(tushare_client, "fetch_holdings", fake_fetch_holdings)
+    tasks.refresh_nav(trade_date=DAYS[-1], fund_id=fund_ids["F1"])
+    tasks.refresh_nav(trade_date=DAYS[-1], fund_id=fund_ids["F2"])
+
+    # The default fund has no broker account; its code is not one.
+    assert requested == [None, "8800123"]
@@ -0,0 +1,78 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from backend import crud, models
+
+from .conftest import add_investor, auth_headers
+
+DAYS = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(7)]
+
+
+@pytest.fixture
+def history(db):
+    for offset, day in enumerate(DAYS):
+        nav = 1.0 + offset / 100
+        db.add(models.FundHistory(date=day, nav=nav, total_value=1000.0 * nav))
+    db.commit()
+    return DAYS
+
+
+def _pages(db, limit, **filters):
+    pages, after = [], None
+    while True:
+        records, after = crud.get_fund_history_page(db, after=after, limit=limit, **filters)
+        pages.append([record["date"] for record in records])
+        if after is None:
+            return pages
+
+
+def test_pages_cover_the_range_once_in_order(db, history):
+    assert _pages(db, 3) == [DAYS[0:3], DAYS[3:6], DAYS[6:]]
+
+
+def test_last_full_page_has_no_cursor(db, history):
+    # The page size divides the row count: no trailing empty page.
+    assert _pages(db, 7) == [DAYS]
+    assert _pages(db, 2, start=DAYS[1], end=DAYS[4]) == [DAYS[1:3], DAYS[3:5]]
+
+
+def test_range_bounds_are_inclusive(db, history):
+    records, after = crud.get_fund_history_page(db, start=DAYS[2], end=DAYS[2])
+    assert [record["date"] for record in records] == [DAYS[2]]
+    assert after is None
+    assert crud.get_fund_history_page(db, start=DAYS[-1] + timedelta(days=1)) == ([], None)
+
+
+def test_stream_matches_paging(db, history):
+    assert [record["date"] for record in crud.iter_fund_history(db, chunk_size=2)] == DAYS
+
+
+def test_range_endpoint_follows_next_cursor(db, client, history):
+    headers = auth_headers(db, add_investor(db, "Alice", 100.0))
+    seen, params = [], {"from": DAYS[1].isoformat(), "limit": 4}
+    while True:
+        body = client.get("/api/fund/history/range", params=params, headers=headers).json()
+        seen.extend(item["date"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert seen == [day.isoformat() for day in DAYS[1:]]
+
+    response = client.get(
+        "/api/fund/history/range",
+        params={"from": DAYS[3].isoformat(), "to": DAYS[1].isoformat()},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+def test_stream_endpoint_emits_one_json_line_per_day(db, client, history):
+    headers = auth_headers(db, add_investor(db, "Alice", 100.0))
+    response = client.get(
+        "/api/fund/history/stream", params={"to": DAYS[4].isoformat()}, headers=headers
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["date"] for line in lines] == [day.isoformat() for day in DAYS[:5]]
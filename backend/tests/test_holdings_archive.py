@@ -0,0 +1,97 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from backend import crud, models, schemas
+from backend.utils import archive
+
+DAYS = [date(2024, 1, 15), date(2024, 1, 16), date(2024, 2, 9), date(2024, 3, 5)]
+
+
+def _snapshot(db, day, scale=1.0, extra=()):
+    crud.replace_holdings(
+        db,
+        [
+            schemas.HoldingCreate(name="贵州茅台", symbol="600519.SH", quantity=10.0, cost_price=1500.0, market_value=1800.0 * scale),
+            schemas.HoldingCreate(name="Bond", symbol="BOND", quantity=None, market_value=500.0 * scale),
+            *extra,
+        ],
+        day,
+    )
+    db.commit()
+
+
+@pytest.fixture
+def snapshots(db):
+    for index, day in enumerate(DAYS):
+        _snapshot(db, day, scale=1.0 + index / 10)
+
+
+def _live_count(db, start, end):
+    stmt = select(func.count(models.Holding.id)).where(models.Holding.date >= start, models.Holding.date <= end)
+    return db.execute(stmt).scalar_one()
+
+
+def _reads(db):
+    return (
+        [crud.get_holdings_rows_by_date(db, day) for day in DAYS],
+        crud.get_symbol_history(db, "600519.SH"),
+        crud.diff_holdings(db, DAYS[1], DAYS[2], include_unchanged=True),
+    )
+
+
+def test_encode_decode_round_trip():
+    rows = [
+        {
+            "id": 7, "date": DAYS[0], "name": "贵州茅台", "symbol": None, "quantity": None, "cost_price": 1.5,
+            "market_value": 100.0, "weight": 0.25, "created_at": datetime(2024, 1, 15, 16, 30), "updated_at": None,
+        },
+        {
+            "id": 8, "date": DAYS[1], "name": "贵州茅台", "symbol": "600519.SH", "quantity": 10.0, "cost_price": None,
+            "market_value": 300.0, "weight": None, "created_at": datetime(2024, 1, 16, 16, 30, 0, 5), "updated_at": None,
+        },
+    ]
+    assert archive.decode_rows(archive.encode_rows(rows)) == rows
+
+
+def test_reads_fall_back_to_the_archive(db, snapshots):
+    before = _reads(db)
+
+    moved = crud.archive_holdings(db, retention_days=30, today=date(2024, 3, 20))
+
+    assert moved == 4
+    assert _live_count(db, date(2024, 1, 1), date(2024, 1, 31)) == 0
+    assert _live_count(db, date(2024, 2, 1), date(2024, 3, 31)) == 4
+    assert _reads(db) == before
+    # The ORM read returns transient rows carrying the archived values.
+    archived = crud.get_holdings_by_date(db, DAYS[0])
+    assert [(row.symbol, row.market_value, row.fund_id) for row in archived] == [
+        ("600519.SH", 1800.0, models.DEFAULT_FUND_ID),
+        ("BOND", 500.0, models.DEFAULT_FUND_ID),
+    ]
+    assert crud.diff_holdings(db, DAYS[0], DAYS[1]) == crud._diff_holding_rows(
+        before[0][0], before[0][1], include_unchanged=False
+    )
+
+
+def test_latest_snapshot_is_never_archived(db, snapshots):
+    crud.archive_holdings(db, retention_days=0, today=date(2030, 1, 1))
+    assert _live_count(db, DAYS[0], DAYS[-1]) == 2
+    assert crud.get_latest_holdings_rows(db)["date"] == DAYS[-1]
+
+
+def test_late_rows_merge_into_an_archived_month(db, snapshots):
+    crud.archive_holdings(db, retention_days=30, today=date(2024, 3, 20))
+    late_day = date(2024, 1, 17)
+    _snapshot(db, DAYS[1], scale=2.0)
+    _snapshot(db, late_day, extra=[schemas.HoldingCreate(name="Late", symbol="LATE", market_value=1.0)])
+
+    crud.archive_holdings(db, retention_days=30, today=date(2024, 3, 20))
+
+    assert _live_count(db, date(2024, 1, 1), date(2024, 1, 31)) == 0
+    record = db.execute(select(models.HoldingsArchive).where(models.HoldingsArchive.month == date(2024, 1, 1))).scalar_one()
+    assert (record.row_count, record.start_date, record.end_date) == (7, DAYS[0], late_day)
+    values = [row["market_value"] for row in crud.get_holdings_rows_by_date(db, DAYS[1])]
+    assert values == [3600.0, 1000.0]
+    assert [row["symbol"] for row in crud.get_holdings_rows_by_date(db, late_day)][-1] == "LATE"
@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from backend import crud, schemas
+
+from .conftest import add_investor, auth_headers
+
+FROM, TO = date(2024, 6, 3), date(2024, 6, 4)
+
+
+def _holding(symbol, market_value, quantity=None, name=None):
+    return schemas.HoldingCreate(name=name or symbol, symbol=symbol, quantity=quantity, market_value=market_value)
+
+
+@pytest.fixture
+def snapshots(db):
+    crud.replace_holdings(
+        db,
+        [
+            _holding("KEEP", 100.0, 10.0),
+            _holding("GROW", 200.0, 20.0),
+            _holding("SOLD", 50.0, 5.0),
+            _holding(None, 30.0, name="Unlisted"),
+        ],
+        FROM,
+    )
+    crud.replace_holdings(
+        db,
+        [
+            _holding("KEEP", 100.0, 10.0),
+            _holding("GROW", 260.0, 25.0),
+            _holding("NEW", 80.0, 8.0),
+            _holding(None, 30.0, name="Unlisted"),
+        ],
+        TO,
+    )
+    db.commit()
+
+
+def _statuses(items):
+    return {item["symbol"]: item["status"] for item in items}
+
+
+def test_diff_classifies_positions(db, snapshots):
+    items = crud.diff_holdings(db, FROM, TO)
+    assert [item["symbol"] for item in items] == ["NEW", "GROW", "SOLD"]
+    assert _statuses(items) == {"NEW": "added", "GROW": "changed", "SOLD": "removed"}
+    grow = items[1]
+    assert (grow["quantity_change"], grow["market_value_change"]) == (5.0, 60.0)
+    assert items[0]["quantity_from"] is None
+
+    # Positions without a symbol are matched on name.
+    everything = _statuses(crud.diff_holdings(db, FROM, TO, include_unchanged=True))
+    assert everything["KEEP"] == everything["Unlisted"] == "unchanged"
+
+
+def test_symbol_history_is_ordered_and_bounded(db, snapshots):
+    history = crud.get_symbol_history(db, "GROW")
+    assert [(point["date"], point["market_value"]) for point in history] == [(FROM, 200.0), (TO, 260.0)]
+    assert [point["date"] for point in crud.get_symbol_history(db, "GROW", start=TO)] == [TO]
+    assert crud.get_symbol_history(db, "SOLD", start=TO) == []
+
+
+def test_diff_endpoint(db, client, snapshots):
+    headers = auth_headers(db, add_investor(db, "Alice", 100.0))
+    body = client.get("/api/holdings/diff", params={"from": FROM, "to": TO}, headers=headers).json()
+    assert body["from_date"] == FROM.isoformat()
+    assert _statuses(body["items"]) == {"NEW": "added", "GROW": "changed", "SOLD": "removed"}
+    history = client.get("/api/holdings/symbol/NEW/history", headers=headers).json()
+    assert [point["date"] for point in history] == [TO.isoformat()]
@@ -0,0 +1,75 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+
+from backend import crud
+from backend.utils.intraday import RingBuffer, estimate_nav, trading_date
+
+# 2024-03-01 09:00:00 UTC, a multiple of 60 seconds.
+T0 = 1709283600.0
+
+
+def _timestamps(points):
+    return [point[0] - T0 for point in points]
+
+
+def _fill(buffer, offsets):
+    for offset in offsets:
+        buffer.append(T0 + offset, 1.0 + offset / 1000, 1000.0 + offset, 900.0 + offset)
+
+
+def test_compact_keeps_the_last_point_of_each_closed_bucket():
+    buffer = RingBuffer(capacity=16)
+    _fill(buffer, [0, 30, 59, 60, 90, 130])
+
+    assert _timestamps(buffer.compact(bucket_seconds=60)) == [59, 90]
+    # Nothing new has closed since.
+    assert len(buffer.compact(bucket_seconds=60)) == 0
+
+    _fill(buffer, [150, 185])
+    assert _timestamps(buffer.compact(bucket_seconds=60)) == [150]
+    assert _timestamps(buffer.compact(bucket_seconds=60, final=True)) == [185]
+    assert len(buffer.compact(bucket_seconds=60, final=True)) == 0
+
+
+def test_compact_rows_carry_every_field():
+    buffer = RingBuffer(capacity=4)
+    _fill(buffer, [10, 70])
+    (point,) = buffer.compact(bucket_seconds=60)
+    assert point.tolist() == [T0 + 10, 1.01, 1010.0, 910.0]
+
+
+def test_buffer_overwrites_the_oldest_points():
+    buffer = RingBuffer(capacity=3)
+    _fill(buffer, [0, 1, 2, 3, 4])
+    assert len(buffer) == 3
+    assert _timestamps(buffer.points()) == [2, 3, 4]
+    assert _timestamps(buffer.points(since=T0 + 3)) == [3, 4]
+
+
+def test_estimate_nav_falls_back_to_snapshot_values():
+    nav, total, holdings = estimate_nav(
+        quantities=np.array([10.0, np.nan, 5.0]),
+        prices=np.array([12.0, 50.0, np.nan]),
+        fallback_values=np.array([100.0, 200.0, 300.0]),
+        cash=80.0,
+        total_shares=400.0,
+    )
+    assert (holdings, total, nav) == pytest.approx((620.0, 700.0, 1.75))
+
+
+def test_trading_date_uses_exchange_time():
+    late_utc = datetime(2024, 3, 1, 17, 0, tzinfo=timezone.utc).timestamp()
+    assert trading_date(late_utc) == date(2024, 3, 2)
+
+
+def test_saving_compacted_points_is_idempotent(db):
+    buffer = RingBuffer(capacity=8)
+    _fill(buffer, [0, 61, 122])
+    points = buffer.compact(bucket_seconds=60, final=True)
+
+    assert crud.save_intraday_points(db, points) == 3
+    assert crud.save_intraday_points(db, points) == 0
+    saved = crud.get_intraday_points(db, date(2024, 3, 1))
+    assert [point["nav"] for point in saved] == pytest.approx([1.0, 1.061, 1.122])
@@ -0,0 +1,113 @@
+import argparse
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend import cli, crud, models, schemas
+
+from .conftest import add_investor
+
+START = date(2024, 1, 1)
+DAYS = [START + timedelta(days=offset) for offset in range(5)]
+
+
+def _seed_legacy_history(db):
+    """NAV history and an investor written before the share ledger existed."""
+    db.execute(
+        insert(models.FundHistory),
+        [{"date": day, "nav": 1.0 + index / 10, "total_value": 1000.0 + index * 100} for index, day in enumerate(DAYS)],
+    )
+    db.commit()
+    return add_investor(db, "Legacy", 1000.0)
+
+
+def _value_dates(db, investor_id):
+    stmt = (
+        select(models.InvestorValueHistory.date)
+        .where(models.InvestorValueHistory.investor_id == investor_id)
+        .order_by(models.InvestorValueHistory.date)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def test_nav_write_backfills_legacy_investor_history(db):
+    legacy = _seed_legacy_history(db)
+    new_day = DAYS[-1] + timedelta(days=1)
+    crud.update_holdings_and_nav(
+        db, [schemas.HoldingCreate(name="A", symbol="A", market_value=1600.0)], holdings_date=new_day
+    )
+
+    assert _value_dates(db, legacy.id) == [*DAYS, new_day]
+    values = crud.get_investor_value_history(db, legacy.id)
+    assert [round(point["value"], 6) for point in values] == [1000.0, 1100.0, 1200.0, 1300.0, 1400.0, 1600.0]
+
+
+def test_init_db_backfills_legacy_investor_history(db):
+    legacy = _seed_legacy_history(db)
+    db.close()
+
+    cli.initialize_database(argparse.Namespace())
+
+    assert _value_dates(db, legacy.id) == DAYS
+    entries = db.execute(
+        select(models.ShareTransaction).where(models.ShareTransaction.investor_id == legacy.id)
+    ).scalars().all()
+    assert [(entry.date, entry.shares) for entry in entries] == [(START, 1000.0)]
+
+
+def _write_navs(db):
+    for index, day in enumerate(DAYS):
+        crud.update_holdings_and_nav(
+            db, [schemas.HoldingCreate(name="A", symbol="A", market_value=1000.0 + index * 100)], holdings_date=day
+        )
+
+
+def _navs(db):
+    stmt = select(models.FundHistory.nav).order_by(models.FundHistory.date)
+    return [round(nav, 6) for nav in db.execute(stmt).scalars()]
+
+
+def _values(db, investor_id):
+    return [(point["date"], round(point["value"], 6)) for point in crud.get_investor_value_history(db, investor_id)]
+
+
+def test_backdated_subscription_revalues_later_dates(db):
+    alice = add_investor(db, "Alice", 1000.0)
+    bob = add_investor(db, "Bob", 0.0)
+    _write_navs(db)
+
+    crud.add_share_transaction(db, bob, schemas.ShareTransactionCreate(date=DAYS[2], shares=500.0, amount=600.0))
+
+    assert _navs(db) == [1.0, 1.1, 0.8, round(1300 / 1500, 6), round(1400 / 1500, 6)]
+    assert _values(db, bob.id) == [(day, round(500 * nav, 6)) for day, nav in zip(DAYS[2:], [0.8, 1300 / 1500, 1400 / 1500])]
+    assert _values(db, alice.id) == [
+        (day, round(1000 * nav, 6)) for day, nav in zip(DAYS, [1.0, 1.1, 0.8, 1300 / 1500, 1400 / 1500])
+    ]
+    assert db.get(models.Investor, alice.id).current_value == pytest.approx(1000 * 1400 / 1500)
+    assert crud.get_fund_analytics(db).nav == pytest.approx(1400 / 1500)
+
+
+def test_transaction_after_the_latest_nav_revalues_it(db):
+    add_investor(db, "Alice", 1000.0)
+    bob = add_investor(db, "Bob", 0.0)
+    _write_navs(db)
+
+    crud.add_share_transaction(
+        db, bob, schemas.ShareTransactionCreate(date=DAYS[-1] + timedelta(days=3), shares=1000.0)
+    )
+
+    assert _navs(db) == [1.0, 1.1, 1.2, 1.3, 0.7]
+    # Bob's shares count from the transaction date, after the last NAV.
+    assert _values(db, bob.id) == []
+
+
+def test_amount_only_entry_rebuilds_invested(db):
+    alice = add_investor(db, "Alice", 1000.0)
+    _write_navs(db)
+
+    crud.add_share_transaction(db, alice, schemas.ShareTransactionCreate(date=DAYS[3], shares=0.0, amount=-200.0))
+
+    assert _navs(db) == [1.0, 1.1, 1.2, 1.3, 1.4]
+    invested = [point["invested"] for point in crud.get_investor_value_history(db, alice.id)]
+    assert invested == [1000.0, 1000.0, 1000.0, 800.0, 800.0]
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from backend.database import engine
+from backend.utils.leader import LeaderElector
+
+LEASE = 0.3
+
+
+def _elector(name, events=None):
+    return LeaderElector(
+        engine,
+        owner=name,
+        heartbeat_seconds=0.1,
+        lease_seconds=LEASE,
+        on_elected=lambda: events.append((name, "elected")) if events is not None else None,
+        on_demoted=lambda: events.append((name, "demoted")) if events is not None else None,
+    )
+
+
+def test_one_leader_at_a_time(db):
+    first, second = _elector("first"), _elector("second")
+    assert first.campaign()
+    assert not second.campaign()
+    assert first.campaign()  # renewal
+    assert first.is_leader and not second.is_leader
+
+
+def test_expired_lease_is_taken_over(db):
+    events = []
+    first, second = _elector("first", events), _elector("second", events)
+    assert first.campaign()
+
+    time.sleep(LEASE + 0.05)
+    # The stalled leader stops acting as soon as its lease runs out locally.
+    assert not first.is_leader
+    assert second.campaign()
+    assert not first.campaign()
+
+    assert events == [("first", "elected"), ("second", "elected"), ("first", "demoted")]
+
+
+def test_stop_hands_over_at_once(db):
+    first, second = _elector("first"), _elector("second")
+    assert first.campaign()
+
+    first.stop()
+
+    assert not first.is_leader
+    assert second.campaign()
+
+
+def test_lease_must_outlast_the_heartbeat():
+    with pytest.raises(ValueError):
+        LeaderElector(engine, heartbeat_seconds=1, lease_seconds=1)
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from backend.benchmarks.fake_ocr import FakeOCR
+from backend.utils import ocr_parser
+
+SCREENSHOT = Path(__file__).resolve().parents[2] / "sample_holdings_ocr.png"
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    def use(name):
+        monkeypatch.setattr(ocr_parser, "OCR_ENGINE", name)
+        ocr_parser.load_ocr_engine.cache_clear()
+        return ocr_parser.load_ocr_engine()
+
+    yield use
+    ocr_parser.load_ocr_engine.cache_clear()
+
+
+def test_engine_factory_is_loaded_by_import_path(engine):
+    assert isinstance(engine("backend.benchmarks.fake_ocr:FakeOCR"), FakeOCR)
+    for name in ("tesseract", "backend.benchmarks.fake_ocr:Missing"):
+        with pytest.raises(RuntimeError, match=name):
+            engine(name)
+
+
+def test_fake_engine_output_goes_through_the_layout_parser(engine):
+    engine("backend.benchmarks.fake_ocr:FakeOCR")
+
+    first = ocr_parser.parse_account_screenshot(SCREENSHOT)
+    second = ocr_parser.parse_account_screenshot(SCREENSHOT)
+
+    assert first == second
+    assert len(first) == FakeOCR().holdings
+    assert first[0]["name"] == "贵州茅台"
+    for holding in first:
+        assert holding["symbol"] == holding["name"]
+        assert holding["market_value"] > 0 and holding["quantity"] > 0
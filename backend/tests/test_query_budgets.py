@@ -0,0 +1,67 @@
+"""
+Query budgets for the hot read endpoints. The budgets are independent of the
+number of investors, holdings and NAV days, so an N+1 regression fails here.
+"""
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from backend import crud, schemas
+from backend.database import dispose_async_engine
+from backend.main import app
+from backend.utils.sql_profiler import query_budget
+
+from .conftest import add_investor
+
+START = date(2024, 1, 1)
+
+
+@pytest.fixture
+def tokens(db):
+    admin = add_investor(db, "Admin", 0.0, is_admin=True)
+    investors = [add_investor(db, f"Investor{index}", 100.0 + index) for index in range(25)]
+    for offset in range(10):
+        crud.update_holdings_and_nav(
+            db,
+            [
+                schemas.HoldingCreate(name=f"S{index}", symbol=f"{index:06d}.SZ", quantity=100.0, market_value=500.0 + offset + index)
+                for index in range(15)
+            ],
+            holdings_date=START + timedelta(days=offset),
+        )
+    return {
+        "admin": crud.create_investor_token(db, admin.id).token,
+        "investor": crud.create_investor_token(db, investors[0].id).token,
+    }
+
+
+def _get(path: str, token: str, max_queries: int, max_repeats: int = 1) -> httpx.Response:
+    async def request() -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                with query_budget(max_queries, max_repeats=max_repeats):
+                    return await client.get(path, headers={"user-token": token})
+        finally:
+            await dispose_async_engine()
+
+    response = asyncio.run(request())
+    assert response.status_code == 200, response.text
+    return response
+
+
+@pytest.mark.parametrize(
+    ("path", "role", "max_queries"),
+    [
+        ("/api/dashboard", "investor", 7),
+        ("/api/dashboard", "admin", 8),
+        ("/api/fund/nav", "investor", 4),
+        ("/api/fund/history?limit=365", "investor", 2),
+        ("/api/fund/history/range?limit=500", "investor", 2),
+        ("/api/holdings/today", "investor", 2),
+    ],
+)
+def test_hot_endpoint_query_budget(tokens, path, role, max_queries):
+    _get(path, tokens[role], max_queries)
@@ -0,0 +1,60 @@
+"""
+The row endpoints skip ``response_model`` validation, so their bodies must
+match what FastAPI would have produced from the ORM objects.
+"""
+from datetime import date, datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from backend import crud, schemas
+from backend.utils import responses
+
+from .conftest import add_investor, auth_headers
+
+DAY = date(2024, 3, 1)
+
+
+def _encoded(schema, objects):
+    return jsonable_encoder([schema.from_orm(obj) for obj in objects])
+
+
+@pytest.fixture
+def admin_headers(db):
+    add_investor(db, "Alice", 300.0)
+    admin = add_investor(db, "Admin", 700.0, is_admin=True)
+    crud.update_holdings_and_nav(
+        db,
+        [
+            schemas.HoldingCreate(name="贵州茅台", symbol="600519.SH", quantity=1.0, market_value=600.0),
+            schemas.HoldingCreate(name="Cash-like", symbol=None, market_value=400.0),
+        ],
+        holdings_date=DAY,
+    )
+    return auth_headers(db, admin)
+
+
+def test_row_endpoints_match_the_pydantic_encoding(db, client, admin_headers):
+    cases = [
+        ("/api/fund/history", schemas.FundHistoryRead, crud.get_fund_history(db)),
+        (f"/api/holdings/by-date/{DAY}", schemas.HoldingRead, crud.get_holdings_by_date(db, DAY)),
+        ("/api/investors/", schemas.InvestorRead, crud.get_investors(db)),
+    ]
+    for path, schema, objects in cases:
+        response = client.get(path, headers=admin_headers)
+        assert response.status_code == 200, path
+        assert response.json() == _encoded(schema, objects), path
+
+    today = client.get("/api/holdings/today", headers=admin_headers).json()
+    assert today == jsonable_encoder(crud.get_latest_holdings(db))
+    me = client.get("/api/investors/me", headers=admin_headers).json()
+    assert me == _encoded(schemas.InvestorRead, [crud.get_investor_by_identifier(db, "admin")])[0]
+
+
+def test_stdlib_fallback_encodes_like_orjson(monkeypatch):
+    content = [
+        {"date": DAY, "at": datetime(2024, 3, 1, 9, 30, 5, 123000), "name": "贵州茅台", "nav": 1.25, "weight": None}
+    ]
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(content) == fast
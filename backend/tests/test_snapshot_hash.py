@@ -0,0 +1,58 @@
+from datetime import date
+
+from sqlalchemy import func, select
+
+from backend import crud, models, schemas
+
+from .conftest import add_investor
+
+DAY = date(2024, 3, 1)
+
+
+def _items(*rows):
+    return [schemas.HoldingCreate(**row) for row in rows]
+
+
+def test_hash_ignores_order_and_handles_missing_fields():
+    rows = (
+        {"name": "X", "symbol": "X", "quantity": None, "market_value": 500.0},
+        {"name": "X", "symbol": "X", "quantity": 5.0, "market_value": 600.0},
+        {"name": "Y", "symbol": None, "quantity": 5.0, "cost_price": None, "market_value": 1.0},
+    )
+    forward = crud._snapshot_hash(_items(*rows), DAY, 10.0, 100.0)
+    backward = crud._snapshot_hash(_items(*reversed(rows)), DAY, 10.0, 100.0)
+    assert forward == backward
+    assert forward != crud._snapshot_hash(_items(*rows), DAY, 11.0, 100.0)
+    assert forward != crud._snapshot_hash(_items(*rows), DAY, 10.0, 101.0)
+
+
+def test_duplicate_rows_with_none_fields_are_written(db):
+    add_investor(db, "Alice", 1000.0)
+    items = _items(
+        {"name": "X", "symbol": "X", "quantity": None, "market_value": 500.0},
+        {"name": "X", "symbol": "X", "quantity": 5.0, "market_value": 600.0},
+    )
+    summary = crud.update_holdings_and_nav(db, items, holdings_date=DAY)
+    assert summary.total_value == 1100.0
+    assert summary.nav == 1.1
+
+
+def test_unchanged_snapshot_is_not_rewritten(db):
+    add_investor(db, "Alice", 1000.0)
+    items = _items(
+        {"name": "A", "symbol": "000001.SZ", "quantity": 100.0, "market_value": 900.0},
+        {"name": "B", "symbol": "600000.SH", "quantity": None, "market_value": 100.0},
+    )
+    first = crud.update_holdings_and_nav(db, items, holdings_date=DAY)
+    history_id = db.execute(select(models.FundHistory.id)).scalar_one()
+    updated = db.execute(select(func.max(models.Holding.updated_at))).scalar_one()
+
+    again = crud.update_holdings_and_nav(db, list(reversed(items)), holdings_date=DAY)
+    assert again == first
+    assert db.execute(select(models.FundHistory.id)).scalar_one() == history_id
+    assert db.execute(select(func.max(models.Holding.updated_at))).scalar_one() == updated
+
+    changed = crud.update_holdings_and_nav(
+        db, _items({"name": "A", "symbol": "000001.SZ", "quantity": 100.0, "market_value": 1000.0}), holdings_date=DAY
+    )
+    assert changed.nav == 1.0
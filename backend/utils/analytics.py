@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import math
+import os
+from typing import TYPE_CHECKING, Mapping, Optional
+
+if TYPE_CHECKING:  # NumPy is imported on first use to keep API startup light.
+    import numpy as np
+
+TRADING_DAYS = 252
+ROLLING_WINDOW = int(os.getenv("ANALYTICS_ROLLING_WINDOW", "20"))
+RISK_FREE_RATE = float(os.getenv("ANALYTICS_RISK_FREE_RATE", "0.0"))
+# Daily returns needed before annualized return and Sharpe ratio are reported;
+# extrapolating a handful of days to a year gives meaningless figures.
+MIN_PERIODS = int(os.getenv("ANALYTICS_MIN_PERIODS", "20"))
+
+# Running statistics carried from one day's row to the next.
+STATE_FIELDS = (
+    "base_nav",
+    "peak_nav",
+    "max_drawdown",
+    "return_count",
+    "return_mean",
+    "return_m2",
+    "rolling_count",
+    "rolling_sum",
+    "rolling_sum_sq",
+)
+
+
+def _daily_return(previous_nav: float, nav: float) -> float:
+    # A zero NAV has no meaningful return; treat the day as flat.
+    return nav / previous_nav - 1 if previous_nav else 0.0
+
+
+def next_row(
+    previous: Optional[Mapping[str, float]],
+    nav: float,
+    dropped_return: Optional[float] = None,
+) -> dict:
+    """
+    Advance the running statistics by one trading day in O(1).
+
+    ``previous`` is the prior day's analytics row (``None`` for the first day) and
+    ``dropped_return`` is the daily return leaving the rolling window, if any.
+    Mean and variance use Welford's update; the rolling window keeps a running
+    sum and sum of squares.
+    """
+    if previous is None:
+        row = {
+            "nav": nav,
+            "daily_return": None,
+            "base_nav": nav,
+            "peak_nav": nav,
+            "max_drawdown": 0.0,
+            "return_count": 0,
+            "return_mean": 0.0,
+            "return_m2": 0.0,
+            "rolling_count": 0,
+            "rolling_sum": 0.0,
+            "rolling_sum_sq": 0.0,
+        }
+        return {**row, **derive(row)}
+
+    daily_return = _daily_return(previous["nav"], nav)
+    count = previous["return_count"] + 1
+    delta = daily_return - previous["return_mean"]
+    mean = previous["return_mean"] + delta / count
+    m2 = previous["return_m2"] + delta * (daily_return - mean)
+
+    rolling_count = previous["rolling_count"] + 1
+    rolling_sum = previous["rolling_sum"] + daily_return
+    rolling_sum_sq = previous["rolling_sum_sq"] + daily_return * daily_return
+    if rolling_count > ROLLING_WINDOW and dropped_return is not None:
+        rolling_count -= 1
+        rolling_sum -= dropped_return
+        rolling_sum_sq -= dropped_return * dropped_return
+
+    peak_nav = max(previous["peak_nav"], nav)
+    drawdown = nav / peak_nav - 1 if peak_nav else 0.0
+    row = {
+        "nav": nav,
+        "daily_return": daily_return,
+        "base_nav": previous["base_nav"],
+        "peak_nav": peak_nav,
+        "max_drawdown": min(previous["max_drawdown"], drawdown),
+        "return_count": count,
+        "return_mean": mean,
+        "return_m2": m2,
+        "rolling_count": rolling_count,
+        "rolling_sum": rolling_sum,
+        "rolling_sum_sq": rolling_sum_sq,
+    }
+    return {**row, **derive(row)}
+
+
+def derive(row: Mapping) -> dict:
+    """
+    Reporting metrics computed from the running statistics.
+
+    Works element-wise on NumPy arrays as well as on a single row of scalars;
+    undefined values (too few observations, zero variance) come back as ``None``
+    for scalars and ``NaN`` for arrays. Annualized return and Sharpe ratio
+    stay undefined until ``MIN_PERIODS`` daily returns exist.
+    """
+    import numpy as np
+
+    nav = np.asarray(row["nav"], dtype=np.float64)
+    base_nav = np.asarray(row["base_nav"], dtype=np.float64)
+    peak_nav = np.asarray(row["peak_nav"], dtype=np.float64)
+    count = np.asarray(row["return_count"], dtype=np.float64)
+    mean = np.asarray(row["return_mean"], dtype=np.float64)
+    m2 = np.asarray(row["return_m2"], dtype=np.float64)
+    rolling_count = np.asarray(row["rolling_count"], dtype=np.float64)
+    rolling_sum = np.asarray(row["rolling_sum"], dtype=np.float64)
+    rolling_sum_sq = np.asarray(row["rolling_sum_sq"], dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cumulative_return = np.where(base_nav > 0, nav / base_nav - 1, np.nan)
+        drawdown = np.where(peak_nav > 0, nav / peak_nav - 1, 0.0)
+
+        daily_std = np.sqrt(np.maximum(m2, 0.0) / (count - 1))
+        daily_std = np.where(count >= 2, daily_std, np.nan)
+        volatility = daily_std * math.sqrt(TRADING_DAYS)
+
+        rolling_var = (
+            rolling_sum_sq - rolling_sum * rolling_sum / rolling_count
+        ) / (rolling_count - 1)
+        rolling_volatility = np.where(
+            rolling_count >= 2,
+            np.sqrt(np.maximum(rolling_var, 0.0)) * math.sqrt(TRADING_DAYS),
+            np.nan,
+        )
+
+        growth = 1 + cumulative_return
+        annualized_return = np.where(
+            (count >= max(MIN_PERIODS, 1)) & (growth > 0),
+            np.power(growth, TRADING_DAYS / count) - 1,
+            np.nan,
+        )
+
+        excess = mean - RISK_FREE_RATE / TRADING_DAYS
+        sharpe_ratio = np.where(
+            (count >= MIN_PERIODS) & (daily_std > 0), excess / daily_std * math.sqrt(TRADING_DAYS), np.nan
+        )
+
+    derived = {
+        "cumulative_return": cumulative_return,
+        "drawdown": drawdown,
+        "volatility": volatility,
+        "rolling_volatility": rolling_volatility,
+        "annualized_return": annualized_return,
+        "sharpe_ratio": sharpe_ratio,
+    }
+    if nav.ndim == 0:
+        return {
+            key: (None if np.isnan(value) else float(value))
+            for key, value in derived.items()
+        }
+    return derived
+
+
+def rebuild_rows(navs: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Vectorized equivalent of folding ``next_row`` over a full NAV series.
+
+    Used to rebuild the analytics table after historical corrections.
+    """
+    import numpy as np
+
+    navs = np.asarray(navs, dtype=np.float64)
+    size = len(navs)
+    if size == 0:
+        return {}
+
+    returns = np.zeros(size)
+    previous = navs[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = np.where(previous != 0, navs[1:] / previous - 1, 0.0)
+
+    count = np.arange(size, dtype=np.int64)
+    cum_sum = np.cumsum(returns)
+    cum_sum_sq = np.cumsum(returns * returns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(count > 0, cum_sum / count, 0.0)
+        m2 = np.where(count > 0, cum_sum_sq - cum_sum * cum_sum / count, 0.0)
+
+    window = ROLLING_WINDOW
+    rolling_count = np.minimum(count, window)
+    rolling_sum = cum_sum.copy()
+    rolling_sum_sq = cum_sum_sq.copy()
+    if size > window:
+        rolling_sum[window:] -= cum_sum[:-window]
+        rolling_sum_sq[window:] -= cum_sum_sq[:-window]
+
+    peak_nav = np.maximum.accumulate(navs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak_nav > 0, navs / peak_nav - 1, 0.0)
+    max_drawdown = np.minimum.accumulate(drawdown)
+
+    daily_return = returns.astype(object)
+    daily_return[0] = None
+    rows = {
+        "nav": navs,
+        "daily_return": daily_return,
+        "base_nav": np.full(size, navs[0]),
+        "peak_nav": peak_nav,
+        "max_drawdown": max_drawdown,
+        "return_count": count,
+        "return_mean": mean,
+        "return_m2": m2,
+        "rolling_count": rolling_count,
+        "rolling_sum": rolling_sum,
+        "rolling_sum_sq": rolling_sum_sq,
+    }
+    rows.update(derive(rows))
+    return rows
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+ARCHIVE_FORMAT_VERSION = 1
+RETENTION_DAYS = int(os.getenv("HOLDINGS_RETENTION_DAYS", "365"))
+
+# Columns kept for each archived holding, matching ``schemas.HoldingRead``.
+NUMERIC_COLUMNS = ("quantity", "cost_price", "market_value", "weight")
+STRING_COLUMNS = ("name", "symbol")
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+
+def encode_rows(rows: Iterable[dict]) -> bytes:
+    """
+    Pack holding rows into a zlib-compressed columnar JSON blob.
+
+    Dates are stored as ordinals, and names/symbols are dictionary-encoded since
+    the same positions repeat on every trading day of a month.
+    """
+    rows = list(rows)
+    dictionary: dict[Optional[str], int] = {}
+
+    def code(value: Optional[str]) -> int:
+        if value not in dictionary:
+            dictionary[value] = len(dictionary)
+        return dictionary[value]
+
+    columns: dict[str, list] = {
+        "id": [row["id"] for row in rows],
+        "date": [row["date"].toordinal() for row in rows],
+    }
+    for column in STRING_COLUMNS:
+        columns[column] = [code(row[column]) for row in rows]
+    for column in NUMERIC_COLUMNS:
+        columns[column] = [row[column] for row in rows]
+    for column in TIMESTAMP_COLUMNS:
+        columns[column] = [
+            row[column].isoformat() if row[column] is not None else None for row in rows
+        ]
+
+    payload = {
+        "version": ARCHIVE_FORMAT_VERSION,
+        "dictionary": list(dictionary),
+        "columns": columns,
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def decode_rows(blob: bytes) -> List[dict]:
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    if payload.get("version") != ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported holdings archive version: {payload.get('version')}")
+
+    dictionary = payload["dictionary"]
+    columns = payload["columns"]
+    dates = [date.fromordinal(value) for value in columns["date"]]
+    decoded: dict[str, list] = {"id": columns["id"], "date": dates}
+    for column in STRING_COLUMNS:
+        decoded[column] = [dictionary[index] for index in columns[column]]
+    for column in NUMERIC_COLUMNS:
+        decoded[column] = columns[column]
+    for column in TIMESTAMP_COLUMNS:
+        decoded[column] = [
+            datetime.fromisoformat(value) if value is not None else None
+            for value in columns[column]
+        ]
+
+    names = list(decoded)
+    return [dict(zip(names, values)) for values in zip(*decoded.values())]
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
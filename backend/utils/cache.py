@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from .metrics import CACHE_REQUESTS
+
+T = TypeVar("T")
+
+_version_lock = threading.Lock()
+_data_version = 0
+_fund_versions: dict[int, int] = {}
+
+
+def data_version(fund_id: Optional[int] = None) -> Hashable:
+    """
+    Return the current data version, of one fund if ``fund_id`` is given.
+
+    The version is bumped by ``crud`` whenever holdings, NAV, cash or investor data
+    is committed, so cached read results keyed on it never outlive the data. A
+    fund's version combines the global counter with the fund's own, so a write
+    to one fund leaves the cached reads of every other fund valid.
+    """
+    if fund_id is None:
+        return _data_version
+    return (_data_version, _fund_versions.get(fund_id, 0))
+
+
+def bump_data_version(fund_id: Optional[int] = None) -> int:
+    """Invalidate cached reads of one fund, or of every fund when ``fund_id`` is None."""
+    global _data_version
+    with _version_lock:
+        if fund_id is None:
+            _data_version += 1
+            return _data_version
+        _fund_versions[fund_id] = _fund_versions.get(fund_id, 0) + 1
+        return _fund_versions[fund_id]
+
+
+class VersionedCache:
+    """
+    Small thread-safe LRU cache whose entries are scoped to the data version.
+
+    Entries written under an older version are never returned; they simply age
+    out of the LRU as new versions fill the cache. Entries computed with a
+    ``fund_id`` are only invalidated by writes to that fund.
+    """
+
+    def __init__(self, maxsize: int = 128, name: str = "default") -> None:
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = CACHE_REQUESTS.labels(name, "hit")
+        self._miss_counter = CACHE_REQUESTS.labels(name, "miss")
+        self._entries: OrderedDict[tuple[Hashable, Hashable], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self, key: Hashable, factory: Callable[[], T], fund_id: Optional[int] = None
+    ) -> T:
+        versioned_key = (data_version(fund_id), key)
+        with self._lock:
+            if versioned_key in self._entries:
+                self._entries.move_to_end(versioned_key)
+                self.hits += 1
+                self._hit_counter.inc()
+                return self._entries[versioned_key]
+            self.misses += 1
+            self._miss_counter.inc()
+
+        value = factory()
+        with self._lock:
+            self._entries[versioned_key] = value
+            self._entries.move_to_end(versioned_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select ``threshold`` indices with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Each intermediate bucket keeps the
+    point forming the largest triangle with the previously selected point and the
+    mean of the next bucket, which preserves peaks and troughs of the series.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = size - 1
+
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start = stop
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+
+        bucket_x = x[start:stop]
+        bucket_y = y[start:stop]
+        area = np.abs(
+            (x[selected] - avg_x) * (bucket_y - y[selected])
+            - (x[selected] - bucket_x) * (avg_y - y[selected])
+        )
+        selected = int(start + area.argmax())
+        indices[bucket + 1] = selected
+
+    return indices
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from loguru import logger
+
+from .cache import bump_data_version
+from .metrics import ERRORS
+
+# "database" relays events between workers through the fund_events table;
+# "local" keeps them inside this process (single worker or tests).
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "database")
+POLL_INTERVAL_SECONDS = float(os.getenv("EVENTS_POLL_INTERVAL_SECONDS", "1"))
+RETENTION_SECONDS = int(os.getenv("EVENTS_RETENTION_SECONDS", "3600"))
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+
+
+class Subscription:
+    """Bounded queue of events for one connection; the oldest event is dropped on overflow."""
+
+    def __init__(self, bus: "EventBus", maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.bus = bus
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def deliver(self, event: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for change notifications.
+
+    ``publish`` may be called from any thread (request handlers, scheduler,
+    job executor callbacks); delivery to subscribers happens on the event loop
+    passed to ``start``. With the database backend every published event is also
+    written to ``fund_events`` and each worker polls that table for events from
+    other processes, delivering them locally and bumping its data version so
+    cached reads are invalidated everywhere.
+    """
+
+    def __init__(self, backend: str = EVENTS_BACKEND) -> None:
+        self.backend = backend
+        self.origin = uuid.uuid4().hex
+        self._subscribers: set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._last_id: Optional[int] = None
+        self._last_prune = datetime.min
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, payload: Optional[dict[str, Any]] = None) -> None:
+        """Send an event to local subscribers and, with the database backend, to other workers."""
+        event = {
+            "type": event_type,
+            "data": payload or {},
+            "at": datetime.utcnow().isoformat(),
+        }
+        if self.backend == "database":
+            try:
+                event["id"] = self._store(event)
+            except Exception:
+                ERRORS.labels("events").inc()
+                logger.exception("Failed to relay event {}.", event_type)
+        self._schedule(event)
+
+    def _schedule(self, event: dict) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(event)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event: dict) -> None:
+        for subscription in list(self._subscribers):
+            subscription.deliver(event)
+
+    def _store(self, event: dict) -> int:
+        from sqlalchemy import insert
+
+        from .. import models
+        from ..database import engine
+
+        with engine.begin() as connection:
+            result = connection.execute(
+                insert(models.FundEvent).values(
+                    origin=self.origin,
+                    type=event["type"],
+                    payload=json.dumps(event["data"], default=str, ensure_ascii=False),
+                    created_at=datetime.utcnow(),
+                )
+            )
+            return result.inserted_primary_key[0]
+
+    def _fetch_remote(self) -> list[dict]:
+        from sqlalchemy import delete, func, select
+
+        from .. import models
+        from ..database import engine
+
+        with engine.begin() as connection:
+            if self._last_id is None:
+                # Start from the current end of the log; history is not replayed.
+                self._last_id = connection.execute(select(func.max(models.FundEvent.id))).scalar() or 0
+                return []
+            rows = connection.execute(
+                select(models.FundEvent)
+                .where(models.FundEvent.id > self._last_id)
+                .order_by(models.FundEvent.id)
+            ).all()
+            if rows:
+                self._last_id = rows[-1].id
+
+            now = datetime.utcnow()
+            if now - self._last_prune > timedelta(seconds=60):
+                self._last_prune = now
+                cutoff = now - timedelta(seconds=RETENTION_SECONDS)
+                connection.execute(delete(models.FundEvent).where(models.FundEvent.created_at < cutoff))
+
+        return [
+            {
+                "id": row.id,
+                "type": row.type,
+                "data": json.loads(row.payload),
+                "at": row.created_at.isoformat(),
+            }
+            for row in rows
+            if row.origin != self.origin
+        ]
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                events = await asyncio.to_thread(self._fetch_remote)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                ERRORS.labels("events").inc()
+                logger.exception("Polling fund events failed.")
+                events = []
+            if events:
+                # Another worker committed changes; drop this worker's cached reads of
+                # the funds they touched (events without a fund drop everything).
+                for fund_id in {event["data"].get("fund_id") for event in events}:
+                    bump_data_version(fund_id)
+                for event in events:
+                    self._dispatch(event)
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Bind to the running event loop and start relaying remote events."""
+        self._loop = loop or asyncio.get_running_loop()
+        if self.backend == "database" and self._poller is None:
+            self._poller = self._loop.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        self._loop = None
+
+
+event_bus = EventBus()
+
+
+def publish(event_type: str, payload: Optional[dict[str, Any]] = None) -> None:
+    event_bus.publish(event_type, payload)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+# Jobs running at the same time across all job kinds; also the most workers
+# kept per job kind.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "1800"))
+# Per-kind limits such as "nav=1,archival=1,ocr=2"; unlisted kinds get 1. A
+# fund-scoped kind ("nav:2") has its own slots with the limit of its base kind.
+JOB_CONCURRENCY = os.getenv("JOB_CONCURRENCY", "nav=1,archival=1,backfill=1,ocr=2")
+
+STATUS_HISTORY = 200
+# How long a worker gets to exit on its own at shutdown before it is killed.
+WORKER_EXIT_SECONDS = 5.0
+
+
+class JobSkipped(Exception):
+    """Raised by a job body to record the run as skipped rather than failed."""
+
+
+class JobTimeout(RuntimeError):
+    pass
+
+
+class JobFailed(RuntimeError):
+    pass
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        kind, value = part.split("=", 1)
+        limits[kind.strip()] = max(1, int(value))
+    return limits
+
+
+def fund_kind(kind: str, fund_id: int) -> str:
+    """Job kind whose concurrency slots are separate for every fund."""
+    return f"{kind}:{fund_id}"
+
+
+@dataclass
+class JobStatus:
+    id: str
+    kind: str
+    task: str
+    state: str = "queued"  # queued / running / success / skipped / failed / timeout
+    pid: Optional[int] = None  # worker process running the job
+    submitted_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    message: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _worker_main(task: Callable[..., Any], args: tuple, kwargs: dict) -> tuple[str, Any]:
+    # The API process bumps data versions on writes, not the workers, so cached
+    # reads left over from an earlier job are invalidated first.
+    from .cache import bump_data_version
+
+    bump_data_version()
+    try:
+        return "success", task(*args, **kwargs)
+    except JobSkipped as exc:
+        return "skipped", str(exc)
+    except BaseException as exc:  # noqa: BLE001 - report everything to the parent
+        return "failed", f"{type(exc).__name__}: {exc}"
+
+
+def _worker_loop(connection) -> None:
+    # Body of a long-lived worker process with its own engine and DB pool: run
+    # the jobs sent over ``connection`` until the parent closes it.
+    while True:
+        try:
+            task, args, kwargs = connection.recv()
+        except (EOFError, OSError):
+            return
+        except Exception as exc:  # noqa: BLE001 - e.g. a task this process cannot import
+            result = "failed", f"{type(exc).__name__}: {exc}"
+        else:
+            result = _worker_main(task, args, kwargs)
+        try:
+            connection.send(result)
+        except (EOFError, OSError):
+            return
+        except Exception as exc:  # noqa: BLE001 - a result that does not pickle
+            connection.send(("failed", f"{type(exc).__name__}: {exc}"))
+
+
+class _Worker:
+    """
+    One spawned worker process and the pipe jobs are handed to it over.
+
+    Workers are daemonic, so they never outlive the API process; job bodies
+    therefore cannot start processes of their own.
+    """
+
+    def __init__(self, context) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def call(self, task: Callable[..., Any], args: tuple, kwargs: dict, timeout: float) -> tuple[str, Any]:
+        """
+        Run one job and return its ``(state, payload)``.
+
+        A job still running after ``timeout`` seconds is stopped by killing this
+        worker; a killed or crashed worker is not ``alive`` afterwards.
+        """
+        try:
+            self.connection.send((task, args, kwargs))
+        except (EOFError, OSError) as exc:
+            self.kill()
+            return "failed", f"worker exited: {exc}"
+        except Exception as exc:  # noqa: BLE001 - e.g. arguments that do not pickle
+            return "failed", f"{type(exc).__name__}: {exc}"
+        try:
+            if not self.connection.poll(timeout):
+                self.kill()
+                return "timeout", f"killed after {timeout:g}s"
+            return self.connection.recv()
+        except (EOFError, OSError):
+            # The worker crashed, or was killed by ``shutdown``.
+            self.kill()
+            return "failed", f"worker exited with code {self.process.exitcode}"
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def close(self) -> None:
+        """Let the worker exit after its current job, killing it if it does not."""
+        self.connection.close()
+        self.process.join(WORKER_EXIT_SECONDS)
+        if self.process.is_alive():
+            self.kill()
+
+
+class JobExecutor:
+    """
+    Run heavy jobs in separate processes, outside the API's GIL and DB pool.
+
+    Workers are long-lived and kept per base job kind ("ocr", "nav", ...), so
+    imports, DB connections and loaded models (the OCR engine) are paid once
+    per worker rather than once per job. Each worker runs one job at a time. A
+    job that times out is stopped by killing only the worker running it; jobs
+    on other workers, of any kind or fund, carry on. ``max_workers`` bounds
+    concurrent jobs overall and ``limits`` bounds them per job kind (per fund
+    for kinds built with ``fund_kind``); callers block until a slot is free.
+    Recent job states are kept in memory for the status endpoint.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = JOB_WORKERS,
+        limits: Optional[dict[str, int]] = None,
+        default_timeout: float = JOB_TIMEOUT_SECONDS,
+    ) -> None:
+        self.default_timeout = default_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = threading.BoundedSemaphore(max(1, max_workers))
+        self._idle: dict[str, list[_Worker]] = {}
+        self._busy: set[_Worker] = set()
+        self._limits = limits if limits is not None else parse_limits(JOB_CONCURRENCY)
+        self._kind_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._statuses: OrderedDict[str, JobStatus] = OrderedDict()
+
+    def _kind_slot(self, kind: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if kind not in self._kind_slots:
+                limit = self._limits.get(kind.split(":", 1)[0], 1)
+                self._kind_slots[kind] = threading.BoundedSemaphore(limit)
+            return self._kind_slots[kind]
+
+    def _checkout(self, base: str) -> _Worker:
+        """An idle worker of ``base`` kind, or a new one."""
+        dead = []
+        with self._lock:
+            idle = self._idle.get(base, [])
+            worker = None
+            while idle:
+                candidate = idle.pop()
+                if candidate.alive:
+                    worker = candidate
+                    break
+                dead.append(candidate)
+        for candidate in dead:
+            candidate.kill()
+        if worker is None:
+            worker = _Worker(self._context)
+        with self._lock:
+            self._busy.add(worker)
+        return worker
+
+    def _checkin(self, base: str, worker: _Worker) -> None:
+        with self._lock:
+            self._busy.discard(worker)
+            if worker.alive:
+                self._idle.setdefault(base, []).append(worker)
+
+    def shutdown(self) -> None:
+        """Stop every worker; jobs still running are killed."""
+        with self._lock:
+            idle = [worker for workers in self._idle.values() for worker in workers]
+            busy = list(self._busy)
+            self._idle.clear()
+        for worker in busy:
+            worker.kill()
+        for worker in idle:
+            worker.close()
+
+    def _track(self, status: JobStatus) -> None:
+        with self._lock:
+            self._statuses[status.id] = status
+            while len(self._statuses) > STATUS_HISTORY:
+                self._statuses.popitem(last=False)
+
+    def statuses(self, active_only: bool = False) -> list[JobStatus]:
+        with self._lock:
+            statuses = list(reversed(self._statuses.values()))
+        if active_only:
+            return [status for status in statuses if status.state in ("queued", "running")]
+        return statuses
+
+    def run(
+        self,
+        kind: str,
+        task: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run ``task(*args, **kwargs)`` in a worker process and return its result.
+
+        ``task`` must be a module-level function (it is pickled by reference).
+        Raises ``JobSkipped`` if the task skipped itself, ``JobTimeout`` if it
+        ran past ``timeout`` seconds and was killed, and ``JobFailed`` otherwise.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        status = JobStatus(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            task=f"{task.__module__}.{task.__qualname__}",
+        )
+        self._track(status)
+
+        base = kind.split(":", 1)[0]
+        with self._kind_slot(kind), self._workers:
+            worker = self._checkout(base)
+            status.pid = worker.pid
+            status.started_at = datetime.utcnow()
+            status.state = "running"
+            try:
+                state, payload = worker.call(task, args, kwargs, timeout)
+            finally:
+                status.finished_at = datetime.utcnow()
+                self._checkin(base, worker)
+
+        status.state = state
+        if state == "success":
+            status.message = payload if isinstance(payload, str) else None
+            return payload
+        status.message = payload
+        logger.warning("Job {} ({}) ended with {}: {}", status.id, kind, state, payload)
+        if state == "skipped":
+            raise JobSkipped(payload)
+        if state == "timeout":
+            raise JobTimeout(payload)
+        raise JobFailed(payload)
+
+
+executor = JobExecutor()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import csv
+import io
+from typing import Iterable, Iterator, Sequence
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+def csv_stream(
+    columns: Sequence[tuple[str, str]], chunks: Iterable[Sequence[Sequence]]
+) -> Iterator[bytes]:
+    """
+    Encode row chunks as CSV, yielding one encoded block per chunk.
+
+    A UTF-8 byte order mark is emitted first so spreadsheet tools pick the right
+    encoding for Chinese position names.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow([name for name, _ in columns])
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the generator."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def parquet_stream(
+    columns: Sequence[tuple[str, str]], chunks: Iterable[Sequence[Sequence]]
+) -> Iterator[bytes]:
+    """
+    Encode row chunks as a Parquet file, one row group per chunk.
+
+    Requires ``pyarrow``; raises ``RuntimeError`` before any bytes are produced
+    when it is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("pyarrow is not installed. Install it to enable Parquet exports.") from exc
+
+    types = {
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us"),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "str": pa.string(),
+    }
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+
+    def generate() -> Iterator[bytes]:
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        try:
+            for chunk in chunks:
+                arrays = [
+                    pa.array([row[index] for row in chunk], type=field.type)
+                    for index, field in enumerate(schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        data = sink.drain()
+        if data:
+            yield data
+
+    return generate()
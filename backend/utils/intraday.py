@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date, datetime, time, timezone
+from typing import TYPE_CHECKING, Optional
+from zoneinfo import ZoneInfo
+
+if TYPE_CHECKING:  # NumPy is imported on first use to keep API startup light.
+    import numpy as np
+
+INTRADAY_ENABLED = os.getenv("INTRADAY_ENABLED", "false").lower() in ("1", "true", "yes")
+INTERVAL_SECONDS = int(os.getenv("INTRADAY_INTERVAL_SECONDS", "60"))
+BUFFER_SIZE = int(os.getenv("INTRADAY_BUFFER_SIZE", "1024"))
+COMPACT_BUCKET_SECONDS = int(os.getenv("INTRADAY_COMPACT_BUCKET_SECONDS", "300"))
+
+# A-share continuous trading sessions, in the scheduler's timezone.
+TRADING_SESSIONS = ((time(9, 30), time(11, 30)), (time(13, 0), time(15, 0)))
+
+FIELDS = ("timestamp", "nav", "total_value", "holdings_value")
+
+TIMEZONE = ZoneInfo(os.getenv("SCHEDULER_TIMEZONE", "Asia/Shanghai"))
+
+
+def trading_date(timestamp: float) -> date:
+    """Exchange-local date of a POSIX timestamp."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).astimezone(TIMEZONE).date()
+
+
+def in_trading_session(moment: datetime) -> bool:
+    if moment.weekday() >= 5:
+        return False
+    current = moment.time()
+    return any(start <= current <= end for start, end in TRADING_SESSIONS)
+
+
+def estimate_nav(
+    quantities: np.ndarray,
+    prices: np.ndarray,
+    fallback_values: np.ndarray,
+    cash: float,
+    total_shares: float,
+) -> tuple[float, float, float]:
+    """
+    Revalue a holdings snapshot at live prices.
+
+    Positions without a quantity or a quote keep their snapshot market value.
+    Returns ``(nav, total_value, holdings_value)``.
+    """
+    import numpy as np
+
+    quantities = np.asarray(quantities, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    fallback_values = np.asarray(fallback_values, dtype=np.float64)
+    live = ~(np.isnan(quantities) | np.isnan(prices))
+    values = np.where(live, np.nan_to_num(quantities) * np.nan_to_num(prices), fallback_values)
+    holdings_value = float(values.sum())
+    total_value = holdings_value + cash
+    nav = total_value / total_shares if total_shares > 0 else 0.0
+    return nav, total_value, holdings_value
+
+
+class RingBuffer:
+    """
+    Fixed-size, array-backed buffer of intraday points; the oldest point is
+    overwritten once ``capacity`` is reached.
+
+    ``compact`` hands back points that have not been persisted yet, reduced to
+    the last point of every ``bucket_seconds`` bucket. Storage is allocated
+    on the first ``append``.
+    """
+
+    def __init__(self, capacity: int = BUFFER_SIZE) -> None:
+        self.capacity = capacity
+        self._data: Optional[np.ndarray] = None
+        self._start = 0
+        self._size = 0
+        self._compacted_until = float("-inf")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, nav: float, total_value: float, holdings_value: float) -> None:
+        with self._lock:
+            if self._data is None:
+                import numpy as np
+
+                self._data = np.full((self.capacity, len(FIELDS)), np.nan)
+            index = (self._start + self._size) % self.capacity
+            self._data[index] = (timestamp, nav, total_value, holdings_value)
+            if self._size < self.capacity:
+                self._size += 1
+            else:
+                self._start = (self._start + 1) % self.capacity
+
+    def _ordered(self) -> np.ndarray:
+        import numpy as np
+
+        if self._data is None:
+            return np.empty((0, len(FIELDS)))
+        indices = (self._start + np.arange(self._size)) % self.capacity
+        return self._data[indices].copy()
+
+    def points(self, since: Optional[float] = None) -> np.ndarray:
+        """Points in chronological order as an ``(n, 4)`` array of ``FIELDS``."""
+        with self._lock:
+            data = self._ordered()
+        if since is not None:
+            data = data[data[:, 0] >= since]
+        return data
+
+    def compact(self, bucket_seconds: int = COMPACT_BUCKET_SECONDS, final: bool = False) -> np.ndarray:
+        """
+        Points to persist: the last one per closed bucket since the previous call.
+
+        The bucket still being filled is held back unless ``final`` is set.
+        """
+        with self._lock:
+            data = self._ordered()
+            data = data[data[:, 0] > self._compacted_until]
+            if len(data) == 0:
+                return data
+            import numpy as np
+
+            buckets = np.floor(data[:, 0] / bucket_seconds)
+            last_in_bucket = np.ones(len(data), dtype=bool)
+            last_in_bucket[:-1] = buckets[1:] != buckets[:-1]
+            if not final:
+                last_in_bucket &= buckets < buckets[-1]
+            selected = data[last_in_bucket]
+            if len(selected):
+                self._compacted_until = (
+                    data[-1, 0] if final else (buckets[-1] * bucket_seconds) - 1e-9
+                )
+            return selected
+
+    def clear(self) -> None:
+        with self._lock:
+            self._start = 0
+            self._size = 0
+            self._compacted_until = float("-inf")
+
+
+_buffers: dict[int, RingBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def buffer_for(fund_id: int) -> RingBuffer:
+    """The ring buffer holding one fund's intraday points in this process."""
+    with _buffers_lock:
+        buffer = _buffers.get(fund_id)
+        if buffer is None:
+            buffer = _buffers[fund_id] = RingBuffer()
+        return buffer
+
+
+def buffers() -> dict[int, RingBuffer]:
+    with _buffers_lock:
+        return dict(_buffers)
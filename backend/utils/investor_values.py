@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def value_series(
+    nav_dates: np.ndarray,
+    navs: np.ndarray,
+    investor_ids: np.ndarray,
+    ledger_dates: np.ndarray,
+    share_deltas: np.ndarray,
+    amounts: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Join share-ledger balances against the NAV series for every investor at once.
+
+    Dates are ordinal integers and ``nav_dates`` must be sorted ascending. Each
+    ledger entry opens a segment that lasts until the investor's next entry; the
+    segments are mapped onto NAV indices with ``searchsorted`` and expanded with
+    ``repeat``, so the cost is linear in the number of rows produced.
+
+    Returns long-format columns ``investor_id``, ``date``, ``shares``,
+    ``invested``, ``value`` and ``pnl``.
+    """
+    nav_dates = np.asarray(nav_dates, dtype=np.int64)
+    navs = np.asarray(navs, dtype=np.float64)
+    investor_ids = np.asarray(investor_ids, dtype=np.int64)
+    ledger_dates = np.asarray(ledger_dates, dtype=np.int64)
+    share_deltas = np.asarray(share_deltas, dtype=np.float64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    if len(nav_dates) == 0 or len(investor_ids) == 0:
+        empty_int = np.empty(0, dtype=np.int64)
+        empty_float = np.empty(0, dtype=np.float64)
+        return {
+            "investor_id": empty_int,
+            "date": empty_int,
+            "shares": empty_float,
+            "invested": empty_float,
+            "value": empty_float,
+            "pnl": empty_float,
+        }
+
+    order = np.lexsort((ledger_dates, investor_ids))
+    investors = investor_ids[order]
+    dates = ledger_dates[order]
+    shares = _grouped_cumsum(investors, share_deltas[order])
+    invested = _grouped_cumsum(investors, amounts[order])
+
+    # Several entries on one day collapse into the balance after the last one.
+    last_of_day = np.ones(len(investors), dtype=bool)
+    last_of_day[:-1] = (investors[1:] != investors[:-1]) | (dates[1:] != dates[:-1])
+    investors = investors[last_of_day]
+    dates = dates[last_of_day]
+    shares = shares[last_of_day]
+    invested = invested[last_of_day]
+
+    same_investor_next = np.zeros(len(investors), dtype=bool)
+    same_investor_next[:-1] = investors[1:] == investors[:-1]
+    segment_end = np.full(len(investors), np.iinfo(np.int64).max)
+    segment_end[:-1] = np.where(same_investor_next[:-1], dates[1:], segment_end[:-1])
+
+    start = np.searchsorted(nav_dates, dates, side="left")
+    stop = np.searchsorted(nav_dates, segment_end, side="left")
+    lengths = np.maximum(stop - start, 0)
+
+    segment = np.repeat(np.arange(len(investors)), lengths)
+    offsets = np.arange(len(segment)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = start[segment] + offsets
+
+    row_shares = shares[segment]
+    row_invested = invested[segment]
+    row_value = row_shares * navs[positions]
+    return {
+        "investor_id": investors[segment],
+        "date": nav_dates[positions],
+        "shares": row_shares,
+        "invested": row_invested,
+        "value": row_value,
+        "pnl": row_value - row_invested,
+    }
+
+
+def _grouped_cumsum(groups: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Cumulative sum of ``values`` restarting at each new value of sorted ``groups``."""
+    totals = np.cumsum(values)
+    if len(values) == 0:
+        return totals
+    group_start = np.ones(len(groups), dtype=bool)
+    group_start[1:] = groups[1:] != groups[:-1]
+    group_index = np.cumsum(group_start) - 1
+    before_group = (totals - values)[group_start]
+    return totals - before_group[group_index]
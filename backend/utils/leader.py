@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from loguru import logger
+from sqlalchemy import delete, insert, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+HEARTBEAT_SECONDS = float(os.getenv("SCHEDULER_HEARTBEAT_SECONDS", "10"))
+LEASE_SECONDS = float(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderElector:
+    """
+    Elect one process among the API workers to run scheduled jobs.
+
+    On PostgreSQL the leader holds a session-level advisory lock on a dedicated
+    connection; the server drops the lock when that connection dies. Elsewhere
+    (SQLite) the leader owns a row in ``scheduler_leases`` and renews its
+    ``expires_at`` every heartbeat; any process may take the row over once the
+    lease has expired. Either way a dead leader is replaced within roughly
+    ``lease_seconds + heartbeat_seconds``.
+
+    ``on_elected`` and ``on_demoted`` are called from the election thread when
+    leadership changes hands.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        name: str = "scheduler",
+        on_elected: Optional[Callable[[], None]] = None,
+        on_demoted: Optional[Callable[[], None]] = None,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS,
+        lease_seconds: float = LEASE_SECONDS,
+        owner: Optional[str] = None,
+    ) -> None:
+        if lease_seconds <= heartbeat_seconds:
+            raise ValueError("The lease must be longer than the heartbeat interval.")
+        self.engine = engine
+        self.name = name
+        self.owner = owner or default_owner()
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lease_seconds = lease_seconds
+        self.use_advisory_lock = engine.dialect.name == "postgresql"
+        self._lock_key = zlib.crc32(f"turtle:{name}".encode("utf-8"))
+        self._lock_connection: Optional[Connection] = None
+        self._lease_expires_at: Optional[datetime] = None
+        self._leader = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """
+        Whether this process may run jobs right now.
+
+        With a lease row this also requires the lease to be unexpired locally, so
+        a leader whose heartbeat stalled stops acting before another can take over.
+        """
+        if not self._leader:
+            return False
+        if self.use_advisory_lock:
+            return True
+        return self._lease_expires_at is not None and datetime.utcnow() < self._lease_expires_at
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop campaigning and give up leadership so another process takes over at once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.heartbeat_seconds + 5)
+            self._thread = None
+        self._release()
+
+    def campaign(self) -> bool:
+        """Run one acquire/renew round and return whether this process is the leader."""
+        try:
+            held = self._try_advisory_lock() if self.use_advisory_lock else self._try_lease()
+        except SQLAlchemyError:
+            logger.exception("Leader election round for '{}' failed.", self.name)
+            held = False
+        self._set_leader(held)
+        return held
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.campaign()
+            self._stop.wait(self.heartbeat_seconds)
+
+    def _set_leader(self, held: bool) -> None:
+        if held == self._leader:
+            return
+        self._leader = held
+        if held:
+            logger.info("{} elected leader for '{}'.", self.owner, self.name)
+            callback = self.on_elected
+        else:
+            logger.warning("{} is no longer leader for '{}'.", self.owner, self.name)
+            callback = self.on_demoted
+        if callback is not None:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Leader callback for '{}' failed.", self.name)
+
+    def _try_advisory_lock(self) -> bool:
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.execute(text("SELECT 1"))
+                return True
+            except SQLAlchemyError:
+                # The server released the lock together with the connection.
+                self._close_lock_connection(invalidate=True)
+                return False
+
+        connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self._lock_key}
+            ).scalar()
+        except SQLAlchemyError:
+            connection.close()
+            raise
+        if acquired:
+            self._lock_connection = connection
+            return True
+        connection.close()
+        return False
+
+    def _try_lease(self) -> bool:
+        from ..models import SchedulerLease
+
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        values = {"owner": self.owner, "heartbeat_at": now, "expires_at": expires_at}
+        if not self._leader:
+            values["acquired_at"] = now
+        with self.engine.begin() as connection:
+            renewed = connection.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name)
+                .where(
+                    (SchedulerLease.owner == self.owner)
+                    | (SchedulerLease.expires_at < now)
+                )
+                .values(**values)
+            ).rowcount
+        if renewed:
+            self._lease_expires_at = expires_at
+            return True
+
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    insert(SchedulerLease).values(
+                        name=self.name,
+                        owner=self.owner,
+                        acquired_at=now,
+                        heartbeat_at=now,
+                        expires_at=expires_at,
+                    )
+                )
+        except IntegrityError:
+            # Another process holds an unexpired lease.
+            self._lease_expires_at = None
+            return False
+        self._lease_expires_at = expires_at
+        return True
+
+    def _release(self) -> None:
+        was_leader = self._leader
+        try:
+            if self.use_advisory_lock:
+                if self._lock_connection is not None:
+                    self._lock_connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": self._lock_key}
+                    )
+                    self._close_lock_connection()
+            elif was_leader:
+                from ..models import SchedulerLease
+
+                with self.engine.begin() as connection:
+                    connection.execute(
+                        delete(SchedulerLease)
+                        .where(SchedulerLease.name == self.name)
+                        .where(SchedulerLease.owner == self.owner)
+                    )
+        except SQLAlchemyError:
+            logger.exception("Releasing leadership for '{}' failed.", self.name)
+        self._lease_expires_at = None
+        self._set_leader(False)
+
+    def _close_lock_connection(self, invalidate: bool = False) -> None:
+        connection, self._lock_connection = self._lock_connection, None
+        if connection is None:
+            return
+        if invalidate:
+            connection.invalidate()
+        connection.close()
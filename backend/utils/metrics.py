@@ -0,0 +1,163 @@
+"""
+Prometheus metrics for the API process, job children and scheduler.
+
+Metrics are module-level so instrumentation costs one label lookup and one
+observation. With several uvicorn workers, or to include timings recorded in
+``JobExecutor`` child processes (OCR stages, NAV phases of scheduled refreshes),
+set ``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable directory before the
+server starts; every process then writes its samples there and ``/metrics``
+aggregates them.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Request latency buckets in seconds; job and OCR stages get longer tails.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0, 1800.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "fund_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route"),
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter(
+    "fund_http_requests_total",
+    "HTTP responses by route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_EXCEPTIONS = Counter(
+    "fund_http_exceptions_total",
+    "Requests that raised an unhandled exception.",
+    ("method", "route"),
+)
+
+OCR_STAGE_SECONDS = Histogram(
+    "fund_ocr_stage_duration_seconds",
+    "Screenshot OCR time per stage (model_load, preprocess, recognize, parse).",
+    ("stage",),
+    buckets=SLOW_BUCKETS,
+)
+TUSHARE_REQUEST_SECONDS = Histogram(
+    "fund_tushare_request_duration_seconds",
+    "Tushare API call latency.",
+    ("endpoint",),
+    buckets=SLOW_BUCKETS,
+)
+NAV_UPDATE_SECONDS = Histogram(
+    "fund_nav_update_duration_seconds",
+    "update_holdings_and_nav time per phase; phase=\"total\" is the whole call.",
+    ("phase",),
+    buckets=LATENCY_BUCKETS,
+)
+BCRYPT_SECONDS = Histogram(
+    "fund_bcrypt_duration_seconds",
+    "Password hashing and verification time.",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+JOB_SECONDS = Histogram(
+    "fund_job_duration_seconds",
+    "Scheduled, catch-up and manual job run time by outcome.",
+    ("job", "status"),
+    buckets=SLOW_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "fund_cache_requests_total",
+    "VersionedCache lookups by cache and result (hit/miss).",
+    ("cache", "result"),
+)
+ERRORS = Counter(
+    "fund_errors_total",
+    "Failures in background components (tushare, ocr, job, events).",
+    ("component",),
+)
+
+
+class PhaseTimer:
+    """
+    Record consecutive phases of one call into a histogram labelled by ``phase``.
+
+    ``mark(name)`` observes the time since the previous mark; ``finish()``
+    observes the whole duration as ``phase="total"``.
+    """
+
+    __slots__ = ("histogram", "_started", "_last")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.histogram.labels(phase).observe(now - self._last)
+        self._last = now
+
+    def finish(self) -> None:
+        self.histogram.labels("total").observe(time.perf_counter() - self._started)
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition body and content type for ``/metrics``."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and status per route template.
+
+    The label is the matched route's path (``/api/investors/{investor_id}``),
+    not the raw URL, so label cardinality stays bounded; unmatched paths share
+    the ``unmatched`` label.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status: Optional[int] = None
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            HTTP_EXCEPTIONS.labels(scope["method"], _route_label(scope)).inc()
+            status = status or 500
+            raise
+        finally:
+            route = _route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status or 500)).inc()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import importlib
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, TypedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, TypedDict
 
-import numpy as np
-from PIL import Image, ImageEnhance, ImageOps
 from loguru import logger
 
+from .metrics import OCR_STAGE_SECONDS, PhaseTimer
+
+if TYPE_CHECKING:  # NumPy, Pillow and PaddleOCR are imported on first OCR use.
+    import numpy as np
+
+# "paddleocr", or "module:factory" naming a callable that returns an object with
+# PaddleOCR's ``ocr(image, cls=True)`` method (such as the load-test engine in
+# ``backend.benchmarks.fake_ocr``).
+OCR_ENGINE = os.getenv("OCR_ENGINE", "paddleocr")
+
 
 class ParsedHolding(TypedDict, total=False):
     name: str
@@ -16,6 +27,14 @@ class ParsedHolding(TypedDict, total=False):
     market_value: float
 
 
+class OCRToken(TypedDict):
+    """One recognized text box as returned by PaddleOCR; the recorded fixture format."""
+
+    bbox: List[List[float]]
+    text: str
+    score: float
+
+
 def parse_account_screenshot(image_path: Path) -> List[ParsedHolding]:
     """
     Parse holdings information from a screenshot.
@@ -24,6 +43,21 @@ def parse_account_screenshot(image_path: Path) -> List[ParsedHolding]:
     the function will log the issue and raise a RuntimeError so that the
     caller can fall back to manual data entry.
     """
+    timer = PhaseTimer(OCR_STAGE_SECONDS)
+    ocr = load_ocr_engine()
+    timer.mark("model_load")
+    image_np = preprocess_image(image_path)
+    timer.mark("preprocess")
+    ocr_tokens = recognize(ocr, image_np)
+    timer.mark("recognize")
+    holdings = parse_tokens(layout_tokens(ocr_tokens), image_path)
+    timer.mark("parse")
+    timer.finish()
+    return holdings
+
+
+def _load_paddleocr():
+    """Construct the PaddleOCR model with the detection settings tuned for broker screenshots."""
     try:
         from paddleocr import PaddleOCR  # type: ignore
     except ImportError as exc:  # pragma: no cover - optional dependency
@@ -31,7 +65,7 @@ def parse_account_screenshot(image_path: Path) -> List[ParsedHolding]:
             "paddleocr is not installed. Install it or configure another OCR provider."
         ) from exc
 
-    ocr = PaddleOCR(
+    return PaddleOCR(
         use_angle_cls=True,
         lang="ch",
         det_limit_side_len=1920,
@@ -41,6 +75,37 @@ def parse_account_screenshot(image_path: Path) -> List[ParsedHolding]:
         det_db_box_thresh=0.25,
         det_db_unclip_ratio=1.8,
     )
+
+
+OCR_ENGINES = {
+    "paddleocr": _load_paddleocr,
+}
+
+
+@lru_cache(maxsize=1)
+def load_ocr_engine():
+    """
+    Construct the engine selected by ``OCR_ENGINE``.
+
+    Cached for the life of the process, so a warm job worker loads it only once.
+    """
+    if OCR_ENGINE in OCR_ENGINES:
+        return OCR_ENGINES[OCR_ENGINE]()
+    module_name, _, attribute = OCR_ENGINE.partition(":")
+    if not attribute:
+        raise RuntimeError(f"Unknown OCR engine '{OCR_ENGINE}'.")
+    try:
+        factory = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as exc:
+        raise RuntimeError(f"Cannot load OCR engine '{OCR_ENGINE}': {exc}") from exc
+    return factory()
+
+
+def preprocess_image(image_path: Path) -> np.ndarray:
+    """Upscale small screenshots and boost contrast before recognition."""
+    import numpy as np
+    from PIL import Image, ImageEnhance, ImageOps
+
     image = Image.open(image_path).convert("RGB")
     width, height = image.size
     scale_factor = 1.0
@@ -53,21 +118,47 @@ def parse_account_screenshot(image_path: Path) -> List[ParsedHolding]:
     image = ImageOps.autocontrast(image)
     image = ImageOps.equalize(image)
     image = ImageEnhance.Contrast(image).enhance(1.35)
-    image_np = np.array(image)
-    result = ocr.ocr(image_np, cls=True)
+    return np.array(image)
 
-    tokens: List[Dict[str, float | str]] = []
+
+def recognize(ocr, image_np: np.ndarray) -> List[OCRToken]:
+    """Run detection and recognition and flatten the pages into tokens."""
+    result = ocr.ocr(image_np, cls=True)
+    tokens: List[OCRToken] = []
     for page in result:
         if not page:
             continue
-        for bbox, (text, _score) in page:
-            cleaned = text.strip()
-            if not cleaned:
-                continue
-            cx = sum(point[0] for point in bbox) / 4
-            cy = sum(point[1] for point in bbox) / 4
-            tokens.append({"text": cleaned, "cx": cx, "cy": cy})
+        for bbox, (text, score) in page:
+            tokens.append(
+                {
+                    "bbox": [[float(x), float(y)] for x, y in bbox],
+                    "text": text,
+                    "score": float(score),
+                }
+            )
+    return tokens
+
+
+def layout_tokens(ocr_tokens: List[OCRToken]) -> List[Dict[str, float | str]]:
+    """Reduce OCR tokens to stripped text and bounding-box centres."""
+    tokens: List[Dict[str, float | str]] = []
+    for token in ocr_tokens:
+        cleaned = token["text"].strip()
+        if not cleaned:
+            continue
+        bbox = token["bbox"]
+        cx = sum(point[0] for point in bbox) / 4
+        cy = sum(point[1] for point in bbox) / 4
+        tokens.append({"text": cleaned, "cx": cx, "cy": cy})
+    return tokens
 
+
+def parse_tokens(tokens: List[Dict[str, float | str]], image_path: Path) -> List[ParsedHolding]:
+    """
+    Rebuild table rows from positioned OCR tokens and extract holdings.
+
+    Pure Python and deterministic; ``image_path`` is only used in log messages.
+    """
     if not tokens:
         logger.warning("OCR returned no tokens for %s", image_path)
         return []
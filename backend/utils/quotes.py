@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import random
+from typing import Dict, Iterable, Optional, Protocol
+
+from loguru import logger
+
+from .metrics import ERRORS, TUSHARE_REQUEST_SECONDS
+
+try:
+    import tushare as ts
+except ImportError:  # pragma: no cover - optional dependency
+    ts = None  # type: ignore
+
+
+class QuoteSource(Protocol):
+    def get_quotes(
+        self,
+        symbols: Iterable[str],
+        reference: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """
+        Latest price per symbol; symbols without a quote are omitted.
+
+        ``reference`` holds the last known price per symbol (from the holdings
+        snapshot) for sources that need a starting point.
+        """
+        ...
+
+
+class TushareQuoteSource:
+    """Realtime quotes through ``tushare.realtime_quote``."""
+
+    def get_quotes(
+        self,
+        symbols: Iterable[str],
+        reference: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        token = os.getenv("TUSHARE_TOKEN")
+        if not token:
+            raise RuntimeError("TUSHARE_TOKEN is not configured in the environment.")
+        if ts is None:
+            raise RuntimeError("tushare package is not installed. Install it to enable API updates.")
+
+        symbols = [symbol for symbol in symbols if symbol]
+        if not symbols:
+            return {}
+        ts.set_token(token)
+        try:
+            with TUSHARE_REQUEST_SECONDS.labels("realtime_quote").time():
+                df = ts.realtime_quote(ts_code=",".join(symbols))
+        except Exception as exc:  # pragma: no cover - external API call
+            ERRORS.labels("tushare").inc()
+            logger.exception("Failed to fetch realtime quotes from Tushare.")
+            raise RuntimeError(f"Tushare request failed: {exc}") from exc
+
+        quotes: Dict[str, float] = {}
+        for _, row in df.iterrows():
+            price = float(row.get("PRICE") or 0)
+            if price > 0:
+                quotes[row.get("TS_CODE")] = price
+        return quotes
+
+
+class FakeQuoteSource:
+    """
+    Deterministic random-walk quotes for local development and tests.
+
+    Each symbol starts from ``base_prices``, else its reference price, else 10.0,
+    and moves by a normally distributed return with standard deviation
+    ``volatility`` on every call.
+    """
+
+    def __init__(
+        self,
+        base_prices: Optional[Dict[str, float]] = None,
+        volatility: float = 0.002,
+        seed: int = 0,
+    ) -> None:
+        self.prices: Dict[str, float] = dict(base_prices or {})
+        self.volatility = volatility
+        self._random = random.Random(seed)
+
+    def get_quotes(
+        self,
+        symbols: Iterable[str],
+        reference: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        reference = reference or {}
+        quotes: Dict[str, float] = {}
+        for symbol in symbols:
+            if not symbol:
+                continue
+            price = self.prices.get(symbol) or reference.get(symbol) or 10.0
+            price *= 1 + self._random.gauss(0.0, self.volatility)
+            self.prices[symbol] = price
+            quotes[symbol] = price
+        return quotes
+
+
+QUOTE_SOURCES = {
+    "tushare": TushareQuoteSource,
+    "fake": FakeQuoteSource,
+}
+
+
+def get_quote_source(name: Optional[str] = None) -> QuoteSource:
+    name = name or os.getenv("INTRADAY_QUOTE_SOURCE", "tushare")
+    try:
+        return QUOTE_SOURCES[name]()
+    except KeyError as exc:
+        raise RuntimeError(f"Unknown quote source '{name}'.") from exc
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode plain dicts/lists to JSON bytes, using orjson when it is installed.
+
+    The output matches FastAPI's default encoding of the equivalent pydantic
+    models: compact separators, ISO-8601 dates and non-ASCII text kept as UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for content that is already plain rows.
+
+    Returning a response instance from a route bypasses FastAPI's second
+    ``response_model`` validation pass, so callers must build content in the
+    exact shape of the declared schema (see ``schema_fields``).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_fields(schema: Type[BaseModel]) -> list[str]:
+    """Field names of ``schema`` in the order pydantic serializes them."""
+    return list(schema.__fields__)
+
+
+def as_row(schema: Type[BaseModel], obj: Any) -> dict[str, Any]:
+    """Read the attributes of an ORM object that ``schema`` would serialize."""
+    return {field: getattr(obj, field) for field in schema.__fields__}
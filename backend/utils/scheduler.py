@@ -1,51 +1,368 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
 
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
 from loguru import logger
 
-from ..database import SessionLocal
-from .tushare_client import fetch_holdings
+from ..database import SessionLocal, engine
+from ..models import DEFAULT_FUND_ID
+from . import intraday, tasks
+from .cache import bump_data_version
+from .events import publish
+from .metrics import ERRORS, JOB_SECONDS
+from .executor import JOB_WORKERS, JobSkipped, JobTimeout, executor, fund_kind
+from .leader import LeaderElector
+from .quotes import QuoteSource, get_quote_source
 
 timezone = os.getenv("SCHEDULER_TIMEZONE", "Asia/Shanghai")
-scheduler = BackgroundScheduler(timezone=timezone)
+# Missed runs later than this are left to the catch-up pass instead of firing late.
+MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", "3600"))
+# How many days back the startup catch-up looks for trading days without a NAV.
+CATCHUP_DAYS = int(os.getenv("SCHEDULER_CATCHUP_DAYS", "7"))
 
+DAILY_UPDATE_HOUR = 16
+DAILY_UPDATE_MINUTE = 30
 
-def run_daily_update() -> None:
+scheduler = BackgroundScheduler(
+    timezone=timezone,
+    jobstores={"default": SQLAlchemyJobStore(engine=engine, tablename="apscheduler_jobs")},
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": MISFIRE_GRACE_SECONDS},
+)
+
+
+def _record_run(
+    job_id: str,
+    kind: str,
+    task: Callable[..., Optional[str]],
+    *args,
+    trigger: str = "schedule",
+    scheduled_for: Optional[date] = None,
+    fund_id: Optional[int] = None,
+) -> int:
     """
-    Job executed by APScheduler to refresh holdings and NAV.
+    Run ``task`` in the job executor and store its start, end, duration and
+    outcome in ``job_runs``. Scheduled and catch-up runs only proceed in the
+    leader; manual runs proceed anywhere.
+
+    With ``fund_id`` the task receives it as a keyword argument and runs in
+    that fund's executor slots, so runs for different funds do not wait on
+    each other.
     """
     from .. import crud
 
-    logger.info("Starting scheduled holdings refresh.")
+    kwargs = {}
+    if fund_id is not None:
+        kind, kwargs = fund_kind(kind, fund_id), {"fund_id": fund_id}
+    session = SessionLocal()
     try:
-        holdings = fetch_holdings()
-    except RuntimeError as exc:
-        logger.warning("Skipping scheduled refresh: %s", exc)
-        return
+        run = crud.start_job_run(
+            session, job_id, trigger=trigger, scheduled_for=scheduled_for, fund_id=fund_id
+        )
+        if trigger != "manual" and not leader.is_leader:
+            status, message = "skipped", "this process is not the scheduler leader"
+        else:
+            started = time.perf_counter()
+            try:
+                result = executor.run(kind, task, *args, **kwargs)
+                status, message = "success", None if result is None else str(result)
+            except JobSkipped as exc:
+                status, message = "skipped", str(exc)
+            except JobTimeout as exc:
+                status, message = "timeout", str(exc)
+            except Exception as exc:
+                status, message = "failed", str(exc)
+            finally:
+                # The child process wrote through its own connections; drop
+                # this process's cached reads of the fund.
+                bump_data_version(fund_id)
+            JOB_SECONDS.labels(job_id, status).observe(time.perf_counter() - started)
+            if status in ("failed", "timeout"):
+                ERRORS.labels("job").inc()
+        if status != "success":
+            logger.warning("Job {} ended with {}: {}", job_id, status, message)
+        crud.finish_job_run(session, run, status, message)
+        return run.id
+    finally:
+        session.close()
+
+
+def _resume_jobs() -> None:
+    if scheduler.running:
+        scheduler.resume()
+        logger.info("Scheduler resumed; this process now runs scheduled jobs.")
+        scheduler.add_job(
+            catch_up_missed_updates,
+            id="nav_catch_up",
+            replace_existing=True,
+            misfire_grace_time=None,
+        )
+
+
+def _pause_jobs() -> None:
+    if scheduler.running:
+        scheduler.pause()
+        logger.info("Scheduler paused; another process runs scheduled jobs.")
+
+
+leader = LeaderElector(engine, name="scheduler", on_elected=_resume_jobs, on_demoted=_pause_jobs)
+
+
+def start_scheduler() -> None:
+    """
+    Start the scheduler paused in every worker; only the elected leader resumes it.
+    """
+    if not scheduler.running:
+        scheduler.start(paused=True)
+        _register_jobs()
+    leader.start()
 
-    if not holdings:
-        logger.warning("Scheduled refresh returned no holdings; skipping NAV update.")
+
+def stop_scheduler() -> None:
+    leader.stop()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+
+def _fund_ids() -> list[int]:
+    from .. import crud
+
+    session = SessionLocal()
+    try:
+        return crud.get_fund_ids(session)
+    finally:
+        session.close()
+
+
+def _for_each_fund(run: Callable[[int], object], fund_ids: Optional[list[int]] = None) -> list:
+    """
+    Call ``run(fund_id)`` for every fund in parallel threads and return the results.
+
+    Each fund's work goes through its own executor slots, so a slow fund does
+    not hold up the others. At most ``JOB_WORKERS`` funds run at once, as many
+    as the executor can serve; the rest queue for a thread.
+    """
+    fund_ids = _fund_ids() if fund_ids is None else fund_ids
+    if len(fund_ids) <= 1:
+        return [run(fund_id) for fund_id in fund_ids]
+    threads = max(1, min(len(fund_ids), JOB_WORKERS))
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="fund-job") as pool:
+        return list(pool.map(run, fund_ids))
+
+
+def run_daily_update() -> None:
+    """
+    Job executed by APScheduler to refresh holdings and NAV of every fund.
+    """
+    logger.info("Starting scheduled holdings refresh.")
+    today = datetime.now(ZoneInfo(timezone)).date()
+    _for_each_fund(
+        lambda fund_id: _record_run(
+            "daily_nav_refresh",
+            "nav",
+            tasks.refresh_nav,
+            None,
+            scheduled_for=today,
+            fund_id=fund_id,
+        )
+    )
+
+
+def catch_up_missed_updates(now: Optional[datetime] = None) -> list[date]:
+    """
+    Compute NAV, oldest first, for recent trading days that have none.
+
+    Looks back ``SCHEDULER_CATCHUP_DAYS``. Today counts only once its 16:30 run
+    is past the misfire grace period, so the regular job keeps priority while it
+    can still fire. Funds catch up in parallel. Returns the days that were
+    attempted for any fund.
+    """
+    from .. import crud
+
+    if not leader.is_leader:
+        return []
+
+    now = now or datetime.now(ZoneInfo(timezone))
+    cutoff = now.replace(
+        hour=DAILY_UPDATE_HOUR, minute=DAILY_UPDATE_MINUTE, second=0, microsecond=0
+    ) + timedelta(seconds=MISFIRE_GRACE_SECONDS)
+    last_day = now.date() if now >= cutoff else now.date() - timedelta(days=1)
+
+    def catch_up(fund_id: int) -> list[date]:
+        session = SessionLocal()
+        try:
+            missing = crud.get_missing_nav_dates(
+                session, last_day - timedelta(days=CATCHUP_DAYS - 1), last_day, fund_id
+            )
+        finally:
+            session.close()
+
+        if missing:
+            logger.info(
+                "Catching up NAV of fund {} for {} missed day(s): {}", fund_id, len(missing), missing
+            )
+        for day in missing:
+            _record_run(
+                "daily_nav_refresh",
+                "nav",
+                tasks.refresh_nav,
+                day,
+                trigger="catchup",
+                scheduled_for=day,
+                fund_id=fund_id,
+            )
+        return missing
+
+    return sorted({day for missing in _for_each_fund(catch_up) for day in missing})
+
+
+def run_holdings_archival() -> None:
+    """
+    Job executed by APScheduler to move old holdings snapshots into the archive.
+    """
+    today = date.today()
+    _for_each_fund(
+        lambda fund_id: _record_run(
+            "holdings_archival",
+            "archival",
+            tasks.archive_holdings,
+            scheduled_for=today,
+            fund_id=fund_id,
+        )
+    )
+
+
+_quote_source: Optional[QuoteSource] = None
+
+
+def run_intraday_tick() -> None:
+    """
+    Job executed by APScheduler during trading hours to estimate the live NAV
+    of every fund.
+
+    Points go to the fund's in-memory ring buffer in the leader process; see
+    ``run_intraday_compaction`` for persistence.
+    """
+    global _quote_source
+    from .. import crud
+
+    now = datetime.now(intraday.TIMEZONE)
+    if not leader.is_leader or not intraday.in_trading_session(now):
         return
+    if _quote_source is None:
+        _quote_source = get_quote_source()
 
     session = SessionLocal()
     try:
-        crud.update_holdings_and_nav(session, holdings)
-        logger.info("Scheduled NAV update complete at %s", datetime.now())
-    except Exception:
-        logger.exception("Scheduled NAV update failed.")
+        for fund_id in crud.get_fund_ids(session):
+            try:
+                point = crud.estimate_intraday_point(session, _quote_source, now.date(), fund_id)
+            except RuntimeError as exc:
+                logger.warning("Skipping intraday estimate of fund {}: {}", fund_id, exc)
+                continue
+            if point is None:
+                continue
+            intraday.buffer_for(fund_id).append(now.timestamp(), *point)
+            nav, total_value, holdings_value = point
+            publish(
+                "intraday.estimate",
+                {
+                    "fund_id": fund_id,
+                    "timestamp": now.isoformat(),
+                    "nav": nav,
+                    "total_value": total_value,
+                },
+            )
     finally:
         session.close()
 
 
-scheduler.add_job(
-    run_daily_update,
-    trigger="cron",
-    hour=16,
-    minute=30,
-    id="daily_nav_refresh",
-    replace_existing=True,
-)
+def run_intraday_compaction() -> None:
+    """
+    Job executed by APScheduler to persist closed buckets of the intraday buffers.
+    """
+    from .. import crud
+
+    if not leader.is_leader:
+        return
+    now = datetime.now(intraday.TIMEZONE)
+    final = not intraday.in_trading_session(now)
+    session = SessionLocal()
+    try:
+        for fund_id, buffer in intraday.buffers().items():
+            points = buffer.compact(final=final)
+            if len(points) == 0:
+                continue
+            rows = crud.save_intraday_points(session, points, fund_id)
+            logger.info("Compacted {} intraday NAV points of fund {}.", rows, fund_id)
+    finally:
+        session.close()
+
+
+# Jobs an admin may start by hand: job id -> (executor kind, task).
+MANUAL_JOBS = {
+    "daily_nav_refresh": ("nav", tasks.refresh_nav),
+    "holdings_archival": ("archival", tasks.archive_holdings),
+    "rebuild_fund_analytics": ("backfill", tasks.rebuild_fund_analytics),
+    "rebuild_investor_values": ("backfill", tasks.rebuild_investor_values),
+}
+
+
+def run_manual_job(
+    job_id: str,
+    trade_date: Optional[date] = None,
+    fund_id: int = DEFAULT_FUND_ID,
+) -> int:
+    """Run one of ``MANUAL_JOBS`` for one fund now and return the id of its ``job_runs`` row."""
+    kind, task = MANUAL_JOBS[job_id]
+    args = (trade_date,) if job_id == "daily_nav_refresh" else ()
+    return _record_run(
+        job_id, kind, task, *args, trigger="manual", scheduled_for=trade_date, fund_id=fund_id
+    )
+
 
+def _register_jobs() -> None:
+    # Jobs live in the database job store, so they are (re)registered by
+    # reference once the scheduler has started rather than at import time.
+    scheduler.add_job(
+        run_daily_update,
+        trigger="cron",
+        hour=DAILY_UPDATE_HOUR,
+        minute=DAILY_UPDATE_MINUTE,
+        id="daily_nav_refresh",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        run_holdings_archival,
+        trigger="cron",
+        hour=2,
+        minute=30,
+        id="holdings_archival",
+        replace_existing=True,
+    )
+    if intraday.INTRADAY_ENABLED:
+        scheduler.add_job(
+            run_intraday_tick,
+            trigger="interval",
+            seconds=intraday.INTERVAL_SECONDS,
+            id="intraday_tick",
+            replace_existing=True,
+            misfire_grace_time=intraday.INTERVAL_SECONDS,
+        )
+        scheduler.add_job(
+            run_intraday_compaction,
+            trigger="interval",
+            seconds=intraday.COMPACT_BUCKET_SECONDS,
+            id="intraday_compaction",
+            replace_existing=True,
+        )
+    else:
+        for job_id in ("intraday_tick", "intraday_compaction"):
+            if scheduler.get_job(job_id) is not None:
+                scheduler.remove_job(job_id)
@@ -0,0 +1,222 @@
+"""
+Per-request SQL profiling through SQLAlchemy engine events.
+
+Opt-in with ``SQL_PROFILING=true``: every request gets a ``QueryProfile``
+collecting statement counts and database time, statements slower than
+``SQL_SLOW_QUERY_MS`` are logged, and a statement repeated at least
+``SQL_N_PLUS_ONE_THRESHOLD`` times in one request is reported as a likely N+1.
+``SQL_PROFILING_HEADERS=true`` (development only) adds the counts to response
+headers.
+
+``query_budget`` works regardless of the environment and is meant for tests and
+benchmarks. It counts statements issued by requests and by the calling thread,
+not by background work such as the scheduler or the event poller::
+
+    with query_budget(2):
+        client.get("/api/fund/nav")
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() in ("1", "true", "yes")
+SQL_PROFILING_HEADERS = os.getenv("SQL_PROFILING_HEADERS", "false").lower() in ("1", "true", "yes")
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class QueryProfile:
+    """Statements executed within one request or ``profile_queries`` block."""
+
+    def __init__(self, thread_id: Optional[int] = None) -> None:
+        self.thread_id = thread_id
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += elapsed
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        """Statements executed at least ``threshold`` times, most frequent first."""
+        with self._lock:
+            return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    @property
+    def max_repeats(self) -> int:
+        with self._lock:
+            return max(self.statements.values(), default=0)
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries in {self.seconds * 1000:.1f} ms"]
+        with self._lock:
+            lines.extend(f"  {n}x {_shorten(sql)}" for sql, n in self.statements.most_common())
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+# ``profile_queries`` collectors; they see statements from any request (the
+# test client serves requests on its own thread) and from their own thread.
+_global_profiles: list[QueryProfile] = []
+_global_lock = threading.Lock()
+_installed = False
+_install_lock = threading.Lock()
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("sql_profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["sql_profiler_started"].pop()
+    elapsed = time.perf_counter() - started
+
+    profile = _current.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    if _global_profiles:
+        thread_id = threading.get_ident()
+        with _global_lock:
+            for collector in _global_profiles:
+                if profile is not None or collector.thread_id == thread_id:
+                    collector.record(statement, elapsed)
+
+    if SQL_PROFILING and elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+        logger.warning("Slow query ({:.1f} ms): {}", elapsed * 1000, _shorten(statement, 1000))
+
+
+def _handle_error(context) -> None:
+    connection = context.connection
+    if connection is not None and connection.info.get("sql_profiler_started"):
+        connection.info["sql_profiler_started"].pop()
+
+
+def install() -> None:
+    """Attach the cursor listeners to every engine; safe to call repeatedly."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _installed = True
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Collect statements from requests and from this thread while the block runs."""
+    install()
+    profile = QueryProfile(thread_id=threading.get_ident())
+    with _global_lock:
+        _global_profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        with _global_lock:
+            _global_profiles.remove(profile)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None) -> Iterator[QueryProfile]:
+    """
+    Fail with ``QueryBudgetExceeded`` if the block runs more than ``max_queries``
+    statements, or any single statement more than ``max_repeats`` times.
+    """
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"Expected at most {max_queries} queries, got {profile.summary()}"
+        )
+    if max_repeats is not None and profile.max_repeats > max_repeats:
+        raise QueryBudgetExceeded(
+            f"Expected no statement repeated more than {max_repeats} times, got {profile.summary()}"
+        )
+
+
+class SQLProfilingMiddleware:
+    """
+    ASGI middleware giving each request its own ``QueryProfile``.
+
+    Always mounted so ``query_budget`` can tell request queries from background
+    ones; without ``SQL_PROFILING`` or an active budget it passes requests
+    straight through. Logs likely N+1 patterns after the response and, with
+    ``SQL_PROFILING_HEADERS``, reports ``X-DB-Query-Count``, ``X-DB-Time-Ms``
+    and ``X-DB-Max-Repeats``. Headers are written when the response starts, so
+    streaming responses only count the queries issued before their first chunk.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        if SQL_PROFILING:
+            install()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not (SQL_PROFILING or _global_profiles):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current.set(profile)
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start" and SQL_PROFILING_HEADERS:
+                headers = list(message.get("headers", []))
+                headers.extend(
+                    [
+                        (b"x-db-query-count", str(profile.count).encode()),
+                        (b"x-db-time-ms", f"{profile.seconds * 1000:.2f}".encode()),
+                        (b"x-db-max-repeats", str(profile.max_repeats).encode()),
+                    ]
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if SQL_PROFILING:
+                self._report(scope, profile)
+
+    @staticmethod
+    def _report(scope, profile: QueryProfile) -> None:
+        for statement, repeats in profile.repeated():
+            logger.warning(
+                "Possible N+1 in {} {}: statement ran {} times: {}",
+                scope["method"],
+                scope["path"],
+                repeats,
+                _shorten(statement),
+            )
+        logger.debug(
+            "{} {}: {} queries, {:.1f} ms in database",
+            scope["method"],
+            scope["path"],
+            profile.count,
+            profile.seconds * 1000,
+        )
@@ -0,0 +1,70 @@
+"""
+Job bodies executed in ``JobExecutor`` child processes.
+
+Each function opens its own session from a freshly imported engine and returns
+a short message for the run history. Fund-level jobs take the fund as
+``fund_id``. Keep them module-level so they can be pickled by reference.
+"""
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from ..models import DEFAULT_FUND_ID
+from .executor import JobSkipped
+
+
+def refresh_nav(trade_date: Optional[date] = None, fund_id: int = DEFAULT_FUND_ID) -> str:
+    from .. import crud
+    from ..database import session_scope
+    from .tushare_client import fetch_holdings
+
+    with session_scope() as db:
+        fund = crud.get_fund(db, fund_id)
+        if fund is None:
+            raise JobSkipped(f"fund {fund_id} does not exist")
+        account_code = fund.account_code
+    try:
+        holdings = fetch_holdings(account_code=account_code, trade_date=trade_date)
+    except RuntimeError as exc:
+        raise JobSkipped(str(exc)) from exc
+    if not holdings:
+        raise JobSkipped("upstream returned no holdings")
+
+    with session_scope() as db:
+        summary = crud.update_holdings_and_nav(
+            db, holdings, holdings_date=trade_date, fund_id=fund_id
+        )
+    return f"NAV {summary.nav:.4f} on {summary.date.isoformat()}"
+
+
+def archive_holdings(retention_days: Optional[int] = None, fund_id: int = DEFAULT_FUND_ID) -> str:
+    from .. import crud
+    from ..database import session_scope
+
+    with session_scope() as db:
+        rows = crud.archive_holdings(db, retention_days=retention_days, fund_id=fund_id)
+    return f"archived {rows} rows"
+
+
+def rebuild_fund_analytics(fund_id: int = DEFAULT_FUND_ID) -> int:
+    from .. import crud
+    from ..database import session_scope
+
+    with session_scope() as db:
+        return crud.rebuild_fund_analytics(db, fund_id)
+
+
+def rebuild_investor_values(fund_id: int = DEFAULT_FUND_ID) -> int:
+    from .. import crud
+    from ..database import session_scope
+
+    with session_scope() as db:
+        return crud.rebuild_investor_values(db, fund_id=fund_id)
+
+
+def parse_screenshot(image_path: Path) -> List[dict]:
+    from .ocr_parser import parse_account_screenshot
+
+    return [dict(item) for item in parse_account_screenshot(image_path)]
@@ -7,6 +7,7 @@ from typing import List
 from loguru import logger
 
 from .. import schemas
+from .metrics import ERRORS, TUSHARE_REQUEST_SECONDS
 
 try:
     import tushare as ts
@@ -14,9 +15,12 @@ except ImportError:  # pragma: no cover - optional dependency
     ts = None  # type: ignore
 
 
-def fetch_holdings(account_code: str | None = None) -> List[schemas.HoldingCreate]:
+def fetch_holdings(
+    account_code: str | None = None,
+    trade_date: date | None = None,
+) -> List[schemas.HoldingCreate]:
     """
-    Fetch current holdings from Tushare.
+    Fetch holdings from Tushare for ``trade_date`` (today by default).
 
     The exact implementation depends on the account permissions granted to your token.
     By default this function returns an empty list and should be customized for the
@@ -34,9 +38,11 @@ def fetch_holdings(account_code: str | None = None) -> List[schemas.HoldingCreat
 
     try:
         # Placeholder implementation: fetch daily basic indicators for demonstration.
-        today = date.today().strftime("%Y%m%d")
-        df = pro.daily_basic(trade_date=today, fields="ts_code,total_mv,close")
+        today = (trade_date or date.today()).strftime("%Y%m%d")
+        with TUSHARE_REQUEST_SECONDS.labels("daily_basic").time():
+            df = pro.daily_basic(trade_date=today, fields="ts_code,total_mv,close")
     except Exception as exc:  # pragma: no cover - external API call
+        ERRORS.labels("tushare").inc()
         logger.exception("Failed to fetch holdings from Tushare.")
         raise RuntimeError(f"Tushare request failed: {exc}") from exc
 
@@ -3,13 +3,9 @@
 import { useCallback, useEffect, useState } from "react";
 
 import {
-  fetchCashBalance,
-  fetchFundHistory,
-  fetchFundSummary,
-  fetchHoldings,
-  fetchInvestors,
+  fetchDashboard,
+  subscribeEvents,
   updateCashBalance,
-  getCurrentInvestor,
   type FundHistory,
   type FundSummary,
   type HoldingsResponse,
@@ -24,6 +20,7 @@ import { SummaryCards } from "@/components/SummaryCards";
 import { UploadPanel } from "@/components/UploadPanel";
 import { InvestorSummaryCards } from "@/components/InvestorSummaryCards.tsx";
 import dayjs from "dayjs";
+import type { AxiosError } from "axios";
 
 export const HomePage = () => {
   const [summary, setSummary] = useState<FundSummary | null>(null);
@@ -33,38 +30,24 @@ export const HomePage = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [cash, setCash] = useState(0);
   const [currentUser, setCurrentUser] = useState<any>(null); // 添加当前用户状态
+  const [loadError, setLoadError] = useState<string | null>(null);
 
   const loadData = useCallback(async () => {
     setIsLoading(true);
     try {
-      const [summaryData, holdingsData, investorsData, historyData, cashData, userData] =
-        await Promise.allSettled([
-          fetchFundSummary(),
-          fetchHoldings(),
-          fetchInvestors(),
-          fetchFundHistory(),
-          fetchCashBalance(),
-          getCurrentInvestor(), // 获取当前用户信息
-        ]);
-
-      if (summaryData.status === "fulfilled") {
-        setSummary(summaryData.value);
-      }
-      if (holdingsData.status === "fulfilled") {
-        setHoldings(holdingsData.value);
-      }
-      if (investorsData.status === "fulfilled") {
-        setInvestors(investorsData.value ?? []);
-      }
-      if (historyData.status === "fulfilled") {
-        setHistory(historyData.value ?? []);
-      }
-      if (cashData.status === "fulfilled") {
-        setCash(cashData.value.amount);
-      }
-      if (userData.status === "fulfilled") {
-        setCurrentUser(userData.value); // 设置当前用户
-      }
+      const dashboard = await fetchDashboard();
+      setSummary(dashboard.summary);
+      setHoldings(dashboard.holdings);
+      setInvestors(dashboard.investors ?? []);
+      setHistory(dashboard.history ?? []);
+      setCash(dashboard.cash?.amount ?? 0);
+      setCurrentUser(dashboard.investor); // 设置当前用户
+      setLoadError(null);
+    } catch (error) {
+      // 保留上一次成功加载的数据，仅提示刷新失败
+      console.error(error);
+      const err = error as AxiosError<{ detail?: string }>;
+      setLoadError(err.response?.data?.detail ?? "数据刷新失败，当前显示的可能不是最新数据。");
     } finally {
       setIsLoading(false);
     }
@@ -82,6 +65,22 @@ export const HomePage = () => {
     loadData();
   }, [loadData]);
 
+  // 数据变更时由服务端推送通知，替代轮询
+  useEffect(() => {
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = subscribeEvents(
+      () => {
+        clearTimeout(timer);
+        timer = setTimeout(loadData, 500);
+      },
+      ["nav.updated", "cash.updated", "investors.changed"],
+    );
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, [loadData]);
+
   // 判断是否是管理员用户
   const isAdmin = currentUser?.is_admin === true;
 
@@ -107,6 +106,19 @@ export const HomePage = () => {
         </div>
       </header>
 
+      {loadError && (
+        <p className="text-center text-sm text-rose-400">
+          {loadError}{" "}
+          <button
+            type="button"
+            onClick={loadData}
+            className="underline decoration-dotted underline-offset-4 hover:text-rose-300"
+          >
+            重试
+          </button>
+        </p>
+      )}
+
       {isAdmin ? (<SummaryCards
         summary={summary}
         updatedAt={history.at(-1)?.created_at}
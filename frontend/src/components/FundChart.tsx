@@ -12,8 +12,13 @@ import {
   Tooltip,
 } from "chart.js";
 import dayjs from "dayjs";
+import { useEffect, useRef, useState } from "react";
 
-import type { FundHistory } from "../lib/api";
+import {
+  fetchFundHistoryDownsample,
+  type FundHistory,
+  type SeriesPoint,
+} from "../lib/api";
 
 ChartJS.register(
   CategoryScale,
@@ -29,8 +34,53 @@ export interface FundChartProps {
   history: FundHistory[];
 }
 
+// 约每 3 像素一个点，按 50 取整以复用服务端缓存
+const PIXELS_PER_POINT = 3;
+const MIN_POINTS = 60;
+const MAX_POINTS = 1000;
+
+const targetPoints = (width: number) =>
+  Math.min(
+    MAX_POINTS,
+    Math.max(MIN_POINTS, Math.round(width / PIXELS_PER_POINT / 50) * 50),
+  );
+
 export function FundChart({ history }: FundChartProps) {
-  if (!history.length) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const [points, setPoints] = useState<number | null>(null);
+  const [series, setSeries] = useState<SeriesPoint[] | null>(null);
+  const latest = history.at(-1);
+  const hasHistory = history.length > 0;
+
+  useEffect(() => {
+    const element = containerRef.current;
+    if (!element) return;
+    const observer = new ResizeObserver(([entry]) => {
+      setPoints(targetPoints(entry.contentRect.width));
+    });
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [hasHistory]);
+
+  // 全部历史按图表宽度降采样；新净值写入后（latest 变化）重新获取
+  useEffect(() => {
+    if (!latest || points === null) return;
+    let cancelled = false;
+    fetchFundHistoryDownsample(points)
+      .then((data) => {
+        if (!cancelled) setSeries(data.nav);
+      })
+      .catch((error) => {
+        // 降采样失败时继续显示仪表盘自带的近期历史
+        console.error(error);
+        if (!cancelled) setSeries(null);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [points, latest?.date, latest?.nav]);
+
+  if (!hasHistory) {
     return (
       <div className="flex h-64 items-center justify-center rounded-2xl border border-white/10 bg-slate-900/60">
         <p className="text-sm text-slate-400">暂无净值历史，等待首次更新。</p>
@@ -38,14 +88,21 @@ export function FundChart({ history }: FundChartProps) {
     );
   }
 
-  const labels = history.map((item) => dayjs(item.date).format("MM-DD"));
+  const chartPoints =
+    series ?? history.map((item) => ({ date: item.date, value: item.nav }));
+  const spansYears =
+    chartPoints.length > 0 &&
+    dayjs(chartPoints.at(-1)!.date).diff(chartPoints[0].date, "day") > 366;
+  const labels = chartPoints.map((item) =>
+    dayjs(item.date).format(spansYears ? "YYYY-MM-DD" : "MM-DD"),
+  );
 
   const dataset = {
     labels,
     datasets: [
       {
         label: "基金净值",
-        data: history.map((item) => item.nav),
+        data: chartPoints.map((item) => item.value),
         tension: 0.35,
         fill: {
           target: "origin",
@@ -53,7 +110,7 @@ export function FundChart({ history }: FundChartProps) {
         },
         borderColor: "rgb(56, 189, 248)",
         borderWidth: 2,
-        pointRadius: 3,
+        pointRadius: chartPoints.length > 120 ? 0 : 3,
         pointBackgroundColor: "rgb(56, 189, 248)",
       },
     ],
@@ -64,7 +121,7 @@ export function FundChart({ history }: FundChartProps) {
       <h2 className="mb-4 text-center text-lg font-semibold text-slate-100">
         净值走势
       </h2>
-      <div className="relative h-80">
+      <div ref={containerRef} className="relative h-80">
         <Line
           data={dataset}
           options={{
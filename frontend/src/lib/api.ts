@@ -122,6 +122,22 @@ export interface LoginResponse {
   };
 }
 
+export interface Dashboard {
+  summary: FundSummary | null;
+  history: FundHistory[];
+  holdings: HoldingsResponse | null;
+  cash: CashBalance | null;
+  investor: Investor;
+  investors: Investor[] | null;
+}
+
+export const fetchDashboard = async (): Promise<Dashboard> => {
+  const { data } = await apiClient.get<Dashboard>("/dashboard", {
+    params: { history_limit: 90 },
+  });
+  return data;
+};
+
 export const fetchFundSummary = async (): Promise<FundSummary | null> => {
   const { data } = await apiClient.get<FundSummary | null>("/fund/nav");
   return data;
@@ -146,6 +162,28 @@ export const fetchFundHistory = async (): Promise<FundHistory[]> => {
   return data;
 };
 
+export interface SeriesPoint {
+  date: string;
+  value: number;
+}
+
+export interface FundHistoryDownsample {
+  source_points: number;
+  nav: SeriesPoint[];
+  total_value: SeriesPoint[];
+}
+
+export const fetchFundHistoryDownsample = async (
+  points: number,
+  range?: { from?: string; to?: string },
+): Promise<FundHistoryDownsample> => {
+  const { data } = await apiClient.get<FundHistoryDownsample>(
+    "/fund/history/downsample",
+    { params: { points, ...range } },
+  );
+  return data;
+};
+
 export const uploadScreenshot = async (
   files: File[],
   holdingsDate?: string,
@@ -242,3 +280,31 @@ export const changePassword = async (payload: ChangePasswordRequest): Promise<In
   const { data } = await apiClient.put<Investor>("/auth/change-password", payload);
   return data;
 };
+
+// 服务端推送事件（SSE）
+export type FundEventType = "nav.updated" | "cash.updated" | "investors.changed" | "intraday.estimate";
+
+export interface FundEvent {
+  type: FundEventType;
+  data: Record<string, unknown>;
+  at: string;
+}
+
+export const subscribeEvents = (
+  onEvent: (event: FundEvent) => void,
+  types: FundEventType[] = ["nav.updated", "cash.updated", "investors.changed", "intraday.estimate"],
+): (() => void) => {
+  const token = typeof window !== "undefined" ? localStorage.getItem("user-token") : null;
+  if (!token || typeof EventSource === "undefined") {
+    return () => {};
+  }
+  // EventSource 无法设置请求头，token 通过查询参数传递；断线后浏览器会自动重连
+  const source = new EventSource(`${API_BASE_URL}/events/stream?token=${encodeURIComponent(token)}`);
+  types.forEach((type) => {
+    source.addEventListener(type, (message) => {
+      const payload = JSON.parse((message as MessageEvent).data);
+      onEvent({ type, data: payload.data, at: payload.at });
+    });
+  });
+  return () => source.close();
+};
@@ -1,5 +1,18 @@
+CREATE TABLE IF NOT EXISTS funds (
+    id SERIAL PRIMARY KEY,
+    code VARCHAR(32) NOT NULL UNIQUE,
+    name VARCHAR(128) NOT NULL,
+    account_code VARCHAR(32),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO funds (id, code, name) VALUES (1, 'default', 'Default Fund') ON CONFLICT (id) DO NOTHING;
+SELECT setval(pg_get_serial_sequence('funds', 'id'), (SELECT MAX(id) FROM funds));
+
 CREATE TABLE IF NOT EXISTS investors (
     id SERIAL PRIMARY KEY,
+    fund_id INTEGER NOT NULL DEFAULT 1 REFERENCES funds(id),
     name VARCHAR(128) NOT NULL,
     identifier VARCHAR(64) UNIQUE,
     initial_investment DOUBLE PRECISION NOT NULL DEFAULT 0,
@@ -11,6 +24,7 @@ CREATE TABLE IF NOT EXISTS investors (
 
 CREATE TABLE IF NOT EXISTS holdings (
     id SERIAL PRIMARY KEY,
+    fund_id INTEGER NOT NULL DEFAULT 1 REFERENCES funds(id),
     name VARCHAR(128) NOT NULL,
     symbol VARCHAR(32),
     quantity DOUBLE PRECISION,
@@ -24,6 +38,7 @@ CREATE TABLE IF NOT EXISTS holdings (
 
 CREATE TABLE IF NOT EXISTS fund_history (
     id SERIAL PRIMARY KEY,
+    fund_id INTEGER NOT NULL DEFAULT 1 REFERENCES funds(id),
     date DATE NOT NULL,
     nav DOUBLE PRECISION NOT NULL,
     total_value DOUBLE PRECISION NOT NULL,
@@ -34,3 +49,8 @@ CREATE TABLE IF NOT EXISTS fund_history (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+
+CREATE INDEX IF NOT EXISTS ix_investors_fund_id ON investors (fund_id);
+CREATE INDEX IF NOT EXISTS ix_holdings_fund_date ON holdings (fund_id, date);
+CREATE INDEX IF NOT EXISTS ix_holdings_fund_symbol_date ON holdings (fund_id, symbol, date);
+CREATE INDEX IF NOT EXISTS ix_fund_history_fund_date ON fund_history (fund_id, date);